@@ -0,0 +1,81 @@
+"""Measure the overhead of instrumenting a coroutine function under a high task count.
+
+Both the original and the instrumented coroutine functions are driven through the public
+gather_instrumented worker pool, which only awaits the coroutines and collects their results, so the
+difference in runtime is the cost of the instrumentation itself.
+
+Usage:
+    python benchmarks/async_instrumentation.py [--tasks N] [--concurrency N] [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+from typing import Any, Callable, cast
+
+from bsa import gather_instrumented, instrument_function
+
+
+async def controller(temperature: float, setpoint: float, heater: float) -> float:
+    await asyncio.sleep(0)
+
+    if temperature <= setpoint:
+        if heater >= 0.5:
+            return heater
+        else:
+            return heater + 0.1
+    else:
+        if temperature >= setpoint + 2:
+            return 0.0
+        else:
+            return heater - 0.1
+
+
+def _best_of(repeat: int, run: Callable[[], Any]) -> float:
+    timings = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=str(__doc__).splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--concurrency", type=int, default=1_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    inputs = [(rng.uniform(15, 25), 20.0, rng.random()) for _ in range(args.tasks)]
+    instrumented = instrument_function(controller)
+    # gather_instrumented only awaits the coroutines, so it can drive the original function as well
+    original = cast(Any, controller)
+
+    baseline = _best_of(
+        args.repeat,
+        lambda: asyncio.run(
+            gather_instrumented(original, inputs, max_concurrency=args.concurrency)
+        ),
+    )
+    measured = _best_of(
+        args.repeat,
+        lambda: asyncio.run(
+            gather_instrumented(instrumented, inputs, max_concurrency=args.concurrency)
+        ),
+    )
+
+    print(f"tasks: {args.tasks}, concurrency: {args.concurrency}")
+    print(f"original:     {baseline:.3f}s ({baseline / args.tasks * 1e6:.2f}us/task)")
+    print(f"instrumented: {measured:.3f}s ({measured / args.tasks * 1e6:.2f}us/task)")
+    print(f"overhead:     {(measured / baseline - 1) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,122 @@
-from .branches import BranchTree, Comparison, Condition, active_branches
-from .instrumentation import instrument_function
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+from .branches import (
+    BranchTree,
+    Comparison,
+    Condition,
+    FrozenBranchTree,
+    Guard,
+    Interval,
+    active_branches,
+)
+from .instrumentation import (
+    InstrumentationRegistry,
+    LazyInstrumentedFunction,
+    gather_instrumented,
+    instrument_function,
+    warm_up,
+)
 from .kripke import Edge, Kripke, State
+from .monitoring import BranchMonitor
+
+if TYPE_CHECKING:
+    from .analytics import TraceStatistics, trace_statistics
+    from .arrays import KripkeArrays
+    from .bisimulation import minimize
+    from .capture import GuardBuffer, GuardCaptureFunction, capture_guards
+    from .classify import PathClassifier
+    from .coverage import CoverageAccumulator, CoverageSnapshot
+    from .index import StateIndex, StateSet
+    from .labels import LabelMasks
+    from .memo import ActiveBranchCache, CacheStats
+    from .product import ProductKripke
+    from .robustness import branch_distances, condition_distance, condition_mask
+    from .sampling import CoverageSampler, SampleBatch
+    from .shared import SharedKripke
+    from .stl import StateFormulas
+    from .tracking import ActiveStateTracker, TrackerStep
+
+# Modules that depend on numpy or multiprocessing are only imported when one of their names is
+# first accessed, so that importing the package stays fast. Importing a submodule binds it to the
+# package, so the exported names must differ from the module names.
+_LAZY_MODULES = {
+    "analytics": ["TraceStatistics", "trace_statistics"],
+    "arrays": ["KripkeArrays"],
+    "bisimulation": ["minimize"],
+    "capture": ["GuardBuffer", "GuardCaptureFunction", "capture_guards"],
+    "classify": ["PathClassifier"],
+    "coverage": ["CoverageAccumulator", "CoverageSnapshot"],
+    "index": ["StateIndex", "StateSet"],
+    "labels": ["LabelMasks"],
+    "memo": ["ActiveBranchCache", "CacheStats"],
+    "product": ["ProductKripke"],
+    "robustness": ["branch_distances", "condition_distance", "condition_mask"],
+    "sampling": ["CoverageSampler", "SampleBatch"],
+    "shared": ["SharedKripke"],
+    "stl": ["StateFormulas"],
+    "tracking": ["ActiveStateTracker", "TrackerStep"],
+}
+_LAZY_NAMES = {name: module for module, names in _LAZY_MODULES.items() for name in names}
+
+
+def __getattr__(name: str) -> object:
+    try:
+        module = _LAZY_NAMES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_NAMES))
+
 
 __all__ = [
+    "ActiveBranchCache",
+    "ActiveStateTracker",
+    "BranchMonitor",
     "BranchTree",
+    "CacheStats",
     "Comparison",
     "Condition",
+    "CoverageAccumulator",
+    "CoverageSampler",
+    "CoverageSnapshot",
     "active_branches",
+    "branch_distances",
+    "capture_guards",
+    "condition_distance",
+    "condition_mask",
     "Edge",
+    "FrozenBranchTree",
+    "Guard",
+    "GuardBuffer",
+    "GuardCaptureFunction",
+    "InstrumentationRegistry",
+    "Interval",
     "Kripke",
+    "KripkeArrays",
+    "LabelMasks",
+    "PathClassifier",
+    "ProductKripke",
+    "LazyInstrumentedFunction",
+    "SampleBatch",
+    "SharedKripke",
     "State",
+    "StateIndex",
+    "StateSet",
+    "StateFormulas",
+    "TraceStatistics",
+    "TrackerStep",
+    "gather_instrumented",
     "instrument_function",
+    "minimize",
+    "trace_statistics",
+    "warm_up",
 ]
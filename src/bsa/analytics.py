@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from numpy.typing import ArrayLike, NDArray
+
+    from .kripke import Kripke
+
+
+@dataclass(frozen=True)
+class TraceStatistics:
+    """Dwell times, visit counts and observed transitions of a trace of active states.
+
+    A trace is split into runs of consecutive steps with the same active state. Each run is one
+    visit of its state, and the length of the run is the dwell time of the visit. A transition is
+    observed when a run is directly followed by a run of a different state. Steps in which no state
+    is active are kept as runs of state -1, and transitions into or out of those runs are not
+    counted since the state in between is unknown.
+
+    States are identified by their index in the set of states of the Kripke structure, like
+    :py:class:`.CoverageAccumulator` and :py:meth:`.PathClassifier.classify_batch`.
+
+    Attributes:
+        run_states: The state index of each run, or -1 if no state is active during the run
+        run_lengths: The number of steps of each run
+        occupancy: The number of steps each state was active
+        visits: The number of runs of each state
+        max_dwell: The length of the longest run of each state
+        transition_sources: The source state index of each observed transition, in increasing order
+        transition_targets: The target state index of each observed transition, in increasing order
+            for each source
+        transition_counts: The number of times each transition was observed
+        expected: Mask of the observed transitions that are edges of the Kripke structure
+    """
+
+    run_states: NDArray[np.int64]
+    run_lengths: NDArray[np.int64]
+    occupancy: NDArray[np.int64]
+    visits: NDArray[np.int64]
+    max_dwell: NDArray[np.int64]
+    transition_sources: NDArray[np.int64]
+    transition_targets: NDArray[np.int64]
+    transition_counts: NDArray[np.int64]
+    expected: NDArray[np.bool_]
+
+    @property
+    def n_states(self) -> int:
+        """The number of states of the Kripke structure."""
+        return len(self.occupancy)
+
+    @property
+    def n_steps(self) -> int:
+        """The number of steps of the trace."""
+        return int(self.run_lengths.sum())
+
+    @property
+    def mean_dwell(self) -> NDArray[np.float64]:
+        """The mean run length of each state, or NaN for states that were never active."""
+
+        mean = np.full(self.n_states, np.nan)
+        np.divide(self.occupancy, self.visits, out=mean, where=self.visits > 0)
+        return mean
+
+    @property
+    def unexpected(self) -> NDArray[np.bool_]:
+        """Mask of the observed transitions that are not edges of the Kripke structure."""
+        return ~self.expected
+
+    def dwell_times(self, index: int) -> NDArray[np.int64]:
+        """Return the length of every run of a state.
+
+        Args:
+            index: The index of the state
+
+        Returns:
+            The run lengths in trace order
+        """
+
+        lengths: NDArray[np.int64] = self.run_lengths[self.run_states == index]
+        return lengths
+
+    def transition_matrix(self, *, dwell: bool = False) -> NDArray[np.int64]:
+        """Create a dense matrix of the observed transition counts.
+
+        Args:
+            dwell: Whether the diagonal should contain the number of steps in which each state
+                stayed active, which makes the matrix count every pair of consecutive steps in
+                which a state is active
+
+        Returns:
+            A (states, states) array where element ``[i, j]`` is the number of transitions from the
+            state with index ``i`` to the state with index ``j``
+        """
+
+        matrix = np.zeros((self.n_states, self.n_states), dtype=np.int64)
+        matrix[self.transition_sources, self.transition_targets] = self.transition_counts
+
+        if dwell:
+            matrix[np.diag_indices(self.n_states)] = self.occupancy - self.visits
+
+        return matrix
+
+    def transition_probabilities(self, *, dwell: bool = False) -> NDArray[np.float64]:
+        """Estimate the probability of each transition from the observed counts.
+
+        Args:
+            dwell: Whether staying in a state counts as a transition to itself
+
+        Returns:
+            A (states, states) array where each row contains the observed transition frequencies of
+            a state, or zeros if no transition from the state was observed
+        """
+
+        matrix = self.transition_matrix(dwell=dwell).astype(np.float64)
+        totals = matrix.sum(axis=1, keepdims=True)
+        probabilities: NDArray[np.float64] = np.divide(
+            matrix, totals, out=np.zeros_like(matrix), where=totals > 0
+        )
+        return probabilities
+
+
+def _edge_keys(kripke: Kripke[Any]) -> NDArray[np.int64]:
+    """Encode the edges of a Kripke structure as sorted ``source * states + target`` keys."""
+
+    states = kripke.states
+    index = {state: i for i, state in enumerate(states)}
+    edges = kripke.edges
+    keys = np.fromiter(
+        (index[e.source] * len(states) + index[e.target] for e in edges),
+        dtype=np.int64,
+        count=len(edges),
+    )
+
+    return np.unique(keys)
+
+
+def trace_statistics(kripke: Kripke[Any], indices: ArrayLike) -> TraceStatistics:
+    """Compute the dwell times, visit counts and observed transitions of a trace.
+
+    The trace is run-length encoded once, and every statistic is computed from the runs using array
+    operations, so the cost is linear in the number of steps and the number of Python operations
+    only depends on the number of edges of the Kripke structure.
+
+    Args:
+        kripke: The Kripke structure the trace was classified against
+        indices: The index of the active state at each step of the trace, or -1 if no state is
+            active, e.g. a row of the output of :py:meth:`.PathClassifier.classify_batch`
+
+    Returns:
+        The statistics of the trace
+
+    Raises:
+        ValueError: If the trace is not one-dimensional or contains an invalid state index
+    """
+
+    n_states = len(kripke.states)
+    values = np.asarray(indices, dtype=np.int64)
+
+    if values.ndim != 1:
+        raise ValueError("Expected a one-dimensional trace of state indices")
+
+    if np.any((values < -1) | (values >= n_states)):
+        raise ValueError("State indices must be -1 or valid indices of the Kripke structure")
+
+    change = np.ones(len(values), dtype=np.bool_)
+    np.not_equal(values[1:], values[:-1], out=change[1:])
+    starts = np.flatnonzero(change)
+    run_states = values[starts]
+    run_lengths = np.diff(np.append(starts, len(values)))
+
+    active = run_states >= 0
+    states, lengths = run_states[active], run_lengths[active]
+    occupancy = np.bincount(states, weights=lengths, minlength=n_states).astype(np.int64)
+    visits = np.bincount(states, minlength=n_states)
+    max_dwell = np.zeros(n_states, dtype=np.int64)
+    np.maximum.at(max_dwell, states, lengths)
+
+    observed = active[:-1] & active[1:]
+    keys = run_states[:-1][observed] * n_states + run_states[1:][observed]
+    keys, counts = np.unique(keys, return_counts=True)
+
+    return TraceStatistics(
+        run_states=run_states,
+        run_lengths=run_lengths,
+        occupancy=occupancy,
+        visits=visits.astype(np.int64),
+        max_dwell=max_dwell,
+        transition_sources=keys // max(n_states, 1),
+        transition_targets=keys % max(n_states, 1),
+        transition_counts=counts.astype(np.int64),
+        expected=np.isin(keys, _edge_keys(kripke), assume_unique=True),
+    )
+
+
+__all__ = ["TraceStatistics", "trace_statistics"]
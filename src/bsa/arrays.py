@@ -0,0 +1,413 @@
+from __future__ import annotations
+
+import struct
+import uuid
+import zipfile
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Generic,
+    Hashable,
+    Literal,
+    Optional,
+    Sequence,
+    TypeVar,
+    Union,
+    cast,
+)
+
+import numpy as np
+
+from .branches import Comparison, Condition, Guard, Interval
+from .kripke import Edge, Kripke, State
+
+if TYPE_CHECKING:
+    from os import PathLike
+
+    from numpy.typing import NDArray
+    from typing_extensions import TypeAlias
+
+    _File: TypeAlias = "str | PathLike[str]"
+
+_LabelT = TypeVar("_LabelT")
+
+_COMPARISON_CODES = {Comparison.LTE: 0, Comparison.GTE: 1}
+_CODE_COMPARISONS = {code: cmp for cmp, code in _COMPARISON_CODES.items()}
+_COMPARISON, _INSIDE, _OUTSIDE = 0, 1, 2
+_ZIP_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+
+
+class _LabelTable(Generic[_LabelT]):
+    """Table of unique labels that assigns each label a stable integer index.
+
+    Hashable labels are looked up using a dictionary, while unhashable labels fall back to a linear
+    scan of the table.
+    """
+
+    def __init__(self) -> None:
+        self.labels: list[_LabelT] = []
+        self._indices: dict[Hashable, int] = {}
+
+    def index(self, label: _LabelT) -> int:
+        """Return the index of a label, adding it to the table if it is not present."""
+
+        try:
+            index = self._indices.get(cast(Hashable, label))
+        except TypeError:
+            index = next((i for i, existing in enumerate(self.labels) if existing == label), None)
+        else:
+            if index is None:
+                self._indices[cast(Hashable, label)] = len(self.labels)
+
+        if index is None:
+            index = len(self.labels)
+            self.labels.append(label)
+
+        return index
+
+
+def _offsets(counts: NDArray[np.int64]) -> NDArray[np.int64]:
+    """Convert a set of per-state counts into CSR row offsets."""
+
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return offsets
+
+
+@dataclass(frozen=True)
+class KripkeArrays(Generic[_LabelT]):
+    """Compact array representation of a Kripke structure.
+
+    States are represented by their index into the arrays. The edges are stored in compressed
+    sparse row (CSR) form, meaning that the successors of the state with index ``i`` are the values
+    ``edge_targets[edge_offsets[i]:edge_offsets[i + 1]]``. Labels are stored in the same form as
+    indices into a table of unique labels, which allows labels shared by many states to be stored
+    only once.
+
+    Attributes:
+        state_ids: Unique value of each state as a (states, 16) array of bytes
+        initial: Mask of the initial states
+        edge_offsets: CSR row offsets of the edges of each state
+        edge_targets: Index of the target state of each edge
+        label_offsets: CSR row offsets of the labels of each state
+        label_indices: Index into the label table of each state label
+        labels: Table of unique labels
+    """
+
+    state_ids: NDArray[np.uint8]
+    initial: NDArray[np.bool_]
+    edge_offsets: NDArray[np.int64]
+    edge_targets: NDArray[np.int32]
+    label_offsets: NDArray[np.int64]
+    label_indices: NDArray[np.int32]
+    labels: tuple[_LabelT, ...]
+
+    @property
+    def n_states(self) -> int:
+        """The number of states in the Kripke structure."""
+        return len(self.initial)
+
+    @property
+    def n_edges(self) -> int:
+        """The number of edges in the Kripke structure."""
+        return len(self.edge_targets)
+
+    def successors(self, index: int) -> NDArray[np.int32]:
+        """Return the indices of the targets of all edges starting at a state.
+
+        Args:
+            index: The index of the starting state
+
+        Returns:
+            The array of target state indices
+        """
+
+        return self.edge_targets[self.edge_offsets[index] : self.edge_offsets[index + 1]]
+
+    def label_indices_for(self, index: int) -> NDArray[np.int32]:
+        """Return the label table indices of the labels of a state.
+
+        Args:
+            index: The index of the state
+
+        Returns:
+            The array of label table indices
+        """
+
+        return self.label_indices[self.label_offsets[index] : self.label_offsets[index + 1]]
+
+    @classmethod
+    def from_kripke(cls, kripke: Kripke[_LabelT]) -> KripkeArrays[_LabelT]:
+        """Create an array representation from a Kripke structure.
+
+        The order of the states is preserved, so the state with index ``i`` is the ith element of
+        ``kripke.states``.
+
+        Args:
+            kripke: The Kripke structure to convert
+
+        Returns:
+            The array representation of the Kripke structure
+        """
+
+        states = kripke.states
+        index = {state: i for i, state in enumerate(states)}
+        edges = kripke.edges
+        n_states = len(states)
+
+        state_ids = np.frombuffer(b"".join(state._id.bytes for state in states), dtype=np.uint8)
+        initial = np.zeros(n_states, dtype=np.bool_)
+        initial[[index[state] for state in kripke.initial_states]] = True
+
+        sources = np.fromiter((index[e.source] for e in edges), dtype=np.int64, count=len(edges))
+        targets = np.fromiter((index[e.target] for e in edges), dtype=np.int32, count=len(edges))
+        order = np.argsort(sources, kind="stable")
+
+        table: _LabelTable[_LabelT] = _LabelTable()
+        state_labels = [[table.index(label) for label in kripke.labels_for(s)] for s in states]
+        label_counts = np.fromiter(map(len, state_labels), dtype=np.int64, count=n_states)
+        label_indices = np.fromiter(
+            (label for labels in state_labels for label in labels),
+            dtype=np.int32,
+            count=int(label_counts.sum()),
+        )
+
+        return cls(
+            state_ids=state_ids.reshape(n_states, 16),
+            initial=initial,
+            edge_offsets=_offsets(np.bincount(sources, minlength=n_states)),
+            edge_targets=targets[order],
+            label_offsets=_offsets(label_counts),
+            label_indices=label_indices,
+            labels=tuple(table.labels),
+        )
+
+    def to_kripke(self) -> Kripke[_LabelT]:
+        """Create a Kripke structure from the array representation.
+
+        The states of the resulting Kripke structure compare equal to the states of the Kripke
+        structure the arrays were created from.
+
+        Returns:
+            A new Kripke structure
+        """
+
+        states = [State._with_id(uuid.UUID(bytes=row.tobytes())) for row in self.state_ids]
+        initial = {state: bool(self.initial[i]) for i, state in enumerate(states)}
+        labels = {
+            state: [self.labels[j] for j in self.label_indices_for(i)]
+            for i, state in enumerate(states)
+        }
+        edges = [Edge(states[i], states[j]) for i in range(len(states)) for j in self.successors(i)]
+
+        return Kripke(states, initial, labels, edges)
+
+    def save(self, file: _File) -> None:
+        """Save the array representation into a single uncompressed ``.npz`` file.
+
+        The label table is stored as a set of columns, so this function requires all of the labels
+        to be :py:class:`.Condition` or :py:class:`.Interval` values.
+
+        The file is written to the given path as is, so unlike :py:func:`numpy.savez` no ``.npz``
+        suffix is appended and the same path can be passed to :py:meth:`load`.
+
+        Args:
+            file: The path of the file to write
+
+        Raises:
+            TypeError: If any label is not a Condition or Interval
+        """
+
+        columns = _encode_conditions(self.labels)
+
+        with open(file, "wb") as handle:
+            np.savez(
+                handle,
+                n_states=np.int64(self.n_states),
+                state_ids=self.state_ids,
+                initial=self.initial,
+                edge_offsets=self.edge_offsets,
+                edge_targets=self.edge_targets,
+                label_offsets=self.label_offsets,
+                label_indices=self.label_indices,
+                **columns,
+            )
+
+    @staticmethod
+    def load(file: _File, *, mmap: bool = True) -> KripkeArrays[Guard]:
+        """Load an array representation saved using :py:meth:`save`.
+
+        When memory mapping is enabled, the arrays are read-only views of the file contents and no
+        data is read until it is accessed.
+
+        Args:
+            file: The path of the file to read
+            mmap: Whether the arrays should be memory mapped instead of read into memory
+
+        Returns:
+            The array representation stored in the file
+
+        Raises:
+            ValueError: If the number of states stored in the file does not match its state ids
+        """
+
+        if mmap:
+            arrays = _mmap_npz(file)
+        else:
+            with np.load(file) as npz:
+                arrays = {name: npz[name] for name in npz.files}
+
+        if int(arrays["n_states"]) != len(arrays["state_ids"]):
+            raise ValueError(
+                f"Expected {int(arrays['n_states'])} states but found {len(arrays['state_ids'])}"
+            )
+
+        return KripkeArrays(
+            state_ids=arrays["state_ids"],
+            initial=arrays["initial"],
+            edge_offsets=arrays["edge_offsets"],
+            edge_targets=arrays["edge_targets"],
+            label_offsets=arrays["label_offsets"],
+            label_indices=arrays["label_indices"],
+            labels=_decode_conditions(arrays),
+        )
+
+
+def _encode_conditions(labels: Sequence[Any]) -> dict[str, Any]:
+    """Encode a table of conditions as a set of column arrays.
+
+    An interval is encoded as its lower bound in the comparison columns, together with its upper
+    bound and whether it holds inside or outside of its bounds in the interval columns.
+    """
+
+    if not all(isinstance(label, (Condition, Interval)) for label in labels):
+        raise TypeError("Only Kripke structures labeled with conditions can be saved")
+
+    guards = cast(Sequence[Union[Condition, Interval]], labels)
+    conditions = [
+        (
+            Condition(g.variable, Comparison.GTE, g.lower, g.lower_strict)
+            if isinstance(g, Interval)
+            else g
+        )
+        for g in guards
+    ]
+    intervals = [g if isinstance(g, Interval) else None for g in guards]
+
+    return {
+        "condition_variables": np.array([c.variable for c in conditions], dtype=np.str_),
+        "condition_comparisons": np.array(
+            [_COMPARISON_CODES[c.comparison] for c in conditions], dtype=np.int8
+        ),
+        "condition_bounds": np.array(
+            [np.nan if isinstance(c.bound, str) else c.bound for c in conditions], dtype=np.float64
+        ),
+        "condition_bound_variables": np.array(
+            [c.bound if isinstance(c.bound, str) else "" for c in conditions], dtype=np.str_
+        ),
+        "condition_strict": np.array([c.strict for c in conditions], dtype=np.bool_),
+        "condition_kinds": np.array(
+            [_interval_kind(interval) for interval in intervals], dtype=np.int8
+        ),
+        "condition_uppers": np.array(
+            [np.nan if i is None else i.upper for i in intervals], dtype=np.float64
+        ),
+        "condition_upper_strict": np.array(
+            [i is not None and i.upper_strict for i in intervals], dtype=np.bool_
+        ),
+    }
+
+
+def _interval_kind(interval: Optional[Interval]) -> int:
+    if interval is None:
+        return _COMPARISON
+
+    return _INSIDE if interval.inside else _OUTSIDE
+
+
+def _decode_conditions(arrays: dict[str, NDArray[Any]]) -> tuple[Guard, ...]:
+    """Decode a table of conditions from a set of column arrays.
+
+    The interval columns are optional, so tables saved before intervals were introduced can still
+    be decoded.
+    """
+
+    variables = arrays["condition_variables"].tolist()
+    comparisons = arrays["condition_comparisons"].tolist()
+    bounds = arrays["condition_bounds"].tolist()
+    bound_variables = arrays["condition_bound_variables"].tolist()
+    strict = arrays["condition_strict"].tolist()
+    kinds = arrays.get("condition_kinds", np.zeros(len(variables), dtype=np.int8)).tolist()
+    uppers = arrays.get("condition_uppers", np.full(len(variables), np.nan)).tolist()
+    upper_strict = arrays.get("condition_upper_strict", np.zeros(len(variables), bool)).tolist()
+
+    def decode(i: int) -> Guard:
+        if kinds[i] != _COMPARISON:
+            return Interval(
+                variables[i],
+                bounds[i],
+                uppers[i],
+                lower_strict=strict[i],
+                upper_strict=upper_strict[i],
+                inside=kinds[i] == _INSIDE,
+            )
+
+        return Condition(
+            variables[i],
+            _CODE_COMPARISONS[comparisons[i]],
+            bound_variables[i] if bound_variables[i] else bounds[i],
+            strict[i],
+        )
+
+    return tuple(decode(i) for i in range(len(variables)))
+
+
+def _mmap_npz(file: _File) -> dict[str, NDArray[Any]]:
+    """Memory map every array stored in an uncompressed ``.npz`` file.
+
+    An uncompressed archive stores each ``.npy`` member contiguously, so each array can be mapped
+    directly by locating the start of the member data and parsing the ``.npy`` header.
+
+    Raises:
+        ValueError: If a member of the archive is compressed or contains Python objects
+    """
+
+    arrays: dict[str, NDArray[Any]] = {}
+
+    with zipfile.ZipFile(file) as archive:
+        members = archive.infolist()
+
+    with open(file, "rb") as handle:
+        for member in members:
+            if member.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"Compressed member {member.filename} cannot be memory mapped")
+
+            handle.seek(member.header_offset)
+            header = _ZIP_LOCAL_HEADER.unpack(handle.read(_ZIP_LOCAL_HEADER.size))
+            handle.seek(header[-2] + header[-1], 1)
+
+            version = np.lib.format.read_magic(handle)
+
+            if version == (1, 0):
+                shape, fortran, dtype = np.lib.format.read_array_header_1_0(handle)
+            else:
+                shape, fortran, dtype = np.lib.format.read_array_header_2_0(handle)
+
+            if dtype.hasobject:
+                raise ValueError(f"Member {member.filename} contains Python objects")
+
+            name = member.filename.removesuffix(".npy")
+            order: Literal["C", "F"] = "F" if fortran else "C"
+
+            if int(np.prod(shape)) == 0:
+                arrays[name] = np.empty(shape, dtype=dtype, order=order)
+            else:
+                arrays[name] = np.memmap(
+                    file, dtype=dtype, mode="r", offset=handle.tell(), shape=shape, order=order
+                )
+
+    return arrays
+
+
+__all__ = ["KripkeArrays"]
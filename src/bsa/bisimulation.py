@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+from itertools import accumulate
+from typing import TYPE_CHECKING, Iterable, TypeVar
+
+import numpy as np
+
+from .arrays import KripkeArrays
+from .kripke import Edge, Kripke
+
+if TYPE_CHECKING:
+    from .kripke import State
+
+_LabelT = TypeVar("_LabelT")
+
+
+def _initial_partition(arrays: KripkeArrays[_LabelT]) -> list[int]:
+    """Assign each state to a block based on its set of labels."""
+
+    blocks: dict[frozenset[int], int] = {}
+    block_of = []
+
+    for index in range(arrays.n_states):
+        key = frozenset(arrays.label_indices_for(index).tolist())
+        block_of.append(blocks.setdefault(key, len(blocks)))
+
+    return block_of
+
+
+def _adjacency(offsets: list[int], targets: list[int]) -> list[list[int]]:
+    return [targets[offsets[i] : offsets[i + 1]] for i in range(len(offsets) - 1)]
+
+
+def _predecessors(arrays: KripkeArrays[_LabelT]) -> list[list[int]]:
+    """Create an adjacency list containing the indices of the predecessors of each state."""
+
+    sources = np.repeat(np.arange(arrays.n_states), np.diff(arrays.edge_offsets))
+    order = np.argsort(arrays.edge_targets, kind="stable")
+    counts = np.bincount(arrays.edge_targets, minlength=arrays.n_states)
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+
+    return _adjacency(offsets.tolist(), sources[order].tolist())
+
+
+def _refine(block_of: list[int], predecessors: list[list[int]]) -> list[int]:
+    """Refine a partition of states until it is stable with respect to the edges.
+
+    A partition is stable if all states in a block have successors in the same set of blocks. The
+    refinement follows the algorithm of Paige and Tarjan. The blocks are grouped into compound
+    blocks, starting from a single compound block that contains every state, and the partition is
+    kept stable with respect to every compound block. A compound block containing several blocks is
+    refined by moving out the smaller of two of its blocks, which becomes the splitter. Only the
+    predecessors of the splitter are visited, and each block they touch is split into the states
+    whose successors in the compound block all lie in the splitter, the states with successors both
+    inside and outside of the splitter, and the states without any successor in the splitter. The
+    number of successors of each state in each compound block is counted per edge, so the second of
+    these splits does not visit the successors outside of the splitter.
+
+    Since a state only becomes part of a splitter whose size is at most half of its previous
+    compound block, the refinement takes O(m log n) time for n states and m edges.
+
+    Args:
+        block_of: The block index of each state in the initial partition
+        predecessors: The indices of the predecessors of each state, once for each edge
+
+    Returns:
+        The block index of each state in the coarsest stable refinement of the partition
+    """
+
+    block_of = block_of.copy()
+    members: list[set[int]] = [set() for _ in range(max(block_of, default=-1) + 1)]
+
+    for index, block in enumerate(block_of):
+        members[block].add(index)
+
+    # The edges are numbered in the order of the predecessor lists. Each edge refers to the counter
+    # of the successors of its source that lie in the compound block containing its target.
+    sources = [source for states in predecessors for source in states]
+    starts = list(accumulate((len(states) for states in predecessors), initial=0))
+    counters = sources.copy()
+    counts = [0] * len(block_of)
+
+    for source in sources:
+        counts[source] += 1
+
+    compound_of = [0] * len(members)
+    compounds: list[set[int]] = [set(range(len(members)))]
+    splitters = {0} if len(members) > 1 else set()
+
+    def split(states: Iterable[int]) -> None:
+        parts: dict[int, list[int]] = {}
+
+        for state in states:
+            parts.setdefault(block_of[state], []).append(state)
+
+        for block, part in parts.items():
+            if len(part) == len(members[block]):
+                continue
+
+            new_block = len(members)
+            members[block].difference_update(part)
+            members.append(set(part))
+            compound_of.append(compound_of[block])
+            compounds[compound_of[block]].add(new_block)
+            splitters.add(compound_of[block])
+
+            for state in part:
+                block_of[state] = new_block
+
+    split(state for state, count in enumerate(counts) if count > 0)
+
+    while splitters:
+        compound = splitters.pop()
+        blocks = iter(compounds[compound])
+        first, second = next(blocks), next(blocks)
+        splitter = first if len(members[first]) <= len(members[second]) else second
+
+        compounds[compound].discard(splitter)
+        compound_of[splitter] = len(compounds)
+        compounds.append({splitter})
+
+        if len(compounds[compound]) > 1:
+            splitters.add(compound)
+
+        edges = [
+            edge for state in members[splitter] for edge in range(starts[state], starts[state + 1])
+        ]
+        inside: dict[int, int] = {}
+        previous: dict[int, int] = {}
+
+        for edge in edges:
+            source = sources[edge]
+            inside[source] = inside.get(source, 0) + 1
+            previous[source] = counters[edge]
+
+        only = [source for source, count in inside.items() if count == counts[previous[source]]]
+        split(inside)
+        split(only)
+
+        for source, count in inside.items():
+            previous[source] = len(counts)
+            counts.append(count)
+
+        for edge in edges:
+            counts[counters[edge]] -= 1
+            counters[edge] = previous[sources[edge]]
+
+    return block_of
+
+
+def minimize(kripke: Kripke[_LabelT]) -> tuple[Kripke[_LabelT], dict[State, State]]:
+    """Reduce a Kripke structure to its coarsest bisimulation quotient.
+
+    Two states are bisimilar if they have the same set of labels and every successor of one state
+    is bisimilar to some successor of the other state. Bisimilar states cannot be distinguished by
+    any temporal logic formula over the labels, so each set of bisimilar states is merged into a
+    single state. The merged state is initial if any of its members is initial, and there is an edge
+    between two merged states if there is an edge between any of their members.
+
+    The quotient is computed using partition refinement. The states are first partitioned by their
+    set of labels, and the blocks of the partition are then split until no block contains states
+    whose successors lie in different blocks.
+
+    Args:
+        kripke: The Kripke structure to minimize
+
+    Returns:
+        The minimized Kripke structure, and a mapping from each state of the original structure to
+        the state it was merged into. The first member of each set of bisimilar states is used to
+        represent the merged state.
+    """
+    # pylint: disable=protected-access
+
+    arrays = KripkeArrays.from_kripke(kripke)
+    states = kripke.states
+    block_of = _refine(_initial_partition(arrays), _predecessors(arrays))
+
+    representatives: dict[int, State] = {}
+    mapping: dict[State, State] = {}
+
+    for index, state in enumerate(states):
+        mapping[state] = representatives.setdefault(block_of[index], state)
+
+    merged = list(representatives.values())
+    initial = dict.fromkeys(merged, False)
+    labels = {state: kripke._labels[state] for state in merged}
+    edges: dict[tuple[State, State], Edge] = {}
+
+    for state in kripke.initial_states:
+        initial[mapping[state]] = True
+
+    for edge in kripke._edges:
+        key = (mapping[edge.source], mapping[edge.target])
+
+        if key not in edges:
+            edges[key] = Edge(*key)
+
+    return Kripke._from_parts(merged, initial, labels, list(edges.values())), mapping
+
+
+__all__ = ["minimize"]
@@ -2,14 +2,17 @@ from __future__ import annotations
 
 import ast
 import inspect
-from dataclasses import dataclass
+from abc import ABC, abstractmethod
+from dataclasses import FrozenInstanceError, dataclass, replace
 from enum import Enum, auto
 from functools import reduce
-from typing import Any, Callable, Sequence, cast
+from typing import Any, Callable, Iterable, Iterator, Sequence, TypeVar, cast
 
 from .instrumentation import variable_name
 from .kripke import Kripke, State
 
+_GuardT = TypeVar("_GuardT", bound="Guard")
+
 
 class Comparison(Enum):
     """Representation of the comparison operators <=, >=
@@ -88,8 +91,68 @@ def _cmp_strict(left: float, cmp: Comparison, right: float) -> bool:
     raise TypeError(f"Unknown comparison {type(cmp)}")
 
 
-@dataclass
-class Condition:
+class Guard(ABC):
+    """Base class of the boolean guards of conditional statements.
+
+    A guard is either a single :py:class:`Condition`, or an :py:class:`Interval` if it bounds a
+    single variable from both sides. Guards are used as the labels of the states of the Kripke
+    structures created from a :py:class:`BranchTree`.
+    """
+
+    __slots__ = ()
+
+    @property
+    @abstractmethod
+    def variables(self) -> set[str]:
+        """The set of variables depended on by the guard."""
+
+    @abstractmethod
+    def inverse(self) -> Guard:
+        """Invert the guard.
+
+        Returns:
+            A new guard that holds wherever this guard does not hold
+        """
+
+    @abstractmethod
+    def is_true(self, variables: dict[str, float]) -> bool:
+        """Check if the guard is true given a set of variables.
+
+        If a variable is not present in the map, then the guard is assumed to be false.
+
+        Args:
+            variables: Mapping from variable names to values
+
+        Returns:
+            True if the guard is true, False otherwise
+        """
+
+    @classmethod
+    def from_expr(cls, expr: ast.expr) -> Guard:
+        """Create a guard from an AST expression node.
+
+        A chained comparison is converted using :py:meth:`Interval.from_expr`, and any other
+        expression using :py:meth:`Condition.from_expr`.
+
+        Args:
+            expr: The AST expression node
+
+        Returns:
+            A Condition or Interval representing the AST comparison expression
+
+        Raises:
+            InvalidConditionExpresssion: If the expr value is not an ast.Compare type
+            TypeErrror: If the expression does not conform to the condition assumptions
+        """
+
+        if isinstance(expr, ast.Compare) and len(expr.ops) > 1:
+            return Interval.from_expr(expr)
+
+        return Condition.from_expr(expr)
+
+
+@dataclass(frozen=True)
+class Condition(Guard):
     """Representation of the boolean expression of a conditional statement.
 
     This representation assumes that the condition is represented as an inequality, with a variable
@@ -162,9 +225,8 @@ class Condition:
     def from_expr(cls, expr: ast.expr) -> Condition:
         """Create a Condition from an AST expression node.
 
-        This class method assumes that the comparison expression only has a single operand. This is
-        not always the case in Python as the expression "10 <= x <= 20" is a valid comparison and
-        is represented by having several operands in the expression AST node.
+        A chained comparison like "10 <= x <= 20" cannot be represented by a single condition. Use
+        :py:meth:`Guard.from_expr` to convert it into an :py:class:`Interval` instead.
 
         Args:
             expr: The AST expression node
@@ -180,6 +242,9 @@ class Condition:
         if not isinstance(expr, ast.Compare):
             raise InvalidConditionExpression(f"Unsupported expression type {type(expr)}")
 
+        if len(expr.ops) > 1:
+            raise TypeError("Chained comparison cannot be represented by a single condition")
+
         left = expr.left
         comparison = Comparison.from_op(expr.ops[0])
         right = expr.comparators[0]
@@ -211,6 +276,141 @@ class Condition:
         return cls(variable, Comparison.GTE, bound, strict)
 
 
+@dataclass(frozen=True)
+class Interval(Guard):
+    """Representation of a guard that bounds a single variable from both sides.
+
+    An interval represents the conjunction of a lower and an upper bound of a variable as a single
+    label, so a guard like ``10 <= x <= 20`` creates a single level of a :py:class:`BranchTree`
+    instead of one level for each bound. The inverse of an interval holds outside of the interval,
+    which cannot be represented by a pair of comparisons, so every interval also records whether it
+    holds inside or outside of its bounds. The bounds are always numeric constants.
+
+    Attributes:
+        variable: The name of the bounded variable
+        lower: The lower bound of the variable
+        upper: The upper bound of the variable
+        lower_strict: Whether the lower bound is strict
+        upper_strict: Whether the upper bound is strict
+        inside: Whether the interval holds inside (True) or outside (False) of its bounds
+    """
+
+    variable: str
+    lower: float
+    upper: float
+    lower_strict: bool = False
+    upper_strict: bool = False
+    inside: bool = True
+
+    @property
+    def variables(self) -> set[str]:
+        """The set of variables depended on by the interval."""
+        return {self.variable}
+
+    def contains(self, value: float) -> bool:
+        """Check if a value lies within the bounds of the interval.
+
+        Args:
+            value: The value of the variable
+
+        Returns:
+            True if the value satisfies both bounds, regardless of :py:attr:`inside`
+        """
+
+        above = value > self.lower if self.lower_strict else value >= self.lower
+        below = value < self.upper if self.upper_strict else value <= self.upper
+
+        return above and below
+
+    def inverse(self) -> Interval:
+        """Invert the interval.
+
+        The inverse of an interval has the same bounds and holds on the other side of them.
+
+        Returns:
+            A new Interval that holds wherever this interval does not hold
+        """
+
+        return replace(self, inside=not self.inside)
+
+    def is_true(self, variables: dict[str, float]) -> bool:
+        """Check if the interval is true given a set of variables.
+
+        If the variable is not present in the map, then the interval is assumed to be false.
+
+        Args:
+            variables: Mapping from variable names to values
+
+        Returns:
+            True if the interval is true, False otherwise
+        """
+
+        try:
+            value = variables[self.variable]
+        except KeyError:
+            return False
+
+        return self.contains(value) == self.inside
+
+    @classmethod
+    def from_expr(cls, expr: ast.expr) -> Interval:
+        """Create an Interval from an AST chained comparison node like "10 <= x <= 20".
+
+        Args:
+            expr: The AST expression node
+
+        Returns:
+            An Interval instance representing the AST comparison expression
+
+        Raises:
+            InvalidConditionExpresssion: If the expr value is not an ast.Compare type
+            TypeErrror: If the comparison does not bound a single variable from both sides using
+                numeric constants
+        """
+
+        if not isinstance(expr, ast.Compare):
+            raise InvalidConditionExpression(f"Unsupported expression type {type(expr)}")
+
+        conditions = [Condition.from_expr(operand) for operand in _split_compare(expr)]
+        interval = _interval(*conditions) if len(conditions) == 2 else None
+
+        if interval is None:
+            raise TypeError("Comparison cannot be represented by an interval")
+
+        return interval
+
+
+def _split_compare(expr: ast.Compare) -> list[ast.Compare]:
+    """Split a chained comparison into the equivalent conjunction of single comparisons."""
+
+    operands = [expr.left, *expr.comparators]
+    return [ast.Compare(operands[i], [op], [operands[i + 1]]) for i, op in enumerate(expr.ops)]
+
+
+def _interval(first: Condition, second: Condition) -> Interval | None:
+    """Combine a lower and an upper bound of the same variable into an interval.
+
+    Returns:
+        The interval, or None if the conditions are not opposite numeric bounds of one variable
+    """
+
+    if first.variable != second.variable or first.comparison is second.comparison:
+        return None
+
+    if isinstance(first.bound, str) or isinstance(second.bound, str):
+        return None
+
+    lower, upper = (first, second) if first.comparison is Comparison.GTE else (second, first)
+
+    return Interval(
+        first.variable,
+        float(lower.bound),
+        float(upper.bound),
+        lower_strict=lower.strict,
+        upper_strict=upper.strict,
+    )
+
+
 @dataclass
 class BranchTree:
     """Representation of a tree of conditional blocks.
@@ -225,11 +425,11 @@ class BranchTree:
         false_children: Sub-trees found in the block associated with the condition being false
     """
 
-    condition: Condition
+    condition: Guard
     true_children: list[BranchTree]
     false_children: list[BranchTree]
 
-    def as_kripke(self) -> list[Kripke[Condition]]:
+    def as_kripke(self) -> list[Kripke[Guard]]:
         """Convert tree of conditions into a Kripke Structure."""
 
         if len(self.true_children) == 0:
@@ -258,16 +458,30 @@ class BranchTree:
     def variables(self) -> set[str]:
         """The set of variables depended on by the tree, including its children."""
 
-        variables = self.condition.variables
-
-        for child in self.true_children:
-            variables = variables.union(child.variables)
+        variables: set[str] = set()
+        nodes: list[BranchTree] = [self]
 
-        for child in self.false_children:
-            variables = variables.union(child.variables)
+        while nodes:
+            node = nodes.pop()
+            variables.update(node.condition.variables)
+            nodes.extend(node.true_children)
+            nodes.extend(node.false_children)
 
         return variables
 
+    def freeze(self) -> FrozenBranchTree:
+        """Create an immutable copy of the tree with cached derived properties.
+
+        Returns:
+            The immutable tree
+        """
+
+        return FrozenBranchTree(
+            self.condition,
+            [child.freeze() for child in self.true_children],
+            [child.freeze() for child in self.false_children],
+        )
+
     @staticmethod
     def from_function(func: Callable[..., Any]) -> list[BranchTree]:
         """Create a set of BranchTrees from an arbitrary python function.
@@ -292,6 +506,123 @@ class BranchTree:
         return _block_trees(func_def.body)
 
 
+class FrozenBranchTree:
+    """Immutable representation of a tree of conditional blocks.
+
+    This class represents the same tree as a :py:class:`BranchTree`, but its children are stored in
+    tuples and its attributes cannot be modified after construction. Since the tree never changes,
+    its derived properties are computed once from the properties of the children when the node is
+    created, so every query takes constant time. Nodes compare equal if their trees have the same
+    structure and conditions, and their hash is cached, so nodes can be shared between threads and
+    used as cache keys.
+
+    Args:
+        condition: The boolean guard of the conditional block
+        true_children: Sub-trees found in the block associated with the condition being true
+        false_children: Sub-trees found in the block associated with the condition being false
+    """
+
+    __slots__ = (
+        "condition",
+        "true_children",
+        "false_children",
+        "variables",
+        "depth",
+        "n_conditions",
+        "n_leaves",
+        "n_paths",
+        "_hash",
+    )
+
+    condition: Guard
+    true_children: tuple[FrozenBranchTree, ...]
+    false_children: tuple[FrozenBranchTree, ...]
+    variables: frozenset[str]
+    depth: int
+    n_conditions: int
+    n_leaves: int
+    n_paths: int
+    _hash: int
+
+    def __init__(
+        self,
+        condition: Guard,
+        true_children: Iterable[FrozenBranchTree] = (),
+        false_children: Iterable[FrozenBranchTree] = (),
+    ):
+        true_children = tuple(true_children)
+        false_children = tuple(false_children)
+        children = true_children + false_children
+        variables = frozenset(condition.variables).union(*(c.variables for c in children))
+
+        def paths(branch: tuple[FrozenBranchTree, ...]) -> int:
+            return sum(child.n_paths for child in branch) if branch else 1
+
+        values = {
+            "condition": condition,
+            "true_children": true_children,
+            "false_children": false_children,
+            "variables": variables,
+            "depth": 1 + max((child.depth for child in children), default=0),
+            "n_conditions": 1 + sum(child.n_conditions for child in children),
+            "n_leaves": sum(child.n_leaves for child in children) if children else 1,
+            "n_paths": paths(true_children) + paths(false_children),
+            "_hash": hash((condition, true_children, false_children)),
+        }
+
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise FrozenInstanceError(f"cannot assign to field '{name}'")
+
+    def __delattr__(self, name: str) -> None:
+        raise FrozenInstanceError(f"cannot delete field '{name}'")
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+
+        if not isinstance(other, FrozenBranchTree):
+            return NotImplemented
+
+        return (
+            self._hash == other._hash
+            and self.condition == other.condition
+            and self.true_children == other.true_children
+            and self.false_children == other.false_children
+        )
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (FrozenBranchTree, (self.condition, self.true_children, self.false_children))
+
+    def __repr__(self) -> str:
+        return (
+            f"FrozenBranchTree(condition={self.condition!r}, true_children={self.true_children!r}, "
+            f"false_children={self.false_children!r})"
+        )
+
+    def thaw(self) -> BranchTree:
+        """Create a mutable copy of the tree.
+
+        Returns:
+            The mutable tree
+        """
+
+        return BranchTree(
+            self.condition,
+            [child.thaw() for child in self.true_children],
+            [child.thaw() for child in self.false_children],
+        )
+
+    def as_kripke(self) -> list[Kripke[Guard]]:
+        """Convert tree of conditions into a Kripke Structure."""
+        return self.thaw().as_kripke()
+
+
 def _expr_trees(expr: ast.expr, tcs: list[BranchTree], fcs: list[BranchTree]) -> list[BranchTree]:
     """Create a set of BranchTrees from a conditional statement expression.
 
@@ -314,6 +645,23 @@ def _expr_trees(expr: ast.expr, tcs: list[BranchTree], fcs: list[BranchTree]) ->
     """
     # pylint: disable=W0105
 
+    if isinstance(expr, ast.Compare) and len(expr.ops) > 1:
+        """A chained comparison is equivalent to the conjunction of its individual comparisons.
+        Given the following condition:
+
+            if 10 <= x <= 20 <= y:
+                do_true()
+
+        We can see that this can be re-written as the following:
+
+            if 10 <= x and x <= 20 and 20 <= y:
+                do_true()
+
+        The first two comparisons of the conjunction are then merged into an interval below.
+        """
+
+        expr = ast.BoolOp(ast.And(), list(_split_compare(expr)))
+
     if not isinstance(expr, ast.BoolOp):
         condition = Condition.from_expr(expr)
         tree = BranchTree(condition, tcs, fcs)
@@ -341,10 +689,14 @@ def _expr_trees(expr: ast.expr, tcs: list[BranchTree], fcs: list[BranchTree]) ->
                 do_false()
 
         The re-written condition can now be analyzed recursively to produce a BranchTree.
+
+        Adjacent operands that bound the same variable from both sides, like "10 <= x and x <= 20",
+        are first merged into a single Interval condition, which produces a single tree level.
         """
 
-        init = _expr_trees(expr.values[-1], tcs, fcs)
-        trees = reduce(lambda ts, e: _expr_trees(e, ts, []), reversed(expr.values[:-1]), init)
+        operands = _conjuncts(expr.values)
+        init = _operand_trees(operands[-1], tcs, fcs)
+        trees = reduce(lambda ts, e: _operand_trees(e, ts, []), reversed(operands[:-1]), init)
         return list(trees)
 
     if isinstance(expr.op, ast.Or):
@@ -378,6 +730,60 @@ def _expr_trees(expr: ast.expr, tcs: list[BranchTree], fcs: list[BranchTree]) ->
     raise TypeError(f"Unsupported expression type {type(expr)}")
 
 
+def _flatten_conjunction(values: Sequence[ast.expr]) -> Iterator[ast.expr]:
+    """Split the chained comparisons and nested conjunctions of the operands of a conjunction."""
+
+    for value in values:
+        if isinstance(value, ast.Compare) and len(value.ops) > 1:
+            yield from _split_compare(value)
+        elif isinstance(value, ast.BoolOp) and isinstance(value.op, ast.And):
+            yield from _flatten_conjunction(value.values)
+        else:
+            yield value
+
+
+def _conjuncts(values: Sequence[ast.expr]) -> list[ast.expr | Guard]:
+    """Merge the adjacent operands of a conjunction that bound the same variable into intervals.
+
+    Chained comparisons are split into their individual comparisons and nested conjunctions are
+    flattened first, so a bound of a chained comparison or a nested conjunction can be merged with
+    an adjacent operand, like in the instructions the conjunction compiles to. Operands that are
+    not merged are returned unchanged, so that unsupported expressions are reported by
+    :py:func:`_expr_trees`.
+    """
+
+    operands: list[ast.expr | Guard] = list(_flatten_conjunction(values))
+
+    for index, operand in enumerate(operands):
+        if isinstance(operand, ast.Compare):
+            operands[index] = Condition.from_expr(operand)
+
+    merged: list[ast.expr | Guard] = []
+
+    for operand in operands:
+        previous = merged[-1] if merged else None
+
+        if isinstance(previous, Condition) and isinstance(operand, Condition):
+            interval = _interval(previous, operand)
+
+            if interval is not None:
+                merged[-1] = interval
+                continue
+
+        merged.append(operand)
+
+    return merged
+
+
+def _operand_trees(
+    operand: ast.expr | Guard, tcs: list[BranchTree], fcs: list[BranchTree]
+) -> list[BranchTree]:
+    if isinstance(operand, Guard):
+        return [BranchTree(operand, tcs, fcs)]
+
+    return _expr_trees(operand, tcs, fcs)
+
+
 def _block_trees(block: Sequence[ast.stmt]) -> list[BranchTree]:
     """Create a set of trees from a block of python statements.
 
@@ -408,7 +814,7 @@ def _block_trees(block: Sequence[ast.stmt]) -> list[BranchTree]:
     return block_trees
 
 
-def active_branches(kripke: Kripke[Condition], variables: dict[str, float]) -> list[State]:
+def active_branches(kripke: Kripke[_GuardT], variables: dict[str, float]) -> list[State]:
     """Compute branches that are active given a set of variables.
 
     Args:
@@ -425,4 +831,12 @@ def active_branches(kripke: Kripke[Condition], variables: dict[str, float]) -> l
     return [state for state in kripke.states if is_active(state)]
 
 
-__all__ = ["BranchTree", "Comparison", "Condition", "active_branches"]
+__all__ = [
+    "BranchTree",
+    "Comparison",
+    "Condition",
+    "FrozenBranchTree",
+    "Guard",
+    "Interval",
+    "active_branches",
+]
@@ -0,0 +1,421 @@
+from __future__ import annotations
+
+import ast
+import copy
+import inspect
+import textwrap
+import threading
+import types
+from numbers import Real
+from typing import TYPE_CHECKING, Any, Callable, Generic, Literal, Optional, Sequence, TypeVar, cast
+
+import numpy as np
+from typing_extensions import ParamSpec
+
+from .branches import Guard, InvalidConditionExpression
+from .instrumentation import (
+    InstrumentationRegistry,
+    _closure,
+    _compile_function,
+    _copy_defaults,
+    _instrument_block,
+    _strip_defaults,
+)
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+_P = ParamSpec("_P")
+_T = TypeVar("_T")
+_O = TypeVar("_O")
+_Policy = Literal["overwrite", "drop"]
+
+_DICT_NAME = "__vars"
+_RECORD_NAME = "__record"
+
+
+def _check_buffer(capacity: int, policy: str) -> None:
+    if capacity < 1:
+        raise ValueError("Buffer capacity must be at least 1")
+
+    if policy not in ("overwrite", "drop"):
+        raise ValueError(f"Unknown buffer policy {policy}")
+
+
+class GuardBuffer:
+    """Fixed-capacity buffer of guard evaluations.
+
+    Every evaluation of a guard is stored as a row containing the index of the guard, the outcome of
+    the guard, and the values of the variables read by the guard. The values of variables that are
+    not read by the guard, and values that are not real numbers, e.g. strings or None, are NaN. All
+    storage is allocated when the buffer is created, so the
+    memory use of the buffer does not depend on the number of evaluations.
+
+    Once the buffer is full, new evaluations are handled according to its policy. The
+    ``"overwrite"`` policy treats the buffer as a ring that replaces the oldest evaluation, so the
+    buffer keeps the most recent evaluations. The ``"drop"`` policy discards new evaluations, so the
+    buffer keeps the earliest evaluations.
+
+    Args:
+        variables: The names of the variables read by any guard
+        capacity: The maximum number of evaluations stored in the buffer
+        policy: What to do with new evaluations once the buffer is full
+
+    Raises:
+        ValueError: If the capacity is less than 1 or the policy is unknown
+    """
+
+    def __init__(self, variables: Sequence[str], capacity: int, policy: _Policy = "overwrite"):
+        _check_buffer(capacity, policy)
+
+        self._variables = list(variables)
+        self._policy: _Policy = policy
+        self._guards = np.zeros(capacity, dtype=np.int32)
+        self._outcomes = np.zeros(capacity, dtype=np.bool_)
+        self._values = np.full((capacity, len(self._variables)), np.nan)
+        self._n_recorded = 0
+
+    @property
+    def variables(self) -> list[str]:
+        """The names of the variables in the order of the value columns."""
+        return self._variables.copy()
+
+    @property
+    def capacity(self) -> int:
+        """The maximum number of evaluations stored in the buffer."""
+        return len(self._guards)
+
+    @property
+    def policy(self) -> _Policy:
+        """The policy applied to new evaluations once the buffer is full."""
+        return self._policy
+
+    @property
+    def n_recorded(self) -> int:
+        """The number of evaluations recorded since the buffer was last reset."""
+        return self._n_recorded
+
+    @property
+    def n_lost(self) -> int:
+        """The number of evaluations that were overwritten or dropped."""
+        return max(self._n_recorded - self.capacity, 0)
+
+    def __len__(self) -> int:
+        return min(self._n_recorded, self.capacity)
+
+    def reset(self) -> None:
+        """Discard all stored evaluations without releasing the storage."""
+        self._n_recorded = 0
+
+    def record(
+        self, guard: int, columns: Sequence[int], values: Sequence[object], outcome: _O
+    ) -> _O:
+        """Store a guard evaluation.
+
+        Args:
+            guard: The index of the guard
+            columns: The value column of each variable read by the guard
+            values: The value of each variable read by the guard. Values that are not real numbers
+                are stored as NaN.
+            outcome: The result of evaluating the guard
+
+        Returns:
+            The outcome, so the call can wrap the guard expression
+        """
+
+        count = self._n_recorded
+        self._n_recorded += 1
+
+        if count >= self.capacity:
+            if self._policy == "drop":
+                return outcome
+
+            count %= self.capacity
+
+        row = self._values[count]
+        row.fill(np.nan)
+
+        for i, column in enumerate(columns):
+            if isinstance(values[i], Real):
+                row[column] = values[i]
+
+        self._guards[count] = guard
+        self._outcomes[count] = bool(outcome)
+
+        return outcome
+
+    def _ordered(self, array: NDArray[Any]) -> NDArray[Any]:
+        if self._n_recorded <= self.capacity or self._policy == "drop":
+            return array[: len(self)]
+
+        start = self._n_recorded % self.capacity
+        return np.concatenate([array[start:], array[:start]])
+
+    @property
+    def guards(self) -> NDArray[np.int32]:
+        """The index of the guard of each stored evaluation, from oldest to newest."""
+        return self._ordered(self._guards)
+
+    @property
+    def outcomes(self) -> NDArray[np.bool_]:
+        """The outcome of each stored evaluation, from oldest to newest."""
+        return self._ordered(self._outcomes)
+
+    @property
+    def values(self) -> NDArray[np.float64]:
+        """The (evaluations, variables) array of variable values, from oldest to newest."""
+        return self._ordered(self._values)
+
+    def variable(self, name: str) -> NDArray[np.float64]:
+        """Return the values of a single variable, from oldest to newest.
+
+        Args:
+            name: The name of the variable
+
+        Returns:
+            The value of the variable in each stored evaluation, or NaN if it was not read
+
+        Raises:
+            ValueError: If the variable is not read by any guard
+        """
+
+        return self.values[:, self._variables.index(name)]
+
+    def copy(self) -> GuardBuffer:
+        """Copy the buffer, including its storage."""
+
+        buffer = GuardBuffer(self._variables, self.capacity, self._policy)
+        buffer._guards[:] = self._guards
+        buffer._outcomes[:] = self._outcomes
+        buffer._values[:] = self._values
+        buffer._n_recorded = self._n_recorded
+
+        return buffer
+
+
+def _read_keys(expr: ast.expr) -> list[str]:
+    """Find the variable dictionary keys read by an instrumented guard expression."""
+
+    keys: list[str] = []
+
+    for node in ast.walk(expr):
+        if (
+            isinstance(node, ast.Subscript)
+            and isinstance(node.value, ast.Name)
+            and node.value.id == _DICT_NAME
+            and isinstance(node.slice, ast.Constant)
+            and isinstance(node.slice.value, str)
+            and node.slice.value not in keys
+        ):
+            keys.append(node.slice.value)
+
+    return keys
+
+
+class _Uninstrument(ast.NodeTransformer):
+    """Replace variable dictionary reads with the variables they were read from."""
+
+    def visit_Subscript(self, node: ast.Subscript) -> ast.expr:  # pylint: disable=invalid-name
+        keys = _read_keys(node)
+
+        if len(keys) == 1 and isinstance(node.value, ast.Name) and node.value.id == _DICT_NAME:
+            return ast.parse(keys[0], mode="eval").body
+
+        return cast(ast.expr, self.generic_visit(node))
+
+
+class _GuardRecorder(ast.NodeTransformer):
+    """Wrap the test of every instrumented conditional statement in a call that records it."""
+
+    def __init__(self) -> None:
+        self.guards: list[ast.expr] = []
+        self.keys: list[list[str]] = []
+
+    def visit_If(self, node: ast.If) -> ast.If:  # pylint: disable=invalid-name
+        index = len(self.guards)
+        keys = _read_keys(node.test)
+        reads: list[ast.expr] = [
+            ast.Subscript(
+                value=ast.Name(id=_DICT_NAME, ctx=ast.Load()),
+                slice=ast.Constant(value=key),
+                ctx=ast.Load(),
+            )
+            for key in keys
+        ]
+
+        self.guards.append(_Uninstrument().visit(copy.deepcopy(node.test)))
+        self.keys.append(keys)
+        self.generic_visit(node)
+
+        node.test = ast.Call(
+            func=ast.Name(id=_RECORD_NAME, ctx=ast.Load()),
+            args=[ast.Constant(value=index), ast.Tuple(elts=reads, ctx=ast.Load()), node.test],
+            keywords=[],
+        )
+
+        return node
+
+
+class GuardCaptureFunction(Generic[_P, _T]):
+    """Wrapper around a function that records every guard evaluation into a bounded buffer.
+
+    Calling the wrapper returns a tuple containing the buffer of guard evaluations made during the
+    call and the original return value of the function. Each thread has its own preallocated
+    buffer, which is reset at the start of every call, so the buffer returned by a call is only
+    valid until the next call in the same thread. Use :py:meth:`.GuardBuffer.copy` to keep it.
+
+    Use :py:func:`capture_guards` to create instances of this class.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[Callable[..., Any]], Callable[..., tuple[dict[str, float], _T]]],
+        func_src: ast.FunctionDef,
+        guards: list[ast.expr],
+        guard_keys: list[list[str]],
+        capacity: int,
+        policy: _Policy,
+    ):
+        _check_buffer(capacity, policy)
+
+        variables: list[str] = []
+
+        for keys in guard_keys:
+            variables.extend(key for key in keys if key not in variables)
+
+        columns = {name: index for index, name in enumerate(variables)}
+
+        self._func = factory(self._record)
+        self._func_src = func_src
+        self._guards = guards
+        self._columns = [[columns[key] for key in keys] for keys in guard_keys]
+        self._variables = variables
+        self._capacity = capacity
+        self._policy: _Policy = policy
+        self._local = threading.local()
+
+    def __call__(self, *args: _P.args, **kwds: _P.kwargs) -> tuple[GuardBuffer, _T]:
+        buffer = self.buffer
+        buffer.reset()
+        _, result = self._func(*args, **kwds)
+        return buffer, result
+
+    def _record(self, guard: int, values: Sequence[object], outcome: _O) -> _O:
+        buffer: GuardBuffer = self._local.buffer
+        return buffer.record(guard, self._columns[guard], values, outcome)
+
+    @property
+    def buffer(self) -> GuardBuffer:
+        """The buffer of the current thread."""
+
+        buffer: Optional[GuardBuffer] = getattr(self._local, "buffer", None)
+
+        if buffer is None:
+            buffer = self._local.buffer = GuardBuffer(self._variables, self._capacity, self._policy)
+
+        return buffer
+
+    @property
+    def variables(self) -> list[str]:
+        """The names of the variables read by any guard."""
+        return self._variables.copy()
+
+    @property
+    def guards(self) -> list[str]:
+        """The source of each guard, in the order of the guard indices."""
+        return [ast.unparse(guard) for guard in self._guards]
+
+    @property
+    def conditions(self) -> list[Optional[Guard]]:
+        """The condition of each guard, or None if the guard is not a supported condition."""
+
+        conditions: list[Optional[Guard]] = []
+
+        for guard in self._guards:
+            try:
+                conditions.append(Guard.from_expr(guard))
+            except (InvalidConditionExpression, TypeError):
+                conditions.append(None)
+
+        return conditions
+
+    @property
+    def ast(self) -> ast.FunctionDef:
+        """Return the instrumented function root AST node."""
+        return self._func_src
+
+    @property
+    def src(self) -> str:
+        """Return the instrumented function source"""
+        return ast.unparse(self._func_src)
+
+
+def capture_guards(
+    func: Callable[_P, _T], *, capacity: int = 1024, policy: _Policy = "overwrite"
+) -> GuardCaptureFunction[_P, _T]:
+    """Instrument a function to record every guard evaluation into a bounded buffer.
+
+    The variable dictionary of :py:func:`.instrument_function` only keeps the last value of each
+    variable, so the history of a guard that is evaluated many times inside a loop is lost. This
+    function instruments the function in the same way, and additionally wraps the test of every
+    conditional statement in a call that appends the index of the guard, the values of the variables
+    it reads, and its outcome to a :py:class:`GuardBuffer`.
+
+    The instrumented function is compiled inside a closure that provides the recording function, so
+    no names are added to the module that defines the function. Capturing the same function with
+    the same options again returns the existing instrumented function from the shared
+    :py:class:`.InstrumentationRegistry`.
+
+    Args:
+        func: The function to instrument
+        capacity: The maximum number of evaluations stored for each call
+        policy: Whether to ``"overwrite"`` the oldest evaluations or ``"drop"`` new evaluations once
+            the buffer is full
+
+    Returns:
+        The instrumented function
+
+    Raises:
+        ValueError: If the capacity is less than 1 or the policy is unknown
+        TypeError: If the function is a coroutine function
+    """
+
+    if inspect.iscoroutinefunction(func):
+        raise TypeError("Guard capture does not support coroutine functions")
+
+    _check_buffer(capacity, policy)
+
+    return InstrumentationRegistry.shared().get_or_create(
+        func, ("capture", capacity, policy), lambda: _create(func, capacity, policy)
+    )
+
+
+def _create(func: Callable[_P, _T], capacity: int, policy: _Policy) -> GuardCaptureFunction[_P, _T]:
+    func_tree = ast.parse(textwrap.dedent(inspect.getsource(func)))
+    func_def = cast(ast.FunctionDef, func_tree.body[0])
+
+    dict_statement = ast.parse(f"{_DICT_NAME} = dict()").body[0]
+    # Functions that fall off the end of their body still return the variable dictionary
+    fallthrough = ast.parse(f"return {_DICT_NAME}, None").body[0]
+    func_def.body = [dict_statement, *_instrument_block(_DICT_NAME, func_def.body), fallthrough]
+    func_def.name = f"{func_def.name}_captured"
+    func_def.decorator_list = []
+    func_def.returns = None
+    _strip_defaults(func_def)
+
+    recorder = _GuardRecorder()
+    recorder.visit(func_def)
+
+    freevars = (_RECORD_NAME, *func.__code__.co_freevars)
+    code = _compile_function(func_def, freevars)
+
+    def bind(record: Callable[..., Any]) -> Callable[..., tuple[dict[str, float], _T]]:
+        closure = _closure(code, func, {_RECORD_NAME: types.CellType(record)})
+        captured = types.FunctionType(code, func.__globals__, code.co_name, None, closure)
+        _copy_defaults(func, captured)
+        return cast(Callable[..., tuple[dict[str, float], _T]], captured)
+
+    return GuardCaptureFunction(bind, func_def, recorder.guards, recorder.keys, capacity, policy)
+
+
+__all__ = ["GuardBuffer", "GuardCaptureFunction", "capture_guards"]
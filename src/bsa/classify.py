@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Generic, Mapping, Optional, Sequence, TypeVar, Union
+
+import numpy as np
+
+from .robustness import _sample_count, condition_mask
+
+if TYPE_CHECKING:
+    from numpy.typing import ArrayLike, NDArray
+
+    from .branches import BranchTree, Guard
+    from .kripke import Kripke, State
+
+
+_GuardT = TypeVar("_GuardT", bound="Guard")
+
+
+@dataclass(frozen=True)
+class _Node:
+    """Decision node that selects a branch by evaluating a single condition.
+
+    Attributes:
+        condition: The condition labeling the states of the true branch
+        inverse: The condition labeling the states of the false branch
+        true: The node or state index reached when the condition is true
+        false: The node or state index reached when the inverse of the condition is true
+    """
+
+    condition: Guard
+    inverse: Guard
+    true: Union[_Node, int]
+    false: Union[_Node, int]
+
+
+def _build(paths: Sequence[tuple[int, Sequence[Guard]]], depth: int) -> Union[_Node, int]:
+    """Create a decision node from the root-to-leaf label paths of a set of states.
+
+    Args:
+        paths: The index of each state and its labels ordered from the root to the leaf
+        depth: The position of the labels that distinguish the states
+
+    Returns:
+        The decision node, or the index of the state if only a single state remains
+
+    Raises:
+        ValueError: If the labels of the states do not form a binary tree
+    """
+
+    if len(paths) == 1 and len(paths[0][1]) == depth:
+        return paths[0][0]
+
+    try:
+        condition = paths[0][1][depth]
+    except IndexError:
+        raise ValueError("The labels of the states do not form a branch tree") from None
+
+    inverse = condition.inverse()
+    true = [path for path in paths if path[1][depth] == condition]
+    false = [path for path in paths if path[1][depth] == inverse]
+
+    if len(false) == 0 or len(true) + len(false) != len(paths):
+        raise ValueError("The labels of the states do not form a branch tree")
+
+    return _Node(condition, inverse, _build(true, depth + 1), _build(false, depth + 1))
+
+
+class PathClassifier(Generic[_GuardT]):
+    """Find the active state of Kripke structures created from branch trees in O(depth) time.
+
+    Each state of a Kripke structure created by :py:meth:`.BranchTree.as_kripke` represents a path
+    from the root of the tree to a leaf, and is labeled with the condition chosen at every level of
+    the path. The classifier rebuilds the decision structure of the tree from these labels, so the
+    active state for a set of variables is found by evaluating a single condition per level instead
+    of evaluating the labels of every state as :py:func:`.active_branches` does. The results are the
+    states of the Kripke structures the classifier was created from.
+
+    Args:
+        kripkes: Kripke structures created by :py:meth:`.BranchTree.as_kripke`
+
+    Raises:
+        ValueError: If the labels of the states of a structure do not form a branch tree
+    """
+
+    def __init__(self, kripkes: Sequence[Kripke[_GuardT]]):
+        self._kripkes = list(kripkes)
+        self._states = [kripke.states for kripke in self._kripkes]
+        self._roots: list[Union[_Node, int]] = []
+
+        for i, kripke in enumerate(self._kripkes):
+            paths = [(j, kripke.labels_for(state)[::-1]) for j, state in enumerate(self._states[i])]
+            self._roots.append(_build(paths, 0))
+
+    @staticmethod
+    def from_trees(trees: Sequence[BranchTree]) -> PathClassifier[Guard]:
+        """Create a classifier from the Kripke structures of a set of branch trees.
+
+        The Kripke structures are available as :py:attr:`kripkes`, so the states returned by the
+        classifier can be matched against them.
+
+        Args:
+            trees: The branch trees, e.g. the output of :py:meth:`.BranchTree.from_function`
+
+        Returns:
+            The classifier
+        """
+
+        return PathClassifier([kripke for tree in trees for kripke in tree.as_kripke()])
+
+    @property
+    def kripkes(self) -> list[Kripke[_GuardT]]:
+        """The Kripke structures the classifier was created from."""
+        return self._kripkes.copy()
+
+    def classify(self, variables: Mapping[str, float]) -> list[Optional[State]]:
+        """Find the active state of each Kripke structure given a set of variables.
+
+        Args:
+            variables: The set of variable values the state labels depend on
+
+        Returns:
+            The active state of each structure, or None if the value of a variable needed to
+            choose a branch is not available
+        """
+
+        values = dict(variables)
+        states: list[Optional[State]] = []
+
+        for i, root in enumerate(self._roots):
+            node: Union[_Node, int, None] = root
+
+            while isinstance(node, _Node):
+                if node.condition.is_true(values):
+                    node = node.true
+                elif node.inverse.is_true(values):
+                    node = node.false
+                else:
+                    node = None
+
+            states.append(None if node is None else self._states[i][node])
+
+        return states
+
+    def classify_batch(self, samples: Mapping[str, ArrayLike]) -> NDArray[np.int64]:
+        """Find the active state of each Kripke structure for a batch of samples.
+
+        The samples are partitioned recursively, so each condition is only evaluated for the samples
+        that reach its node in the tree.
+
+        Args:
+            samples: Mapping from variable names to one-dimensional arrays of sample values
+
+        Returns:
+            A (structures, samples) array containing the index of the active state of each sample in
+            the states of each structure, or -1 if no state is active. Each row can be recorded
+            using :py:meth:`.CoverageAccumulator.record_indices`.
+        """
+
+        n_samples = _sample_count(samples)
+        columns = {name: np.asarray(values, dtype=np.float64) for name, values in samples.items()}
+        result = np.full((len(self._roots), n_samples), -1, dtype=np.int64)
+
+        for i, root in enumerate(self._roots):
+            _partition(root, np.arange(n_samples), columns, result[i])
+
+        return result
+
+
+def _partition(
+    node: Union[_Node, int],
+    indices: NDArray[np.intp],
+    columns: Mapping[str, NDArray[np.float64]],
+    result: NDArray[np.int64],
+) -> None:
+    """Assign the samples that reach a node to the states below the node."""
+
+    if len(indices) == 0:
+        return
+
+    if not isinstance(node, _Node):
+        result[indices] = node
+        return
+
+    variables = node.condition.variables
+
+    if not variables.issubset(columns):
+        return
+
+    subset = {name: columns[name][indices] for name in variables}
+    true = condition_mask(node.condition, subset)
+    false = condition_mask(node.inverse, subset)
+
+    _partition(node.true, indices[true], columns, result)
+    _partition(node.false, indices[false], columns, result)
+
+
+__all__ = ["PathClassifier"]
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Iterable, Optional
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from numpy.typing import ArrayLike, NDArray
+
+    from .kripke import Kripke, State
+
+
+@dataclass(frozen=True)
+class CoverageSnapshot:
+    """Copy of the counters of a coverage accumulator at a point in time.
+
+    Attributes:
+        hits: The number of samples in which each state was active
+        first_hits: The index of the first sample in which each state was active, or -1 if the state
+            has not been active in any sample
+        n_samples: The number of samples recorded
+    """
+
+    hits: NDArray[np.int64]
+    first_hits: NDArray[np.int64]
+    n_samples: int
+
+    @property
+    def covered(self) -> NDArray[np.bool_]:
+        """Mask of the states that have been active in at least one sample."""
+        return self.hits > 0
+
+    @property
+    def ratio(self) -> float:
+        """The fraction of states that have been active in at least one sample."""
+        return float(self.covered.mean()) if len(self.hits) > 0 else 1.0
+
+
+class CoverageAccumulator:
+    """Accumulate how often each state of a Kripke structure is active across many samples.
+
+    The accumulator only stores a hit counter and the index of the first hit for each state, so its
+    memory use is fixed regardless of the number of samples. States are identified by their index in
+    the set of states of the Kripke structure. Accumulators for the same Kripke structure that are
+    filled by parallel workers can be combined using :py:meth:`merge`.
+
+    Args:
+        kripke: The Kripke structure containing the states to track
+    """
+
+    def __init__(self, kripke: Kripke[Any]):
+        self._states = kripke.states
+        self._indices = {state: index for index, state in enumerate(self._states)}
+        self._hits = np.zeros(len(self._states), dtype=np.int64)
+        self._first_hits = np.full(len(self._states), -1, dtype=np.int64)
+        self._n_samples = 0
+
+    @property
+    def states(self) -> list[State]:
+        """The set of tracked states, in the order used by the counters."""
+        return self._states.copy()
+
+    @property
+    def n_samples(self) -> int:
+        """The number of samples recorded."""
+        return self._n_samples
+
+    def record(self, states: Iterable[State]) -> None:
+        """Record a single sample given the set of states active in the sample.
+
+        This function accepts the output of :py:func:`.active_branches` directly. A state that
+        appears more than once is only counted once, since a sample either activates a state or not.
+
+        Args:
+            states: The states active in the sample
+
+        Raises:
+            ValueError: If any state is not tracked by the accumulator
+        """
+
+        indices = set()
+
+        for state in states:
+            try:
+                indices.add(self._indices[state])
+            except KeyError:
+                raise ValueError(f"State {state} is not tracked by the accumulator") from None
+
+        for index in indices:
+            self._hits[index] += 1
+
+            if self._first_hits[index] < 0:
+                self._first_hits[index] = self._n_samples
+
+        self._n_samples += 1
+
+    def record_mask(self, active: ArrayLike) -> None:
+        """Record a batch of samples given a mask of the active states in each sample.
+
+        Args:
+            active: A (states, samples) boolean array where each column is the active state mask of
+                one sample, e.g. the result of :py:meth:`.LabelMasks.active` given the
+                :py:func:`.condition_mask` of each label
+
+        Raises:
+            ValueError: If the number of rows does not match the number of states
+        """
+
+        mask = np.asarray(active, dtype=np.bool_)
+
+        if mask.ndim != 2 or mask.shape[0] != len(self._states):
+            raise ValueError(f"Expected an active state mask with {len(self._states)} rows")
+
+        hit = mask.any(axis=1)
+        first = hit & (self._first_hits < 0)
+
+        self._hits += mask.sum(axis=1)
+        self._first_hits[first] = self._n_samples + mask[first].argmax(axis=1)
+        self._n_samples += mask.shape[1]
+
+    def record_indices(self, indices: ArrayLike) -> None:
+        """Record a batch of samples in which at most one state is active.
+
+        Args:
+            indices: The index of the active state of each sample, or -1 if no state is active
+
+        Raises:
+            ValueError: If any index is not a valid state index
+        """
+
+        values = np.asarray(indices, dtype=np.int64)
+
+        if np.any((values < -1) | (values >= len(self._states))):
+            raise ValueError("State indices must be -1 or valid indices of tracked states")
+
+        positions = np.flatnonzero(values >= 0)
+        hit, first = np.unique(values[positions], return_index=True)
+        new = self._first_hits[hit] < 0
+
+        self._hits += np.bincount(values[positions], minlength=len(self._states))
+        self._first_hits[hit[new]] = self._n_samples + positions[first[new]]
+        self._n_samples += len(values)
+
+    def merge(self, other: CoverageAccumulator, *, offset: Optional[int] = None) -> None:
+        """Add the counters of another accumulator into this accumulator.
+
+        The samples of the other accumulator are treated as if they were recorded after the samples
+        of this accumulator, unless a different offset for the sample indices is provided.
+
+        Args:
+            other: The accumulator to merge
+            offset: The index of the first sample of the other accumulator
+
+        Raises:
+            ValueError: If the accumulators do not track the same states
+        """
+
+        if other._states != self._states:
+            raise ValueError("Only accumulators tracking the same states can be merged")
+
+        start = self._n_samples if offset is None else offset
+        other_first = np.where(other._first_hits >= 0, other._first_hits + start, -1)
+        replace = (other_first >= 0) & ((self._first_hits < 0) | (other_first < self._first_hits))
+
+        self._hits += other._hits
+        self._first_hits[replace] = other_first[replace]
+        self._n_samples = max(self._n_samples, start + other._n_samples)
+
+    def snapshot(self) -> CoverageSnapshot:
+        """Copy the current counters.
+
+        The copy is independent of the accumulator, so it can be inspected or exported while more
+        samples are recorded.
+
+        Returns:
+            A snapshot of the counters
+        """
+
+        return CoverageSnapshot(self._hits.copy(), self._first_hits.copy(), self._n_samples)
+
+
+__all__ = ["CoverageAccumulator", "CoverageSnapshot"]
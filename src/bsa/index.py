@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import threading
+import weakref
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, TypeVar
+
+import numpy as np
+
+from .kripke import State, _bits
+
+if TYPE_CHECKING:
+    from .branches import Guard
+    from .kripke import Kripke
+
+
+_GuardT = TypeVar("_GuardT", bound="Guard")
+
+
+def _mask(indices: Iterable[int], n_states: int) -> int:
+    """Create an integer bitset with the bits of a set of state indices set."""
+
+    bits = np.zeros(n_states, dtype=np.bool_)
+    bits[np.fromiter(indices, dtype=np.intp)] = True
+    return int.from_bytes(np.packbits(bits, bitorder="little").tobytes(), "little")
+
+
+class StateSet:
+    """Immutable set of states of a Kripke structure represented as an integer bitset.
+
+    Bit ``i`` of the bitset is set if the state with index ``i`` in ``kripke.states`` is a member
+    of the set. Sets of the same structure are combined using the ``&``, ``|``, ``-`` and ``^``
+    operators, and ``~`` returns the complement with respect to all states of the structure. The
+    operators only combine the bitsets, so states are only created when the set is iterated.
+
+    Args:
+        index: The index of the Kripke structure the states belong to
+        mask: The bitset of member states
+    """
+
+    __slots__ = ("_index", "_mask")
+
+    def __init__(self, index: StateIndex, mask: int):
+        self._index = index
+        self._mask = mask
+
+    @property
+    def mask(self) -> int:
+        """The bitset of member states."""
+        return self._mask
+
+    @property
+    def indices(self) -> list[int]:
+        """The indices of the member states in increasing order."""
+        return list(_bits(self._mask))
+
+    @property
+    def states(self) -> list[State]:
+        """The member states in state order."""
+        return list(self)
+
+    def _check(self, other: StateSet) -> int:
+        if other._index is not self._index:
+            raise ValueError("Only sets of states of the same Kripke structure can be combined")
+
+        return other._mask
+
+    def __and__(self, other: object) -> StateSet:
+        if not isinstance(other, StateSet):
+            return NotImplemented
+
+        return StateSet(self._index, self._mask & self._check(other))
+
+    def __or__(self, other: object) -> StateSet:
+        if not isinstance(other, StateSet):
+            return NotImplemented
+
+        return StateSet(self._index, self._mask | self._check(other))
+
+    def __sub__(self, other: object) -> StateSet:
+        if not isinstance(other, StateSet):
+            return NotImplemented
+
+        return StateSet(self._index, self._mask & ~self._check(other))
+
+    def __xor__(self, other: object) -> StateSet:
+        if not isinstance(other, StateSet):
+            return NotImplemented
+
+        return StateSet(self._index, self._mask ^ self._check(other))
+
+    def __invert__(self) -> StateSet:
+        return StateSet(self._index, self._index._all & ~self._mask)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, StateSet):
+            return NotImplemented
+
+        return self._index is other._index and self._mask == other._mask
+
+    def __hash__(self) -> int:
+        return hash((id(self._index), self._mask))
+
+    def __len__(self) -> int:
+        return bin(self._mask).count("1")
+
+    def __bool__(self) -> bool:
+        return self._mask != 0
+
+    def __iter__(self) -> Iterator[State]:
+        states = self._index._states
+        return (states[index] for index in _bits(self._mask))
+
+    def __contains__(self, state: object) -> bool:
+        if not isinstance(state, State):
+            return False
+
+        index = self._index._positions.get(state)
+        return index is not None and bool(self._mask >> index & 1)
+
+    def __repr__(self) -> str:
+        return f"StateSet(indices={self.indices})"
+
+
+class StateIndex:
+    """Inverted indexes from variables and conditions to the states of a Kripke structure.
+
+    The labels of every state are scanned once, and each variable returned by
+    :py:attr:`.Condition.variables` and each label is mapped to the :py:class:`StateSet` of states
+    whose labels contain it. Queries return these sets directly, so they can be combined using set
+    operators without scanning the labels again.
+
+    The index of a structure should be obtained using :py:meth:`of`, which builds the index the
+    first time it is requested and reuses it for as long as the structure exists. Kripke structures
+    are never modified in place, so a cached index is never out of date. The index does not keep the
+    structure alive.
+
+    Args:
+        kripke: The Kripke structure to index
+    """
+
+    _cache: weakref.WeakKeyDictionary[Kripke[Any], StateIndex] = weakref.WeakKeyDictionary()
+    _lock = threading.Lock()
+
+    def __init__(self, kripke: Kripke[_GuardT]):
+        states = kripke.states
+        variables: dict[str, list[int]] = {}
+        conditions: dict[Guard, list[int]] = {}
+
+        for i, state in enumerate(states):
+            for label in kripke.labels_for(state):
+                conditions.setdefault(label, []).append(i)
+
+                for variable in label.variables:
+                    variables.setdefault(variable, []).append(i)
+
+        self._states = states
+        self._positions = {state: i for i, state in enumerate(states)}
+        self._all = (1 << len(states)) - 1
+        self._variables = {name: _mask(indices, len(states)) for name, indices in variables.items()}
+        self._conditions = {
+            label: _mask(indices, len(states)) for label, indices in conditions.items()
+        }
+
+    @classmethod
+    def of(cls, kripke: Kripke[_GuardT]) -> StateIndex:
+        """Return the cached index of a Kripke structure, creating it if necessary.
+
+        Args:
+            kripke: The Kripke structure
+
+        Returns:
+            The index of the structure
+        """
+
+        with cls._lock:
+            index = cls._cache.get(kripke)
+
+            if index is None:
+                index = cls._cache[kripke] = StateIndex(kripke)
+
+        return index
+
+    @property
+    def states(self) -> list[State]:
+        """The states of the indexed structure, in the order used by the bitsets."""
+        return self._states.copy()
+
+    @property
+    def variables(self) -> set[str]:
+        """The set of variables the labels of any state depend on."""
+        return set(self._variables)
+
+    @property
+    def conditions(self) -> set[Guard]:
+        """The set of labels of any state."""
+        return set(self._conditions)
+
+    def all(self) -> StateSet:
+        """Return the set of every state of the structure."""
+        return StateSet(self, self._all)
+
+    def none(self) -> StateSet:
+        """Return the empty set of states."""
+        return StateSet(self, 0)
+
+    def depends_on(self, *variables: str) -> StateSet:
+        """Find the states whose labels depend on any of a set of variables.
+
+        Args:
+            variables: The names of the variables
+
+        Returns:
+            The states with at least one label that depends on one of the variables
+        """
+
+        mask = 0
+
+        for variable in variables:
+            mask |= self._variables.get(variable, 0)
+
+        return StateSet(self, mask)
+
+    def labeled(self, condition: Guard) -> StateSet:
+        """Find the states labeled with a condition.
+
+        Args:
+            condition: The condition
+
+        Returns:
+            The states whose labels contain the condition
+        """
+
+        return StateSet(self, self._conditions.get(condition, 0))
+
+    def decided_by(self, condition: Guard) -> StateSet:
+        """Find the states labeled with a condition or its inverse.
+
+        These are the states on either side of the conditional statement that evaluates the
+        condition.
+
+        Args:
+            condition: The condition
+
+        Returns:
+            The states whose labels contain the condition or its inverse
+        """
+
+        return self.labeled(condition) | self.labeled(condition.inverse())
+
+
+__all__ = ["StateIndex", "StateSet"]
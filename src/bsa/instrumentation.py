@@ -1,15 +1,37 @@
 from __future__ import annotations
 
 import ast
+import copy
 import inspect
+import textwrap
+import threading
+import types
+import weakref
 from dataclasses import dataclass
 from functools import singledispatch
-from typing import Callable, Generic, Optional, TypeVar, cast
+from typing import (
+    Any,
+    Callable,
+    Coroutine,
+    Generic,
+    Hashable,
+    Iterable,
+    Literal,
+    Optional,
+    Protocol,
+    Sequence,
+    TypeVar,
+    Union,
+    cast,
+    overload,
+)
 
 from typing_extensions import ParamSpec
 
 _P = ParamSpec("_P")
 _T = TypeVar("_T")
+_R = TypeVar("_R")
+_Instrumented = Union["InstrumentedFunction[_P, Any]", "AsyncInstrumentedFunction[_P, Any]"]
 
 
 @dataclass(frozen=True)
@@ -33,7 +55,137 @@ class InstrumentedFunction(Generic[_P, _T]):
         return ast.unparse(self._func_src)
 
 
-def instrument_function(func: Callable[_P, _T]) -> InstrumentedFunction[_P, _T]:
+@dataclass(frozen=True)
+class AsyncInstrumentedFunction(Generic[_P, _T]):
+    """Wrapper around an instrumented coroutine function.
+
+    Calling the wrapper returns a coroutine that evaluates to a tuple containing the conditional
+    variable states and the original result of the coroutine.
+    """
+
+    _func: Callable[_P, Coroutine[Any, Any, tuple[dict[str, float], _T]]]
+    _func_src: ast.AsyncFunctionDef
+
+    def __call__(
+        self, *args: _P.args, **kwds: _P.kwargs
+    ) -> Coroutine[Any, Any, tuple[dict[str, float], _T]]:
+        return self._func(*args, **kwds)
+
+    @property
+    def ast(self) -> ast.AsyncFunctionDef:
+        """Return the instrumented coroutine function root AST node."""
+        return self._func_src
+
+    @property
+    def src(self) -> str:
+        """Return the instrumented coroutine function source"""
+        return ast.unparse(self._func_src)
+
+
+class LazyInstrumentedFunction(Generic[_P, _R]):
+    """Proxy that instruments a function the first time it is called.
+
+    The proxy only stores a reference to the original function, so creating it does not read,
+    parse or compile any source code. The first call, or the first access of the :py:attr:`ast` or
+    :py:attr:`src` properties, instruments the function and caches the result for every subsequent
+    call. Instrumentation is guarded by a lock, so a function called from several threads at once
+    is only instrumented a single time.
+
+    Args:
+        func: The function to instrument on first use
+    """
+
+    def __init__(self, func: Callable[_P, Any]):
+        self._target = func
+        self._lock = threading.Lock()
+        self._instrumented: Optional[_Instrumented[_P]] = None
+
+    def __call__(self, *args: _P.args, **kwds: _P.kwargs) -> _R:
+        return cast(_R, self.instrument()(*args, **kwds))
+
+    @property
+    def is_instrumented(self) -> bool:
+        """Whether the function has already been instrumented."""
+        return self._instrumented is not None
+
+    @property
+    def ast(self) -> Union[ast.FunctionDef, ast.AsyncFunctionDef]:
+        """Return the instrumented function root AST node."""
+        return self.instrument().ast
+
+    @property
+    def src(self) -> str:
+        """Return the instrumented function source"""
+        return self.instrument().src
+
+    def instrument(self) -> _Instrumented[_P]:
+        """Instrument the function if it has not been instrumented yet.
+
+        Returns:
+            The instrumented function
+        """
+
+        instrumented = self._instrumented
+
+        if instrumented is None:
+            with self._lock:
+                if self._instrumented is None:
+                    self._instrumented = _instrument(self._target)
+
+                instrumented = self._instrumented
+
+        return instrumented
+
+
+class _LazyDecorator(Protocol):
+    """Decorator returned by :py:func:`instrument_function` when no function is provided."""
+
+    @overload
+    def __call__(  # type: ignore[overload-overlap]
+        self, func: Callable[_P, Coroutine[Any, Any, _T]]
+    ) -> LazyInstrumentedFunction[_P, Coroutine[Any, Any, tuple[dict[str, float], _T]]]: ...
+
+    @overload
+    def __call__(
+        self, func: Callable[_P, _T]
+    ) -> LazyInstrumentedFunction[_P, tuple[dict[str, float], _T]]: ...
+
+
+@overload
+def instrument_function(  # type: ignore[overload-overlap]
+    func: Callable[_P, Coroutine[Any, Any, _T]],
+    *,
+    lazy: Literal[False] = False,
+) -> AsyncInstrumentedFunction[_P, _T]: ...
+
+
+@overload
+def instrument_function(
+    func: Callable[_P, _T], *, lazy: Literal[False] = False
+) -> InstrumentedFunction[_P, _T]: ...
+
+
+@overload
+def instrument_function(  # type: ignore[overload-overlap]
+    func: Callable[_P, Coroutine[Any, Any, _T]],
+    *,
+    lazy: Literal[True],
+) -> LazyInstrumentedFunction[_P, Coroutine[Any, Any, tuple[dict[str, float], _T]]]: ...
+
+
+@overload
+def instrument_function(
+    func: Callable[_P, _T], *, lazy: Literal[True]
+) -> LazyInstrumentedFunction[_P, tuple[dict[str, float], _T]]: ...
+
+
+@overload
+def instrument_function(*, lazy: Literal[True]) -> _LazyDecorator: ...
+
+
+def instrument_function(
+    func: Optional[Callable[_P, Any]] = None, *, lazy: bool = False
+) -> Union[_Instrumented[_P], LazyInstrumentedFunction[_P, Any], _LazyDecorator]:
     """Decorator to instrument a function for Kripke analysis.
 
     Instrumentation of the function is accomplished by modifying the AST of the function to add
@@ -44,21 +196,255 @@ def instrument_function(func: Callable[_P, _T]) -> InstrumentedFunction[_P, _T]:
     where the first element is the variable dictionary and the second element is the original
     return value.
 
+    Coroutine functions defined using ``async def`` are instrumented in the same way, in which case
+    the tuple is the result of awaiting the instrumented coroutine.
+
+    By default the function is instrumented immediately, which means that using this decorator
+    parses and compiles the function when its module is imported. In lazy mode the decorator
+    returns a :py:class:`LazyInstrumentedFunction` that defers this work until the function is
+    first called, and :py:func:`warm_up` can be used to instrument selected functions ahead of
+    time. Lazy mode can be used as a decorator by writing ``@instrument_function(lazy=True)``.
+
+    The instrumented function is bound to the global namespace of the original function without
+    adding any names to its module. Instrumenting a function that has already been instrumented
+    returns the existing instrumented function from the shared :py:class:`InstrumentationRegistry`
+    as long as it is still in use.
+
+    Args:
+        func: The function to instrument
+        lazy: Whether to defer instrumentation until the function is first called
+
+    Returns:
+        A new function object with instrumentation code injected, a lazy proxy if lazy mode is
+        enabled, or a decorator if no function is provided
+    """
+
+    if func is None:
+        if not lazy:
+            raise TypeError("A function to instrument must be provided unless lazy is enabled")
+
+        return cast(_LazyDecorator, LazyInstrumentedFunction)
+
+    if lazy:
+        return LazyInstrumentedFunction(func)
+
+    return _instrument(func)
+
+
+def warm_up(funcs: Iterable[LazyInstrumentedFunction[..., Any]]) -> None:
+    """Instrument a set of lazily instrumented functions ahead of their first call.
+
+    This moves the instrumentation cost of functions that are known to be needed out of the first
+    call, e.g. while a worker process is starting. Functions that have already been instrumented
+    are skipped.
+
+    Args:
+        funcs: The lazily instrumented functions to instrument
+    """
+
+    for func in funcs:
+        func.instrument()
+
+
+class InstrumentationRegistry:
+    """Cache of instrumented functions keyed by the code they were created from.
+
+    Instrumenting the same function several times, e.g. when a decorator is applied inside a loop or
+    a test fixture, produces identical code. The registry identifies each function by its code
+    object, its global namespace, the identity of its default argument values and closure cells,
+    and the instrumentation options, and returns the existing instrumented function for a key that
+    has already been seen instead of compiling it again.
+
+    The registry only holds weak references to the instrumented functions, so an entry is removed
+    once the instrumented function is no longer used.
+    """
+
+    _shared: InstrumentationRegistry
+
+    def __init__(self) -> None:
+        self._entries: weakref.WeakValueDictionary[Hashable, Any] = weakref.WeakValueDictionary()
+        self._lock = threading.RLock()
+
+    @classmethod
+    def shared(cls) -> InstrumentationRegistry:
+        """Return the registry shared by the instrumentation functions of this package."""
+        return cls._shared
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Remove every entry from the registry."""
+
+        with self._lock:
+            self._entries.clear()
+
+    def get_or_create(
+        self, func: Callable[..., Any], options: Hashable, create: Callable[[], _T]
+    ) -> _T:
+        """Return the cached instrumentation of a function, creating it if necessary.
+
+        Args:
+            func: The function being instrumented
+            options: Hashable description of the kind of instrumentation and its options
+            create: Function that instruments the function when no cached instrumentation exists
+
+        Returns:
+            The cached or newly created instrumentation
+        """
+
+        code = getattr(func, "__code__", None)
+
+        if code is None:
+            return create()
+
+        defaults = getattr(func, "__defaults__", None) or ()
+        kwdefaults = getattr(func, "__kwdefaults__", None) or {}
+        closure = getattr(func, "__closure__", None) or ()
+        key = (
+            code,
+            # The globals, default values and cells are kept alive by the instrumented function, so
+            # their ids are not reused while the entry exists
+            id(getattr(func, "__globals__", None)),
+            tuple(id(value) for value in defaults),
+            tuple(sorted((name, id(value)) for name, value in kwdefaults.items())),
+            tuple(id(cell) for cell in closure),
+            options,
+        )
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                entry = create()
+                self._entries[key] = entry
+
+            return cast(_T, entry)
+
+
+InstrumentationRegistry._shared = InstrumentationRegistry()
+
+
+def _strip_defaults(func_def: Union[ast.FunctionDef, ast.AsyncFunctionDef]) -> None:
+    """Remove the default argument values from a function definition.
+
+    The default values are copied from the original function by :py:func:`_copy_defaults` instead,
+    so the default value expressions are never evaluated again.
+    """
+
+    func_def.args.defaults = []
+    func_def.args.kw_defaults = [None for _ in func_def.args.kwonlyargs]
+
+
+def _copy_defaults(source: Callable[..., Any], target: Callable[..., Any]) -> None:
+    target.__defaults__ = getattr(source, "__defaults__", None)
+    kwdefaults = getattr(source, "__kwdefaults__", None)
+    target.__kwdefaults__ = None if kwdefaults is None else dict(kwdefaults)
+
+
+def _compile_function(
+    func_def: Union[ast.FunctionDef, ast.AsyncFunctionDef], freevars: Sequence[str] = ()
+) -> types.CodeType:
+    """Compile a function definition into a code object without executing the definition.
+
+    The definition is compiled inside of a factory function that takes the given names as
+    arguments, so references to these names are compiled as free variables of the function instead
+    of global names. The code object must be bound to a closure created by :py:func:`_closure`.
+    """
+
+    factory_def = cast(
+        ast.FunctionDef, ast.parse(f"def factory({', '.join(freevars)}): pass").body[0]
+    )
+    factory_def.body = [func_def]
+    module = ast.fix_missing_locations(ast.Module(body=[factory_def], type_ignores=[]))
+    module_code = compile(module, filename="<instrumentation>", mode="exec")
+    factory_code = next(c for c in module_code.co_consts if isinstance(c, types.CodeType))
+
+    return next(c for c in factory_code.co_consts if isinstance(c, types.CodeType))
+
+
+def _closure(
+    code: types.CodeType,
+    func: Callable[..., Any],
+    cells: Optional[dict[str, types.CellType]] = None,
+) -> Optional[tuple[types.CellType, ...]]:
+    """Create the closure of an instrumented code object from the closure of the original function.
+
+    The cells of the original function are shared instead of copied, so the instrumented function
+    observes and makes the same changes to the variables of the enclosing scope.
+
+    Args:
+        code: The instrumented code object, compiled using :py:func:`_compile_function`
+        func: The original function
+        cells: Additional cells for free variables introduced by the instrumentation
+
+    Returns:
+        The cell of each free variable of the code object, or None if it has no free variables
+    """
+
+    original = func.__code__
+    closure = getattr(func, "__closure__", None) or ()
+    available = {name: closure[i] for i, name in enumerate(original.co_freevars)}
+    available.update(cells or {})
+
+    return tuple(available[name] for name in code.co_freevars) or None
+
+
+def _instrument(func: Callable[_P, Any]) -> _Instrumented[_P]:
+    """Instrument a function using the shared registry."""
+    return InstrumentationRegistry.shared().get_or_create(func, "instrument", lambda: _create(func))
+
+
+def _create(func: Callable[_P, Any]) -> _Instrumented[_P]:
+    """Instrument a function by rewriting and recompiling its source.
+
+    The decorators and default values of the function are removed from the rewritten definition,
+    which is compiled into a code object and bound to the global namespace and the closure of the
+    original function. The instrumented function therefore resolves the same global and nonlocal
+    names as the original function without adding any names to its module, and shares its default
+    values.
+
     Args:
         func: The function to instrument
 
     Returns:
-        A new function object with instrumentation code injected
+        The instrumented function
     """
 
-    func_tree = ast.parse(inspect.getsource(func))
-    func_def = cast(ast.FunctionDef, func_tree.body[0])
+    func_tree = ast.parse(textwrap.dedent(inspect.getsource(func)))
+    func_def = cast(Union[ast.FunctionDef, ast.AsyncFunctionDef], func_tree.body[0])
 
     dict_name = "__vars"
     dict_statement = ast.parse(f"{dict_name} = dict()").body[0]
     func_def.body = [dict_statement] + _instrument_block(dict_name, func_def.body)
     func_def.name = f"{func_def.name}_instrumented"
-    func_def.returns = ast.Subscript(
+    func_def.decorator_list = []
+
+    if func_def.returns is not None:
+        func_def.returns = _instrumented_returns(func_def.returns)
+
+    _strip_defaults(func_def)
+    code = _compile_function(func_def, func.__code__.co_freevars)
+    func_obj = types.FunctionType(code, func.__globals__, code.co_name, None, _closure(code, func))
+    _copy_defaults(func, func_obj)
+
+    if isinstance(func_def, ast.AsyncFunctionDef):
+        return AsyncInstrumentedFunction(func_obj, func_def)
+
+    return InstrumentedFunction(func_obj, func_def)
+
+
+def _instrumented_returns(returns: ast.expr) -> ast.expr:
+    """Wrap a return type annotation into a tuple annotation that includes the variable dictionary.
+
+    Args:
+        returns: The original return type annotation
+
+    Returns:
+        An AST node representing the instrumented return type annotation
+    """
+
+    return ast.Subscript(
         value=ast.Name(id="tuple", ctx=ast.Load()),
         slice=ast.Tuple(
             elts=[
@@ -73,23 +459,62 @@ def instrument_function(func: Callable[_P, _T]) -> InstrumentedFunction[_P, _T]:
                     ),
                     ctx=ast.Load(),
                 ),
-                func_def.returns,
+                returns,
             ],
             ctx=ast.Load(),
         ),
         ctx=ast.Load(),
     )
-    fixed_tree = ast.fix_missing_locations(func_tree)
-    func_obj = compile(fixed_tree, filename="<instrumentation>", mode="exec")
-    func_mod = inspect.getmodule(func)
-    mod_defs = vars(func_mod)
 
-    if func_mod is None:
-        raise RuntimeError()
 
-    exec(func_obj, mod_defs)  # pylint: disable=exec-used
+async def gather_instrumented(
+    func: Callable[..., Coroutine[Any, Any, tuple[dict[str, float], _T]]],
+    inputs: Iterable[Sequence[Any]],
+    *,
+    max_concurrency: int = 100,
+) -> list[tuple[dict[str, float], _T]]:
+    """Evaluate an instrumented coroutine function for many inputs with bounded concurrency.
 
-    return InstrumentedFunction(mod_defs[func_def.name], func_def)
+    A fixed number of worker tasks pull argument tuples from the inputs as they finish, so at most
+    ``max_concurrency`` coroutines are running at any time and the inputs are never materialized
+    into a list of pending tasks. If any evaluation raises an exception, the remaining workers are
+    cancelled and the exception is propagated.
+
+    Args:
+        func: The instrumented coroutine function, which may be lazily instrumented
+        inputs: The positional arguments of each evaluation
+        max_concurrency: The maximum number of coroutines that run at the same time
+
+    Returns:
+        The result of each evaluation, in the same order as the inputs
+
+    Raises:
+        ValueError: If the maximum concurrency is less than 1
+    """
+
+    import asyncio  # pylint: disable=import-outside-toplevel
+
+    if max_concurrency < 1:
+        raise ValueError("Maximum concurrency must be at least 1")
+
+    results: dict[int, tuple[dict[str, float], _T]] = {}
+    pending = enumerate(inputs)
+
+    async def worker() -> None:
+        for index, args in pending:
+            results[index] = await func(*args)
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(max_concurrency)]
+
+    try:
+        await asyncio.gather(*workers)
+    except BaseException:
+        for task in workers:
+            task.cancel()
+
+        raise
+
+    return [results[index] for index in range(len(results))]
 
 
 def variable_name(expr: ast.expr) -> str:
@@ -342,13 +767,35 @@ def _(stmt: ast.Return, dict_name: str) -> tuple[list[ast.stmt], ast.stmt]:
     which contains the variable dictionary and the original return value.
     """
 
+    value = stmt.value if stmt.value is not None else ast.Constant(value=None)
     new_return = ast.Return(
-        value=ast.Tuple(elts=[ast.Name(id=dict_name, ctx=ast.Load()), stmt.value], ctx=ast.Load()),
+        value=ast.Tuple(elts=[ast.Name(id=dict_name, ctx=ast.Load()), value], ctx=ast.Load()),
     )
 
     return ([], new_return)
 
 
+def _instrument_loop(
+    stmt: Union[ast.For, ast.AsyncFor, ast.While], dict_name: str
+) -> tuple[list[ast.stmt], ast.stmt]:
+    """Instrument the body and else block of a loop statement.
+
+    The loop header is left unchanged, so any conditional statements and return statements inside
+    the loop are instrumented every time the loop body is executed.
+    """
+
+    new_stmt = copy.copy(stmt)
+    new_stmt.body = _instrument_block(dict_name, stmt.body)
+    new_stmt.orelse = _instrument_block(dict_name, stmt.orelse)
+
+    return ([], new_stmt)
+
+
+_instrument_stmt.register(ast.For, _instrument_loop)
+_instrument_stmt.register(ast.AsyncFor, _instrument_loop)
+_instrument_stmt.register(ast.While, _instrument_loop)
+
+
 def _instrument_block(dict_name: str, block: list[ast.stmt]) -> list[ast.stmt]:
     """Instrument a block of statements.
 
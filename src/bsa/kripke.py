@@ -2,14 +2,19 @@ from __future__ import annotations
 
 import uuid
 from dataclasses import dataclass, field
-from typing import Generic, Iterable, Mapping, Sequence, TypeVar
+from functools import cached_property
+from typing import Generic, Iterator, Mapping, Sequence, TypeVar
 
 _LabelT = TypeVar("_LabelT")
 
 
-def _concat(lists: list[list[_LabelT]]) -> list[_LabelT]:
-    """Flatten a list of lists."""
-    return [elem for list_ in lists for elem in list_]
+def _bits(mask: int) -> Iterator[int]:
+    """Iterate over the indices of the set bits of an integer bitset in increasing order."""
+
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
 
 
 @dataclass(frozen=True)
@@ -22,6 +27,18 @@ class State:
 
     _id: uuid.UUID = field(init=False, default_factory=uuid.uuid4)
 
+    @classmethod
+    def _with_id(cls, id_: uuid.UUID) -> State:
+        """Re-create a state with a known unique value.
+
+        This is used when a Kripke structure is rebuilt from an exported representation so that the
+        states of the rebuilt structure compare equal to the states of the original structure.
+        """
+
+        state = cls()
+        object.__setattr__(state, "_id", id_)
+        return state
+
 
 @dataclass(frozen=True)
 class Edge:
@@ -41,6 +58,10 @@ class Kripke(Generic[_LabelT]):
         that are both elements of S
       - A labeling function L that returns a set of labels for each state in S
 
+    Graph queries like reachability are computed on an indexed adjacency representation where each
+    set of states is an integer bitset. Since a Kripke structure is never modified after it is
+    created, the results of these queries are cached on the instance.
+
     This class is generic over the type used to represent the labels. In general, labels are boolean
     functions (atomic propositions) representing things that are true within the state. In this
     class we represent the labeling function as a python dict with the states as keys. Practically,
@@ -69,6 +90,7 @@ class Kripke(Generic[_LabelT]):
         self._initial = {state: initial.get(state, False) for state in states}
         self._labels = {state: list(labels.get(state, [])) for state in states}
         self._edges = list(edges)
+        self._reachable: dict[int, int] = {}
 
     @property
     def states(self) -> list[State]:
@@ -85,6 +107,68 @@ class Kripke(Generic[_LabelT]):
         """Set of edges between all states of the Kripke structure"""
         return self._edges.copy()
 
+    @cached_property
+    def _indices(self) -> dict[State, int]:
+        """Mapping from each state to its index in the set of states."""
+        return {state: index for index, state in enumerate(self._states)}
+
+    @cached_property
+    def _successors(self) -> list[list[int]]:
+        """Adjacency list containing the indices of the successors of each state."""
+
+        successors: list[list[int]] = [[] for _ in self._states]
+
+        for edge in self._edges:
+            successors[self._indices[edge.source]].append(self._indices[edge.target])
+
+        return successors
+
+    @cached_property
+    def _successor_masks(self) -> list[int]:
+        """Bitset of the successors of each state."""
+
+        masks = []
+
+        for successors in self._successors:
+            mask = 0
+
+            for index in successors:
+                mask |= 1 << index
+
+            masks.append(mask)
+
+        return masks
+
+    def _index(self, state: State) -> int:
+        try:
+            return self._indices[state]
+        except KeyError:
+            raise ValueError(f"State {state} is not a member of Kripke structure") from None
+
+    def _reach(self, mask: int) -> int:
+        """Compute the bitset of states reachable from a bitset of starting states.
+
+        The search expands a frontier of newly reached states until no new states are found, so
+        each state is expanded at most once.
+        """
+
+        successors = self._successor_masks
+        reached = frontier = mask
+
+        while frontier:
+            expanded = 0
+
+            for index in _bits(frontier):
+                expanded |= successors[index]
+
+            frontier = expanded & ~reached
+            reached |= frontier
+
+        return reached
+
+    def _states_in(self, mask: int) -> list[State]:
+        return [self._states[index] for index in _bits(mask)]
+
     def states_from(self, state: State) -> list[State]:
         """Return the set of all states reachable from a given state.
 
@@ -98,10 +182,135 @@ class Kripke(Generic[_LabelT]):
             ValueError: If the starting state is not in the set of states
         """
 
-        if state not in self.states:
-            raise ValueError(f"State {state} is not a member of Kripke structure")
+        successors = self._successors[self._index(state)]
+        return [self._states[index] for index in successors] + [state]
+
+    def reachable_from(self, state: State) -> list[State]:
+        """Return the set of all states transitively reachable from a given state.
+
+        The starting state is always included in the result.
+
+        Args:
+            state: The starting state
+
+        Returns:
+            The set of states reachable from the starting state by following any number of edges
+
+        Raises:
+            ValueError: If the starting state is not in the set of states
+        """
+
+        index = self._index(state)
+
+        if index not in self._reachable:
+            self._reachable[index] = self._reach(1 << index)
+
+        return self._states_in(self._reachable[index])
+
+    def is_reachable(self, source: State, target: State) -> bool:
+        """Check if a state is transitively reachable from another state.
+
+        Args:
+            source: The starting state
+            target: The state to reach
+
+        Returns:
+            True if the target can be reached from the source, False otherwise
+
+        Raises:
+            ValueError: If either state is not in the set of states
+        """
+
+        index = self._index(source)
+
+        if index not in self._reachable:
+            self._reachable[index] = self._reach(1 << index)
 
-        return [edge.target for edge in self._edges if edge.source == state] + [state]
+        return bool(self._reachable[index] >> self._index(target) & 1)
+
+    @cached_property
+    def _initial_reachable(self) -> int:
+        mask = 0
+
+        for index, state in enumerate(self._states):
+            if self._initial[state] is True:
+                mask |= 1 << index
+
+        return self._reach(mask)
+
+    @property
+    def reachable_states(self) -> list[State]:
+        """Set of states reachable from any initial state of the Kripke structure."""
+        return self._states_in(self._initial_reachable)
+
+    @cached_property
+    def _components(self) -> list[list[int]]:
+        """Compute the strongly connected components using an iterative Tarjan's algorithm."""
+
+        successors = self._successors
+        order = [-1] * len(self._states)
+        lowlink = [0] * len(self._states)
+        on_stack = [False] * len(self._states)
+        stack: list[int] = []
+        components: list[list[int]] = []
+        counter = 0
+
+        for root in range(len(self._states)):
+            if order[root] != -1:
+                continue
+
+            work = [(root, 0)]
+
+            while work:
+                node, start = work.pop()
+
+                if start == 0:
+                    order[node] = lowlink[node] = counter
+                    counter += 1
+                    stack.append(node)
+                    on_stack[node] = True
+                else:
+                    child = successors[node][start - 1]
+                    lowlink[node] = min(lowlink[node], lowlink[child])
+
+                for position in range(start, len(successors[node])):
+                    child = successors[node][position]
+
+                    if order[child] == -1:
+                        work.append((node, position + 1))
+                        work.append((child, 0))
+                        break
+
+                    if on_stack[child]:
+                        lowlink[node] = min(lowlink[node], order[child])
+                else:
+                    if lowlink[node] == order[node]:
+                        component = []
+
+                        while True:
+                            member = stack.pop()
+                            on_stack[member] = False
+                            component.append(member)
+
+                            if member == node:
+                                break
+
+                        components.append(component)
+
+        return components
+
+    def strongly_connected_components(self) -> list[list[State]]:
+        """Return the strongly connected components of the Kripke structure.
+
+        Each state is a member of exactly one component. The components are returned in reverse
+        topological order, meaning that no edge leads from a component to a component that appears
+        later in the list.
+
+        Returns:
+            The set of strongly connected components, each represented as a set of states
+        """
+
+        return [[self._states[index] for index in component] for component in self._components]
 
     def add_labels(self, labels: list[_LabelT]) -> Kripke[_LabelT]:
         """Add a set of labels to a every state in the Kripke structure.
@@ -159,20 +368,24 @@ class Kripke(Generic[_LabelT]):
             ValueError: If the state is not in the Kripke structure
         """
 
-        if state not in self._states:
-            raise ValueError(f"State {state} is not a member of Kripke structure")
-
-        return self._labels[state].copy()
+        try:
+            return self._labels[state].copy()
+        except KeyError:
+            raise ValueError(f"State {state} is not a member of Kripke structure") from None
 
     def join(self, other: Kripke[_LabelT]) -> Kripke[_LabelT]:
         """Combine two Kripke structures.
 
         This function combines the two Kripke structures by merging the sets of states, initial
-        states and labels of the operands. To protect against the event that two Kripke structures
-        share a state with the same id, the other Kripke structure is scanned for duplicate states
-        that are replaced. The edges of the combined Kripke structure are the union of the two sets
-        of edges from each operand, as well as a set of new edges from each state in the left Kripke
-        structure to the right Kripke structure and vice versa.
+        states and labels of the operands. The states of the other Kripke structure come first,
+        followed by the states of this Kripke structure. To protect against the event that two
+        Kripke structures share a state with the same id, the states of the other Kripke structure
+        that are also states of this Kripke structure are replaced. The edges of the combined Kripke
+        structure are the union of the two sets of edges from each operand, as well as a set of new
+        edges from each state in the left Kripke structure to the right Kripke structure and vice
+        versa.
+
+        This is equivalent to ``Kripke.join_all([other, self])``.
 
         Args:
             other: The second Kripke structure
@@ -180,72 +393,98 @@ class Kripke(Generic[_LabelT]):
         Returns:
             The combined Kripke structure
         """
-        # pylint: disable=protected-access
 
-        deduped = other._replace_duplicates(self._states)
-        new_edges = [[Edge(s1, s2), Edge(s2, s1)] for s1 in self.states for s2 in deduped.states]
+        return Kripke.join_all([other, self])
 
-        deduped._states.extend(self._states)
-        deduped._initial.update(self._initial)
-        deduped._labels.update(self._labels)
-        deduped._edges.extend(self._edges + _concat(new_edges))
+    @classmethod
+    def join_all(cls, kripkes: Sequence[Kripke[_LabelT]]) -> Kripke[_LabelT]:
+        """Combine any number of Kripke structures in a single pass.
 
-        return deduped
+        The result has the same states, in the same order, and the same edges as joining each
+        operand to the operands before it, like ``c.join(b.join(a))`` for the operands ``[a, b,
+        c]``, meaning that every state is connected in both directions to every state of every
+        other operand. Any state that also belongs to a later operand is replaced with a new state,
+        so only the last operand containing a state keeps it.
 
-    @classmethod
-    def singleton(cls, labels: Sequence[_LabelT]) -> Kripke[_LabelT]:
-        """Create a new Kripke structure with a single state.
+        Unlike a sequence of pairwise joins, the operands are only traversed once and no
+        intermediate Kripke structures are created.
 
         Args:
-            labels: The labels for the single state
+            kripkes: The Kripke structures to combine
 
         Returns:
-            A new Kripke structure with a single state
+            The combined Kripke structure
         """
+        # pylint: disable=protected-access
 
-        state = State()
-        return cls([state], {state: True}, {state: labels}, [])
+        states: list[State] = []
+        initial: dict[State, bool] = {}
+        labels: dict[State, list[_LabelT]] = {}
+        edges: list[Edge] = []
+        groups: list[list[State]] = []
+        last = {state: index for index, kripke in enumerate(kripkes) for state in kripke._states}
 
-    def _replace_duplicates(self, states: Iterable[State]) -> Kripke[_LabelT]:
-        """Create a Kripke structure by replacing matching states.
+        for position, kripke in enumerate(kripkes):
+            replacements = {state: State() for state in kripke._states if last[state] != position}
+            group = [replacements.get(state, state) for state in kripke._states]
 
-        This function returns a Kripke structure with states that match any state in the provided
-        set replaced. For any state that is replaced, it is also replaced in the edges, labels and
-        initial states. This function returns a new Kripke structure rather than modifying the
-        existing Kripke structure.
+            for index, state in enumerate(kripke._states):
+                initial[group[index]] = kripke._initial[state]
+                labels[group[index]] = kripke._labels[state]
 
-        Args:
-            states: Set of states that should be replaced
+            if replacements:
+                edges.extend(
+                    Edge(replacements.get(e.source, e.source), replacements.get(e.target, e.target))
+                    for e in kripke._edges
+                )
+            else:
+                edges.extend(kripke._edges)
 
-        Returns:
-            A Kripke structure with matching states replaced
-        """
+            for previous in groups:
+                edges.extend(
+                    edge for s1 in group for s2 in previous for edge in (Edge(s1, s2), Edge(s2, s1))
+                )
 
-        replacements: dict[State, State] = {state: state for state in self._states}
+            states.extend(group)
+            groups.append(group)
 
-        for state in self.states:
-            if state in states:
-                replacements[state] = State()
+        return cls._from_parts(states, initial, labels, edges)
 
-        states = [replacements[state] for state in self._states]
-        initial = {replacements[state]: self._initial[state] for state in self._states}
-        labels = {replacements[state]: self._labels[state] for state in self._states}
+    @classmethod
+    def _from_parts(
+        cls,
+        states: list[State],
+        initial: dict[State, bool],
+        labels: dict[State, list[_LabelT]],
+        edges: list[Edge],
+    ) -> Kripke[_LabelT]:
+        """Create a Kripke structure that takes ownership of its containers without copying them.
+
+        The containers must not be modified by the caller after the structure is created.
+        """
 
-        print(self._initial)
-        print(initial)
+        kripke: Kripke[_LabelT] = cls.__new__(cls)
+        kripke._states = states
+        kripke._initial = initial
+        kripke._labels = labels
+        kripke._edges = edges
+        kripke._reachable = {}
 
-        def _update_edge(edge: Edge) -> Edge:
-            if edge.source not in replacements and edge.target not in replacements:
-                return edge
+        return kripke
 
-            source = replacements[edge.source]
-            target = replacements[edge.target]
+    @classmethod
+    def singleton(cls, labels: Sequence[_LabelT]) -> Kripke[_LabelT]:
+        """Create a new Kripke structure with a single state.
 
-            return Edge(source, target)
+        Args:
+            labels: The labels for the single state
 
-        edges = [_update_edge(edge) for edge in self._edges]
+        Returns:
+            A new Kripke structure with a single state
+        """
 
-        return Kripke(states, initial, labels, edges)
+        state = State()
+        return cls([state], {state: True}, {state: labels}, [])
 
 
 __all__ = ["Edge", "Kripke", "State"]
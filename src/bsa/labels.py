@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Generic, Mapping, TypeVar
+
+import numpy as np
+
+from .arrays import KripkeArrays
+
+if TYPE_CHECKING:
+    from numpy.typing import ArrayLike, NDArray
+
+    from .branches import Guard
+    from .kripke import Kripke
+
+_LabelT = TypeVar("_LabelT")
+_GuardT = TypeVar("_GuardT", bound="Guard")
+
+
+@dataclass(frozen=True)
+class LabelMasks(Generic[_LabelT]):
+    """Bitmask representation of the labels of the states of a Kripke structure.
+
+    Each unique label is stored once in a table, and the labels of each state are stored as a
+    fixed-width row of packed bits where bit ``j`` is set if the state has the jth label of the
+    table. Bits are packed in little-endian order, so bit ``j`` is stored in byte ``j // 8`` of the
+    row as the bit with value ``1 << (j % 8)``.
+
+    A state is active when all of its labels are true, which means that evaluating every state only
+    requires evaluating each unique label once to create a vector of label truths. A state is then
+    active if its row has no bits set outside of the packed truth vector.
+
+    Attributes:
+        masks: The (states, bytes) array of packed label bits of each state
+        labels: Table of unique labels
+    """
+
+    masks: NDArray[np.uint8]
+    labels: tuple[_LabelT, ...]
+
+    @property
+    def n_states(self) -> int:
+        """The number of states."""
+        return len(self.masks)
+
+    def label_indices_for(self, index: int) -> NDArray[np.intp]:
+        """Return the label table indices of the labels of a state.
+
+        Args:
+            index: The index of the state
+
+        Returns:
+            The array of label table indices in increasing order
+        """
+
+        bits = np.unpackbits(self.masks[index], count=len(self.labels), bitorder="little")
+        return np.flatnonzero(bits)
+
+    def labels_for(self, index: int) -> list[_LabelT]:
+        """Return the set of labels of a state.
+
+        Args:
+            index: The index of the state
+
+        Returns:
+            The labels of the state in label table order
+        """
+
+        return [self.labels[j] for j in self.label_indices_for(index).tolist()]
+
+    def truths(self, predicate: Callable[[_LabelT], bool]) -> NDArray[np.bool_]:
+        """Evaluate a predicate once for each unique label.
+
+        Args:
+            predicate: Function that determines if a label is true
+
+        Returns:
+            The truth value of each label in the table
+        """
+
+        return np.fromiter(map(predicate, self.labels), dtype=np.bool_, count=len(self.labels))
+
+    def active(self, truths: ArrayLike) -> NDArray[np.bool_]:
+        """Determine which states are active given the truth value of each label.
+
+        Args:
+            truths: Either a one-dimensional array with the truth value of each label, or a
+                (labels, samples) array with the truth value of each label in each sample
+
+        Returns:
+            The active state mask, or a (states, samples) array of active state masks if the truth
+            values of multiple samples are provided
+
+        Raises:
+            ValueError: If the number of truth values does not match the number of labels
+        """
+
+        values = np.asarray(truths, dtype=np.bool_)
+
+        if values.ndim not in (1, 2) or values.shape[0] != len(self.labels):
+            raise ValueError(f"Expected truth values for {len(self.labels)} labels")
+
+        false = np.packbits(~values, axis=0, bitorder="little")
+
+        if values.ndim == 1:
+            unsatisfied: NDArray[np.bool_] = np.any(self.masks & false, axis=1)
+            return ~unsatisfied
+
+        unsatisfied = np.zeros((self.n_states, values.shape[1]), dtype=np.bool_)
+
+        for byte in range(self.masks.shape[1]):
+            unsatisfied |= (self.masks[:, byte, np.newaxis] & false[np.newaxis, byte]) != 0
+
+        return ~unsatisfied
+
+    def evaluate(self: LabelMasks[_GuardT], variables: Mapping[str, float]) -> NDArray[np.bool_]:
+        """Determine which states are active given a set of variable values.
+
+        This is the bitmask equivalent of :py:func:`.active_branches`.
+
+        Args:
+            variables: The set of variable values the state labels depend on
+
+        Returns:
+            The active state mask
+        """
+
+        values = dict(variables)
+        return self.active(self.truths(lambda label: label.is_true(values)))
+
+    @classmethod
+    def from_arrays(cls, arrays: KripkeArrays[_LabelT]) -> LabelMasks[_LabelT]:
+        """Create a bitmask representation from the array representation of a Kripke structure.
+
+        Args:
+            arrays: The array representation of the Kripke structure
+
+        Returns:
+            The bitmask representation of the state labels
+        """
+
+        bits = np.zeros((arrays.n_states, len(arrays.labels)), dtype=np.bool_)
+        rows = np.repeat(np.arange(arrays.n_states), np.diff(arrays.label_offsets))
+        bits[rows, arrays.label_indices] = True
+
+        return cls(np.packbits(bits, axis=1, bitorder="little"), arrays.labels)
+
+    @classmethod
+    def from_kripke(cls, kripke: Kripke[_LabelT]) -> LabelMasks[_LabelT]:
+        """Create a bitmask representation of the labels of a Kripke structure.
+
+        The order of the states is preserved, so the state with index ``i`` is the ith element of
+        ``kripke.states``.
+
+        Args:
+            kripke: The Kripke structure
+
+        Returns:
+            The bitmask representation of the state labels
+        """
+
+        return cls.from_arrays(KripkeArrays.from_kripke(kripke))
+
+
+__all__ = ["LabelMasks"]
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import math
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Mapping, Optional, TypeVar
+
+import numpy as np
+
+from .index import StateIndex
+from .labels import LabelMasks
+
+if TYPE_CHECKING:
+    from .branches import Guard
+    from .kripke import Kripke, State
+
+_GuardT = TypeVar("_GuardT", bound="Guard")
+
+_Key = tuple[Optional[float], ...]
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Counters of an active branch cache at a point in time.
+
+    Attributes:
+        hits: The number of queries answered from the cache
+        misses: The number of queries that required evaluating the state labels
+        evictions: The number of entries removed to stay within the size limit
+        size: The number of entries in the cache
+        maxsize: The maximum number of entries in the cache
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+    @property
+    def lookups(self) -> int:
+        """The number of queries."""
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of queries answered from the cache, or 0 if there were no queries."""
+        return self.hits / self.lookups if self.lookups > 0 else 0.0
+
+
+class ActiveBranchCache:
+    """Memoize the active states of a Kripke structure for repeated sets of variable values.
+
+    Each query is reduced to a key containing only the values of the variables returned by
+    :py:attr:`.StateIndex.variables`, since no other variable can change which states are active.
+    Variables that are not present in a query are part of the key as well, so a missing variable is
+    never confused with a present one. On a miss the labels are evaluated using
+    :py:meth:`.LabelMasks.evaluate`, and the result is stored in a cache that evicts the least
+    recently used entry once it holds ``maxsize`` entries.
+
+    Without quantization the key contains the exact values of the query, so the result is always
+    equal to :py:func:`.active_branches`. A quantization step can be given for each variable, in
+    which case the value is rounded to the nearest multiple of the step and the labels are evaluated
+    at the rounded value. Queries that differ by less than the step then share an entry, at the cost
+    of misclassifying values that are closer to a label bound than half of the step.
+
+    The cache can be queried from multiple threads.
+
+    Args:
+        kripke: The Kripke structure containing states representing conditional branches
+        maxsize: The maximum number of entries in the cache
+        quantization: Mapping from variable names to quantization steps. Variables the labels do not
+            depend on are ignored.
+
+    Raises:
+        ValueError: If maxsize is not positive or a quantization step is not a positive number
+    """
+
+    def __init__(
+        self,
+        kripke: Kripke[_GuardT],
+        *,
+        maxsize: int = 1024,
+        quantization: Optional[Mapping[str, float]] = None,
+    ):
+        if maxsize <= 0:
+            raise ValueError("The maximum size of the cache must be positive")
+
+        steps = dict(quantization or {})
+
+        for name, step in steps.items():
+            if not step > 0 or not math.isfinite(step):
+                raise ValueError(f"The quantization step of variable {name} must be positive")
+
+        self._states = kripke.states
+        self._masks = LabelMasks.from_kripke(kripke)
+        self._variables = sorted(StateIndex.of(kripke).variables)
+        self._steps = [steps.get(name) for name in self._variables]
+        self._maxsize = maxsize
+        self._entries: OrderedDict[_Key, tuple[int, ...]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def variables(self) -> list[str]:
+        """The names of the variables the cache keys depend on, in key order."""
+        return self._variables.copy()
+
+    @property
+    def quantized(self) -> bool:
+        """Whether any variable is quantized, in which case results may be approximate."""
+        return any(step is not None for step in self._steps)
+
+    @property
+    def stats(self) -> CacheStats:
+        """A copy of the cache counters."""
+
+        with self._lock:
+            return CacheStats(
+                self._hits, self._misses, self._evictions, len(self._entries), self._maxsize
+            )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key(self, variables: Mapping[str, float]) -> _Key:
+        """Compute the cache key of a set of variable values.
+
+        Args:
+            variables: The set of variable values the state labels depend on
+
+        Returns:
+            The quantized value of each variable in :py:attr:`variables`, or None if the variable
+            is not present
+        """
+
+        values = []
+
+        for i, name in enumerate(self._variables):
+            value = variables.get(name)
+            step = self._steps[i]
+
+            if value is not None and step is not None and math.isfinite(value):
+                value = math.floor(value / step + 0.5) * step
+
+            values.append(value)
+
+        return tuple(values)
+
+    def active_branches(self, variables: Mapping[str, float]) -> list[State]:
+        """Compute the states that are active given a set of variables.
+
+        This is equivalent to :py:func:`.active_branches` when no variable is quantized.
+
+        Args:
+            variables: The set of variable values the state labels depend on
+
+        Returns:
+            The list of active states
+        """
+
+        key = self.key(variables)
+
+        with self._lock:
+            indices = self._entries.get(key)
+
+            if indices is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+
+        if indices is None:
+            values = {
+                name: value
+                for i, name in enumerate(self._variables)
+                if (value := key[i]) is not None
+            }
+            indices = tuple(np.flatnonzero(self._masks.evaluate(values)).tolist())
+
+            with self._lock:
+                self._misses += 1
+                self._entries[key] = indices
+
+                while len(self._entries) > self._maxsize:
+                    self._entries.popitem(last=False)
+                    self._evictions += 1
+
+        return [self._states[i] for i in indices]
+
+    def clear(self) -> None:
+        """Remove every entry from the cache and reset the counters."""
+
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = 0
+
+
+__all__ = ["ActiveBranchCache", "CacheStats"]
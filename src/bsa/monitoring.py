@@ -0,0 +1,353 @@
+from __future__ import annotations
+
+import dis
+import sys
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Generic, Optional, TypeVar, Union
+
+from typing_extensions import ParamSpec
+
+from .branches import Comparison, Condition, Guard, _interval
+
+if TYPE_CHECKING:
+    from types import CodeType
+
+_P = ParamSpec("_P")
+_T = TypeVar("_T")
+_Operand = Union[str, float, None]
+
+_TOOL_NAME = "branch-statement-analyzer"
+_TOOL_IDS = (3, 4, 5, 2, 1, 0)
+_JUMPS = {"POP_JUMP_IF_TRUE": True, "POP_JUMP_IF_FALSE": False}
+_COMPARISONS = {"<=": Comparison.LTE, ">=": Comparison.GTE}
+_NAME_LOADS = {"LOAD_FAST", "LOAD_FAST_CHECK", "LOAD_FAST_BORROW", "LOAD_NAME", "LOAD_GLOBAL"}
+_NAME_LOADS |= {"LOAD_DEREF", "LOAD_FAST_LOAD_FAST", "LOAD_FAST_BORROW_LOAD_FAST_BORROW"}
+_CONST_LOADS = {"LOAD_CONST", "LOAD_SMALL_INT"}
+_TRANSPARENT = {"CACHE", "EXTENDED_ARG", "NOP", "NOT_TAKEN", "TO_BOOL"}
+_STACK_OPS = {"SWAP", "COPY"}
+
+_lock = threading.Lock()
+_tool_id: Optional[int] = None
+_monitors: dict[CodeType, tuple[BranchMonitor[..., Any], ...]] = {}
+
+
+@dataclass(frozen=True)
+class _Guard:
+    """A conditional jump instruction that evaluates a condition.
+
+    Attributes:
+        condition: The condition evaluated before the jump
+        jump_if_true: Whether the jump is taken when the condition is true
+        target: The offset of the instruction the jump leads to
+        partial: Whether the jump only evaluates the first half of an interval, in which case the
+            condition only holds when the jump leaves the interval
+    """
+
+    condition: Guard
+    jump_if_true: bool
+    target: int
+    partial: bool = False
+
+    def label(self, taken: bool) -> Optional[Guard]:
+        """Return the condition label that holds given whether the jump was taken.
+
+        The first half of an interval only decides the interval when it fails. Otherwise, the label
+        is decided by the second half, so None is returned.
+        """
+
+        if taken != self.jump_if_true:
+            return self.condition.inverse()
+
+        return None if self.partial else self.condition
+
+
+def _condition(left: _Operand, comparison: Comparison, right: _Operand) -> Optional[Condition]:
+    """Create a condition from symbolic comparison operands like Condition.from_expr."""
+
+    if isinstance(left, str) and right is not None:
+        return Condition(left, comparison, right)
+
+    if isinstance(left, float) and isinstance(right, str):
+        return Condition(right, comparison.inverse(), left)
+
+    return None
+
+
+def _guards(code: CodeType) -> dict[int, _Guard]:
+    """Find the conditional jumps of a code object that evaluate a supported comparison.
+
+    The operands of each comparison are recovered by symbolically executing the instructions that
+    load variables, attributes and numeric constants, and the ``SWAP`` and ``COPY`` instructions
+    used by chained comparisons. Any other instruction makes the operands unknown, so only
+    comparisons with the same form as those accepted by :py:meth:`.Condition.from_expr` are found.
+
+    A guard that bounds a variable from below or above and jumps when false, followed directly by
+    a guard that bounds the same variable from the other side, evaluates an interval like
+    ``10 <= x <= 20`` or ``x >= 10 and x <= 20``. If the second guard jumps when true, e.g. in
+    ``x >= 10 and x <= 20 or y <= 3``, the first guard must jump to the instruction following the
+    second guard, which is where the interval being false leads. Both guards are mapped to the same
+    :py:class:`.Interval`, so the labels match those of :py:meth:`.BranchTree.from_function`. Both
+    guards must be on the same line, since nested conditional statements compile to the same
+    instructions, so an interval whose bounds are split across lines is not recognized.
+
+    Args:
+        code: The code object to analyze
+
+    Returns:
+        Mapping from the offset of each conditional jump to the guard it evaluates
+    """
+
+    guards: dict[int, _Guard] = {}
+    stack: list[_Operand] = []
+    compared: Optional[Condition] = None
+    previous: Optional[int] = None
+    instructions = [i for i in dis.get_instructions(code) if i.opname not in _TRANSPARENT]
+
+    for position, instruction in enumerate(instructions):
+        opname = instruction.opname
+
+        if instruction.is_jump_target:
+            stack.clear()
+            previous = None
+        elif instruction.starts_line:
+            previous = None
+
+        if opname in _JUMPS and compared is not None and len(stack) > 0:
+            stack.pop()
+            guard = _Guard(compared, _JUMPS[opname], instruction.argval)
+            interval = None
+
+            if previous is not None and not guards[previous].jump_if_true:
+                first = guards[previous]
+                following = (
+                    instructions[position + 1].offset if position + 1 < len(instructions) else None
+                )
+
+                if isinstance(first.condition, Condition) and (
+                    not guard.jump_if_true or first.target == following
+                ):
+                    interval = _interval(first.condition, compared)
+
+                if interval is not None:
+                    guards[previous] = _Guard(interval, False, first.target, partial=True)
+                    guard = _Guard(interval, guard.jump_if_true, guard.target)
+
+            guards[instruction.offset] = guard
+            previous = None if interval is not None else instruction.offset
+            compared = None
+            continue
+
+        compared = None
+
+        if opname in _NAME_LOADS:
+            names = instruction.argval
+            stack.extend(names if isinstance(names, tuple) else [names])
+        elif opname in _CONST_LOADS:
+            value = instruction.argval
+            numeric = isinstance(value, (int, float)) and not isinstance(value, bool)
+            stack.append(float(value) if numeric else None)
+        elif opname == "LOAD_ATTR" and len(stack) > 0:
+            owner = stack.pop()
+            stack.append(f"{owner}.{instruction.argval}" if isinstance(owner, str) else None)
+        elif opname in _STACK_OPS and 0 < (instruction.arg or 0) <= len(stack):
+            depth = -(instruction.arg or 0)
+
+            if opname == "SWAP":
+                stack[-1], stack[depth] = stack[depth], stack[-1]
+            else:
+                stack.append(stack[depth])
+        elif opname == "COMPARE_OP" and len(stack) >= 2 and instruction.argval in _COMPARISONS:
+            right = stack.pop()
+            left = stack.pop()
+            compared = _condition(left, _COMPARISONS[instruction.argval], right)
+            stack.append(None)
+        else:
+            stack.clear()
+            previous = None
+
+    return guards
+
+
+def _check_support() -> None:
+    if not hasattr(sys, "monitoring"):
+        raise RuntimeError("Branch monitoring requires Python 3.12 or later")
+
+
+def _acquire_tool() -> int:
+    """Claim a sys.monitoring tool identifier and register the branch event callbacks."""
+
+    global _tool_id  # pylint: disable=global-statement
+
+    if _tool_id is not None:
+        return _tool_id
+
+    monitoring = sys.monitoring  # type: ignore[attr-defined,unused-ignore]
+    events: Any = monitoring.events
+
+    for tool_id in _TOOL_IDS:
+        if monitoring.get_tool(tool_id) is None:
+            monitoring.use_tool_id(tool_id, _TOOL_NAME)
+            break
+    else:
+        raise RuntimeError("No sys.monitoring tool identifier is available")
+
+    if hasattr(events, "BRANCH_LEFT"):
+        monitoring.register_callback(tool_id, events.BRANCH_LEFT, _on_branch_left)
+        monitoring.register_callback(tool_id, events.BRANCH_RIGHT, _on_branch_right)
+    else:
+        monitoring.register_callback(tool_id, events.BRANCH, _on_branch)
+
+    _tool_id = tool_id
+    return tool_id
+
+
+def _branch_events() -> int:
+    events: Any = sys.monitoring.events  # type: ignore[attr-defined,unused-ignore]
+
+    if hasattr(events, "BRANCH_LEFT"):
+        return int(events.BRANCH_LEFT | events.BRANCH_RIGHT)
+
+    return int(events.BRANCH)
+
+
+def _on_branch(code: CodeType, offset: int, destination: int) -> None:
+    for monitor in _monitors.get(code, ()):
+        monitor._record(offset, destination=destination)
+
+
+def _on_branch_left(code: CodeType, offset: int, destination: int) -> None:
+    for monitor in _monitors.get(code, ()):
+        monitor._record(offset, taken=False)
+
+
+def _on_branch_right(code: CodeType, offset: int, destination: int) -> None:
+    for monitor in _monitors.get(code, ()):
+        monitor._record(offset, taken=True)
+
+
+class BranchMonitor(Generic[_P, _T]):
+    """Capture the branches taken by a function without rewriting its source or AST.
+
+    This is an alternative to :py:func:`.instrument_function` for Python 3.12 and later, which uses
+    the ``sys.monitoring`` branch events of the original code object of the function. Because the
+    function source is never read, functions defined in notebooks, ``exec`` strings or frozen
+    applications can be monitored as well.
+
+    The conditional jumps of the code object are mapped back to the same :py:class:`.Guard`
+    values produced by :py:meth:`.BranchTree.from_function`, so the captured labels can be compared
+    directly against the labels of the states of a :py:class:`.Kripke` structure. Branch events are
+    only enabled for the code object while a monitored call is running, so calling the original
+    function has no overhead.
+
+    Calling the monitor returns a tuple containing the labels of the guards evaluated during the
+    call, in evaluation order, and the return value of the function. Each label is either the guard
+    condition or its inverse depending on the branch taken.
+
+    Branch events are enabled once for each code object, no matter how many monitors of the
+    function have a call running, and disabled when the last of these calls returns. Every event is
+    dispatched to each of these monitors, which records it in the labels of the call running in the
+    thread that produced the event. A function can therefore be monitored from several threads at
+    once, by one or by several monitors. Since the events do not identify the frame they belong to,
+    a call of the function made while a monitored call is running in the same thread, e.g. a
+    recursive call or a call by another monitor, is recorded by the running call as well.
+
+    A negated comparison like ``not x <= 3`` compiles to the same jump as the comparison itself,
+    with the branches swapped, so it is recorded as the comparison and its inverse. The recorded
+    label is the one that holds, but :py:meth:`.BranchTree.from_function` does not support negated
+    comparisons and skips these statements, so their labels do not belong to any Kripke structure.
+
+    Args:
+        func: The function to monitor
+
+    Raises:
+        RuntimeError: If the Python version does not support sys.monitoring
+    """
+
+    _func: Callable[_P, _T]
+    _code: CodeType
+    _guards: dict[int, _Guard]
+    _local: threading.local
+    _calls: int
+
+    def __init__(self, func: Callable[_P, _T]):
+        _check_support()
+
+        self._func = func
+        self._code = func.__code__  # type: ignore[attr-defined,unused-ignore]
+        self._guards = _guards(self._code)
+        self._local = threading.local()
+        self._calls = 0
+
+    @property
+    def conditions(self) -> list[Guard]:
+        """The set of guard conditions found in the function, in bytecode order."""
+
+        conditions: list[Guard] = []
+
+        for guard in self._guards.values():
+            if guard.condition not in conditions:
+                conditions.append(guard.condition)
+
+        return conditions
+
+    def __call__(self, *args: _P.args, **kwargs: _P.kwargs) -> tuple[list[Guard], _T]:
+        labels: list[Guard] = []
+        self._enable()
+        previous = getattr(self._local, "labels", None)
+        self._local.labels = labels
+
+        try:
+            result = self._func(*args, **kwargs)
+        finally:
+            self._disable()
+            self._local.labels = previous
+
+        return labels, result
+
+    def _enable(self) -> None:
+        with _lock:
+            if self._calls == 0:
+                monitors = _monitors.get(self._code, ())
+
+                if len(monitors) == 0:
+                    monitoring = sys.monitoring  # type: ignore[attr-defined,unused-ignore]
+                    monitoring.set_local_events(_acquire_tool(), self._code, _branch_events())
+
+                _monitors[self._code] = (*monitors, self)
+
+            self._calls += 1
+
+    def _disable(self) -> None:
+        with _lock:
+            self._calls -= 1
+
+            if self._calls == 0:
+                monitors = tuple(m for m in _monitors[self._code] if m is not self)
+
+                if len(monitors) > 0:
+                    _monitors[self._code] = monitors
+                else:
+                    monitoring = sys.monitoring  # type: ignore[attr-defined,unused-ignore]
+                    monitoring.set_local_events(_acquire_tool(), self._code, 0)
+                    del _monitors[self._code]
+
+    def _record(
+        self, offset: int, *, taken: Optional[bool] = None, destination: Optional[int] = None
+    ) -> None:
+        labels: Optional[list[Guard]] = getattr(self._local, "labels", None)
+        guard = self._guards.get(offset)
+
+        if labels is None or guard is None:
+            return
+
+        if taken is None:
+            taken = destination == guard.target
+
+        label = guard.label(taken)
+
+        if label is not None:
+            labels.append(label)
+
+
+__all__ = ["BranchMonitor"]
@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import itertools
+import math
+from typing import TYPE_CHECKING, Generic, Iterator, Mapping, Sequence, TypeVar
+
+import numpy as np
+
+from .labels import LabelMasks
+
+if TYPE_CHECKING:
+    from .branches import BranchTree, Guard
+    from .kripke import Kripke, State
+
+_GuardT = TypeVar("_GuardT", bound="Guard")
+
+_GlobalState = tuple["State", ...]
+
+
+class ProductKripke(Generic[_GuardT]):
+    """Factored representation of the product of independent Kripke structures.
+
+    The independent conditional statements of a function are each represented by a separate Kripke
+    structure, and a state of the whole function is a combination of one state from each of these
+    component structures. Since the number of combinations grows exponentially with the number of
+    components, the product is never materialized. Instead, queries like membership, labeling and
+    the set of active states are answered for each component separately and combined on demand.
+
+    A global state is represented as a tuple containing one state of each component, in the same
+    order as the components. Global states are numbered in mixed radix with the last component
+    varying fastest, which is the same order produced by :py:func:`itertools.product`.
+
+    Args:
+        components: The independent Kripke structures
+
+    Raises:
+        ValueError: If no components are provided
+    """
+
+    def __init__(self, components: Sequence[Kripke[_GuardT]]):
+        if len(components) == 0:
+            raise ValueError("At least one component is required")
+
+        self._components = list(components)
+        self._states = [kripke.states for kripke in self._components]
+        self._indices = [{state: i for i, state in enumerate(states)} for states in self._states]
+        self._masks = [LabelMasks.from_kripke(kripke) for kripke in self._components]
+
+    @staticmethod
+    def from_trees(trees: Sequence[BranchTree]) -> ProductKripke[Guard]:
+        """Create a product from the independent branch trees of a function.
+
+        Every Kripke structure created by :py:meth:`.BranchTree.as_kripke` is used as a component.
+
+        Args:
+            trees: The branch trees, e.g. the output of :py:meth:`.BranchTree.from_function`
+
+        Returns:
+            The factored product of the Kripke structures of the trees
+        """
+
+        return ProductKripke([kripke for tree in trees for kripke in tree.as_kripke()])
+
+    @property
+    def components(self) -> list[Kripke[_GuardT]]:
+        """The component Kripke structures."""
+        return self._components.copy()
+
+    @property
+    def n_states(self) -> int:
+        """The number of global states, which is the product of the number of component states."""
+        return math.prod(len(states) for states in self._states)
+
+    @property
+    def n_initial(self) -> int:
+        """The number of global states where every component state is initial."""
+        return math.prod(len(kripke.initial_states) for kripke in self._components)
+
+    def __contains__(self, state: object) -> bool:
+        if not isinstance(state, tuple) or len(state) != len(self._components):
+            return False
+
+        return all(member in self._indices[i] for i, member in enumerate(state))
+
+    def _check(self, state: _GlobalState) -> None:
+        if state not in self:
+            raise ValueError(f"State {state} is not a member of the product")
+
+    def states(self) -> Iterator[_GlobalState]:
+        """Iterate over the global states in index order.
+
+        The global states are generated lazily, so only the state currently being visited exists in
+        memory.
+
+        Returns:
+            An iterator over every global state
+        """
+
+        return itertools.product(*self._states)
+
+    def initial_states(self) -> Iterator[_GlobalState]:
+        """Iterate over the global states where every component state is initial.
+
+        Returns:
+            An iterator over the initial global states
+        """
+
+        return itertools.product(*(kripke.initial_states for kripke in self._components))
+
+    def state_at(self, index: int) -> _GlobalState:
+        """Return the global state with a given index.
+
+        Args:
+            index: The index of the global state
+
+        Returns:
+            The global state
+
+        Raises:
+            IndexError: If the index is out of range
+        """
+
+        if not 0 <= index < self.n_states:
+            raise IndexError(f"State index {index} is out of range")
+
+        members = []
+
+        for states in reversed(self._states):
+            index, position = divmod(index, len(states))
+            members.append(states[position])
+
+        return tuple(reversed(members))
+
+    def index_of(self, state: _GlobalState) -> int:
+        """Return the index of a global state.
+
+        Args:
+            state: The global state
+
+        Returns:
+            The index of the global state
+
+        Raises:
+            ValueError: If the state is not a member of the product
+        """
+
+        self._check(state)
+        index = 0
+
+        for i, member in enumerate(state):
+            index = index * len(self._states[i]) + self._indices[i][member]
+
+        return index
+
+    def labels_for(self, state: _GlobalState) -> list[_GuardT]:
+        """Return the set of labels of a global state.
+
+        Args:
+            state: The global state
+
+        Returns:
+            The labels of every component state, in component order
+
+        Raises:
+            ValueError: If the state is not a member of the product
+        """
+
+        self._check(state)
+        return [
+            label
+            for i, member in enumerate(state)
+            for label in self._components[i].labels_for(member)
+        ]
+
+    def active_components(self, variables: Mapping[str, float]) -> list[list[State]]:
+        """Compute the active states of each component given a set of variables.
+
+        Args:
+            variables: The set of variable values the state labels depend on
+
+        Returns:
+            The active states of each component, in component order
+        """
+
+        return [
+            [self._states[i][j] for j in np.flatnonzero(masks.evaluate(variables)).tolist()]
+            for i, masks in enumerate(self._masks)
+        ]
+
+    def active_counts(self, variables: Mapping[str, float]) -> list[int]:
+        """Count the active states of each component given a set of variables.
+
+        Args:
+            variables: The set of variable values the state labels depend on
+
+        Returns:
+            The number of active states of each component, in component order
+        """
+
+        return [int(np.count_nonzero(masks.evaluate(variables))) for masks in self._masks]
+
+    def n_active(self, variables: Mapping[str, float]) -> int:
+        """Count the active global states given a set of variables.
+
+        A global state is active when every one of its component states is active, so the count is
+        the product of the number of active states of each component.
+
+        Args:
+            variables: The set of variable values the state labels depend on
+
+        Returns:
+            The number of active global states
+        """
+
+        return math.prod(self.active_counts(variables))
+
+    def active_states(self, variables: Mapping[str, float]) -> Iterator[_GlobalState]:
+        """Iterate over the active global states given a set of variables.
+
+        Args:
+            variables: The set of variable values the state labels depend on
+
+        Returns:
+            An iterator over the active global states in index order
+        """
+
+        return itertools.product(*self.active_components(variables))
+
+    def is_active(self, state: _GlobalState, variables: Mapping[str, float]) -> bool:
+        """Check if a global state is active given a set of variables.
+
+        Args:
+            state: The global state
+            variables: The set of variable values the state labels depend on
+
+        Returns:
+            True if every component state is active, False otherwise
+
+        Raises:
+            ValueError: If the state is not a member of the product
+        """
+
+        values = dict(variables)
+        return all(label.is_true(values) for label in self.labels_for(state))
+
+
+__all__ = ["ProductKripke"]
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Mapping, TypeVar, Union
+
+import numpy as np
+
+from .arrays import KripkeArrays
+from .branches import Comparison, Condition, Guard, Interval
+
+if TYPE_CHECKING:
+    from numpy.typing import ArrayLike, NDArray
+
+    from .kripke import Kripke
+
+_GuardT = TypeVar("_GuardT", bound="Guard")
+
+_Samples = Mapping[str, "ArrayLike"]
+
+
+def _sample_count(samples: _Samples) -> int:
+    """Determine the number of samples in a batch of sample arrays.
+
+    Raises:
+        ValueError: If the sample arrays are not one-dimensional arrays of the same length
+    """
+
+    shapes = {np.shape(values) for values in samples.values()}
+
+    if len(shapes) == 0:
+        raise ValueError("At least one variable must be provided")
+
+    if len(shapes) > 1 or len(next(iter(shapes))) != 1:
+        raise ValueError("Sample arrays must be one-dimensional arrays of the same length")
+
+    return int(next(iter(shapes))[0])
+
+
+def condition_distance(condition: Guard, samples: _Samples) -> NDArray[np.float64]:
+    """Compute the signed distance of a batch of samples from the boundary of a condition.
+
+    The distance is positive when the sample is on the side of the boundary that satisfies the
+    condition and negative otherwise. A sample satisfies a nonstrict condition when its distance is
+    greater than or equal to zero, and a strict condition when its distance is greater than zero. If
+    a variable of the condition is not present in the samples, the condition is considered false
+    and the distance is negative infinity.
+
+    The distance of an :py:class:`.Interval` is the distance from the nearest of its bounds, which
+    is positive inside of the interval and negative outside of it, and negated if the interval holds
+    outside of its bounds.
+
+    Args:
+        condition: The condition to compute the distance from
+        samples: Mapping from variable names to one-dimensional arrays of sample values
+
+    Returns:
+        The array of distances for each sample
+    """
+
+    n_samples = _sample_count(samples)
+
+    if isinstance(condition, Interval):
+        if condition.variable not in samples:
+            return np.full(n_samples, -np.inf)
+
+        values = np.asarray(samples[condition.variable], dtype=np.float64)
+        distances = np.minimum(values - condition.lower, condition.upper - values)
+        return distances if condition.inside else -distances
+
+    if not isinstance(condition, Condition):
+        raise TypeError(f"Unsupported guard type {type(condition)}")
+
+    try:
+        left = np.asarray(samples[condition.variable], dtype=np.float64)
+        right = (
+            np.asarray(samples[condition.bound], dtype=np.float64)
+            if isinstance(condition.bound, str)
+            else condition.bound
+        )
+    except KeyError:
+        return np.full(n_samples, -np.inf)
+
+    if condition.comparison is Comparison.LTE:
+        return np.subtract(right, left)
+
+    if condition.comparison is Comparison.GTE:
+        return np.subtract(left, right)
+
+    raise TypeError(f"Unknown comparison {type(condition.comparison)}")
+
+
+def condition_mask(condition: Guard, samples: _Samples) -> NDArray[np.bool_]:
+    """Evaluate a condition for a batch of samples.
+
+    This is the array equivalent of :py:meth:`.Condition.is_true`, so the condition is false for
+    every sample if any of its variables is not present in the samples.
+
+    Args:
+        condition: The condition to evaluate
+        samples: Mapping from variable names to one-dimensional arrays of sample values
+
+    Returns:
+        The array of truth values for each sample
+    """
+
+    if isinstance(condition, Interval):
+        if condition.variable not in samples:
+            return np.zeros(_sample_count(samples), dtype=np.bool_)
+
+        values = np.asarray(samples[condition.variable], dtype=np.float64)
+        above = values > condition.lower if condition.lower_strict else values >= condition.lower
+        below = values < condition.upper if condition.upper_strict else values <= condition.upper
+        inside: NDArray[np.bool_] = above & below
+        return inside if condition.inside else ~inside
+
+    if not isinstance(condition, Condition):
+        raise TypeError(f"Unsupported guard type {type(condition)}")
+
+    distances = condition_distance(condition, samples)
+
+    if condition.strict:
+        return distances > 0
+
+    return distances >= 0
+
+
+def branch_distances(
+    kripke: Union[Kripke[_GuardT], KripkeArrays[_GuardT]], samples: _Samples
+) -> NDArray[np.float64]:
+    """Compute the signed distance of a batch of samples from activating each state.
+
+    The distance of a state is the minimum of the distances of its labels, since a state is only
+    active when all of its labels are true. Each unique label is evaluated once for the entire batch
+    using array operations, and the labels of every state are reduced together. A state with no
+    labels is always active and has a distance of positive infinity.
+
+    Taking the maximum along the state axis of the result gives the distance of each sample from
+    activating any state.
+
+    Args:
+        kripke: The Kripke structure, or its array representation, with condition labels
+        samples: Mapping from variable names to one-dimensional arrays of sample values
+
+    Returns:
+        A (states, samples) array of distances in the same order as the states of the structure
+    """
+
+    arrays = kripke if isinstance(kripke, KripkeArrays) else KripkeArrays.from_kripke(kripke)
+    n_samples = _sample_count(samples)
+    distances = np.full((arrays.n_states, n_samples), np.inf)
+
+    if len(arrays.label_indices) == 0:
+        return distances
+
+    label_distances = np.empty((len(arrays.labels), n_samples))
+
+    for index, label in enumerate(arrays.labels):
+        label_distances[index] = condition_distance(label, samples)
+
+    starts = arrays.label_offsets[:-1]
+    labeled = starts != arrays.label_offsets[1:]
+    distances[labeled] = np.minimum.reduceat(
+        label_distances[arrays.label_indices], starts[labeled], axis=0
+    )
+
+    return distances
+
+
+__all__ = ["branch_distances", "condition_distance", "condition_mask"]
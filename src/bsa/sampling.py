@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Mapping, Optional, TypeVar, Union
+
+import numpy as np
+
+from .arrays import KripkeArrays
+from .branches import Comparison, Condition, Guard, Interval
+from .coverage import CoverageAccumulator, CoverageSnapshot
+from .robustness import condition_mask
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+    from .kripke import Kripke, State
+
+
+_GuardT = TypeVar("_GuardT", bound="Guard")
+
+
+@dataclass(frozen=True)
+class SampleBatch:
+    """A batch of inputs generated by a coverage sampler.
+
+    Attributes:
+        samples: Mapping from variable names to arrays of sample values
+        targets: The index of the state each sample was drawn from, or -1 if no sample satisfying
+            the labels of the target state could be found
+    """
+
+    samples: dict[str, NDArray[np.float64]]
+    targets: NDArray[np.int64]
+
+
+class CoverageSampler:
+    """Generate inputs aimed at the states of a Kripke structure that are not yet covered.
+
+    The feasible region of each state is derived from its condition labels and the user-supplied
+    bounds of each variable. Conditions that compare a variable against a constant shrink the
+    bounding box of the variable, while conditions that compare two variables are enforced by
+    rejecting samples that do not satisfy them. An :py:class:`.Interval` shrinks the bounding box
+    from both sides, while an interval that holds outside of its bounds is enforced by rejection
+    like a comparison of two variables. A state is provably unreachable if its bounding box is
+    empty, or if one of its rejected conditions cannot be satisfied by any point in the box.
+
+    Samples are allocated to the reachable states with a probability inversely proportional to the
+    number of times each state has been covered, so states that have never been covered receive the
+    largest share of each batch.
+
+    Args:
+        kripke: The Kripke structure containing states representing conditional branches
+        bounds: Mapping from each variable name to its (lower, upper) bounds
+        seed: The seed of the random number generator
+        max_attempts: The number of times a rejected sample is redrawn before giving up
+
+    Raises:
+        ValueError: If a label depends on a variable without bounds or a set of bounds is empty
+    """
+
+    def __init__(
+        self,
+        kripke: Kripke[_GuardT],
+        bounds: Mapping[str, tuple[float, float]],
+        *,
+        seed: Optional[int] = None,
+        max_attempts: int = 100,
+    ):
+        arrays = KripkeArrays.from_kripke(kripke)
+        self._states = kripke.states
+        self._variables = list(bounds)
+        self._rng = np.random.default_rng(seed)
+        self._max_attempts = max_attempts
+
+        columns = {name: index for index, name in enumerate(self._variables)}
+        lower = np.array([float(bounds[name][0]) for name in self._variables])
+        upper = np.array([float(bounds[name][1]) for name in self._variables])
+
+        if np.any(lower > upper):
+            raise ValueError("The lower bound of each variable must not exceed its upper bound")
+
+        for guard in arrays.labels:
+            for variable in guard.variables:
+                if variable not in columns:
+                    raise ValueError(f"No bounds provided for variable {variable}")
+
+        self._lower = np.tile(lower, (arrays.n_states, 1))
+        self._upper = np.tile(upper, (arrays.n_states, 1))
+        self._labels: list[list[Guard]] = [
+            [arrays.labels[j] for j in arrays.label_indices_for(i).tolist()]
+            for i in range(arrays.n_states)
+        ]
+
+        reachable = np.ones(arrays.n_states, dtype=np.bool_)
+
+        for state, labels in enumerate(self._labels):
+            lower_strict = np.zeros(len(self._variables), dtype=np.bool_)
+            upper_strict = np.zeros(len(self._variables), dtype=np.bool_)
+
+            for label in labels:
+                limits: list[tuple[Comparison, float, bool]]
+
+                if isinstance(label, Interval) and label.inside:
+                    limits = [
+                        (Comparison.GTE, label.lower, label.lower_strict),
+                        (Comparison.LTE, label.upper, label.upper_strict),
+                    ]
+                elif isinstance(label, Condition) and not isinstance(label.bound, str):
+                    limits = [(label.comparison, float(label.bound), label.strict)]
+                else:
+                    continue
+
+                column = columns[label.variable]
+
+                for comparison, bound, strict in limits:
+                    _tighten(
+                        self._lower[state],
+                        self._upper[state],
+                        lower_strict,
+                        upper_strict,
+                        column,
+                        comparison,
+                        bound,
+                        strict,
+                    )
+
+            low = self._lower[state]
+            high = self._upper[state]
+            empty = (low > high) | ((low == high) & (lower_strict | upper_strict))
+            reachable[state] = not np.any(empty) and all(
+                _satisfiable(label, low, high, columns)
+                for label in labels
+                if not isinstance(label, Condition) or isinstance(label.bound, str)
+            )
+
+        self._reachable = np.flatnonzero(reachable)
+
+    @property
+    def variables(self) -> list[str]:
+        """The names of the sampled variables."""
+        return self._variables.copy()
+
+    @property
+    def unreachable(self) -> list[State]:
+        """The states that cannot be active for any input within the variable bounds."""
+
+        reachable = set(self._reachable.tolist())
+        return [state for index, state in enumerate(self._states) if index not in reachable]
+
+    def region(self, state: State) -> dict[str, tuple[float, float]]:
+        """Return the bounding box of the feasible region of a state.
+
+        Args:
+            state: The state to get the region of
+
+        Returns:
+            Mapping from each variable name to its (lower, upper) bounds within the state
+
+        Raises:
+            ValueError: If the state is not a member of the Kripke structure
+        """
+
+        try:
+            index = self._states.index(state)
+        except ValueError:
+            raise ValueError(f"State {state} is not a member of Kripke structure") from None
+
+        return {
+            name: (float(self._lower[index, i]), float(self._upper[index, i]))
+            for i, name in enumerate(self._variables)
+        }
+
+    def sample(
+        self,
+        n_samples: int,
+        coverage: Union[CoverageAccumulator, CoverageSnapshot, None] = None,
+    ) -> SampleBatch:
+        """Generate a batch of inputs aimed at under-covered states.
+
+        Args:
+            n_samples: The number of inputs to generate
+            coverage: The coverage achieved so far, used to weight the states. If no coverage is
+                provided, every reachable state is equally likely to be targeted.
+
+        Returns:
+            The batch of inputs and the state targeted by each input
+
+        Raises:
+            ValueError: If no state is reachable within the variable bounds
+        """
+
+        if len(self._reachable) == 0:
+            raise ValueError("No state is reachable within the variable bounds")
+
+        if isinstance(coverage, CoverageAccumulator):
+            coverage = coverage.snapshot()
+
+        weights: NDArray[np.float64] = np.ones(len(self._reachable))
+
+        if coverage is not None:
+            weights = weights / (1.0 + coverage.hits[self._reachable])
+
+        targets = self._rng.choice(self._reachable, size=n_samples, p=weights / weights.sum())
+        values = np.empty((n_samples, len(self._variables)))
+
+        for state in np.unique(targets).tolist():
+            rows = np.flatnonzero(targets == state)
+
+            for _ in range(self._max_attempts):
+                values[rows] = self._rng.uniform(
+                    self._lower[state], self._upper[state], size=(len(rows), len(self._variables))
+                )
+                columns = {name: values[rows, i] for i, name in enumerate(self._variables)}
+                satisfied = np.ones(len(rows), dtype=np.bool_)
+
+                for label in self._labels[state]:
+                    satisfied &= condition_mask(label, columns)
+
+                rows = rows[~satisfied]
+
+                if len(rows) == 0:
+                    break
+
+            targets[rows] = -1
+
+        samples = {name: values[:, i] for i, name in enumerate(self._variables)}
+        return SampleBatch(samples, targets.astype(np.int64))
+
+
+def _tighten(
+    lower: NDArray[np.float64],
+    upper: NDArray[np.float64],
+    lower_strict: NDArray[np.bool_],
+    upper_strict: NDArray[np.bool_],
+    column: int,
+    comparison: Comparison,
+    bound: float,
+    strict: bool,
+) -> None:
+    """Shrink a box in place so that it satisfies a comparison of a variable against a constant."""
+
+    if comparison is Comparison.LTE:
+        if bound < upper[column]:
+            upper[column] = bound
+            upper_strict[column] = strict
+        elif bound == upper[column]:
+            upper_strict[column] |= strict
+    elif bound > lower[column]:
+        lower[column] = bound
+        lower_strict[column] = strict
+    elif bound == lower[column]:
+        lower_strict[column] |= strict
+
+
+def _satisfiable(
+    condition: Guard,
+    lower: NDArray[np.float64],
+    upper: NDArray[np.float64],
+    columns: Mapping[str, int],
+) -> bool:
+    """Check if a condition that does not shrink the box can be satisfied by any point in it.
+
+    These are comparisons between two variables, and intervals that hold outside of their bounds,
+    which can only be satisfied if the box does not lie entirely within the interval.
+    """
+
+    if isinstance(condition, Interval):
+        column = columns[condition.variable]
+        low, high = lower[column], upper[column]
+
+        if condition.inside:
+            return True
+
+        return bool(
+            low < condition.lower
+            or (low == condition.lower and condition.lower_strict)
+            or high > condition.upper
+            or (high == condition.upper and condition.upper_strict)
+        )
+
+    if not isinstance(condition, Condition):
+        raise TypeError(f"Unsupported guard type {type(condition)}")
+
+    left = columns[condition.variable]
+    right = columns[str(condition.bound)]
+
+    if condition.comparison is Comparison.LTE:
+        low, high = lower[left], upper[right]
+    else:
+        low, high = lower[right], upper[left]
+
+    return bool(low < high or (low == high and not condition.strict))
+
+
+__all__ = ["CoverageSampler", "SampleBatch"]
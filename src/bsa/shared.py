@@ -0,0 +1,412 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import struct
+import sys
+import uuid
+import weakref
+from functools import cached_property
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import TYPE_CHECKING, Any, Callable, Mapping, Optional, TypeVar, cast
+
+import numpy as np
+
+from .arrays import KripkeArrays, _decode_conditions, _encode_conditions
+from .kripke import Edge, State
+from .labels import LabelMasks
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+    from numpy.typing import NDArray
+
+    from .branches import Guard
+    from .kripke import Kripke
+
+_GuardT = TypeVar("_GuardT", bound="Guard")
+
+_HEADER = struct.Struct("<Q")
+_ALIGNMENT = 64
+
+
+class _SharedMemory(SharedMemory):
+    """Shared memory block that can be garbage collected before the array views of its contents.
+
+    The order in which objects are destroyed is not defined when the interpreter exits, so the
+    block may be collected while views of it still exist. The memory map stays valid until the
+    last view is released, so the failure to close it is ignored instead of being reported.
+    """
+
+    def __del__(self) -> None:
+        with contextlib.suppress(BufferError):
+            super().__del__()
+
+
+def _open(name: Optional[str], size: int = 0) -> SharedMemory:
+    """Open a shared memory block without registering it with the resource tracker.
+
+    The resource tracker unlinks every block registered by a process when the process exits, which
+    would destroy a published structure as soon as any worker that attached to it exits. Ownership
+    is therefore managed explicitly by :py:class:`SharedKripke`.
+    """
+
+    if sys.version_info >= (3, 13):
+        return _SharedMemory(name, create=name is None, size=size, track=False)
+
+    memory = _SharedMemory(name, create=name is None, size=size)
+
+    if os.name == "posix":
+        resource_tracker.unregister(f"/{memory.name}", "shared_memory")
+
+    return memory
+
+
+def _unlink(memory: SharedMemory) -> None:
+    """Destroy a shared memory block opened using :py:func:`_open`."""
+
+    if sys.version_info < (3, 13) and os.name == "posix":
+        # SharedMemory.unlink unregisters the block, so the registration removed by _open is
+        # restored first to keep the resource tracker balanced
+        resource_tracker.register(f"/{memory.name}", "shared_memory")
+
+    memory.unlink()
+
+
+def _release(memory: SharedMemory, owner: bool, bases: list[weakref.ref[memoryview]]) -> None:
+    """Close a shared memory block, and destroy it if it is owned by the current process.
+
+    The block is only closed if no array views of it exist. Otherwise, it is closed by the
+    shared memory object itself once it is garbage collected after the views.
+    """
+
+    try:
+        if all(base() is None for base in bases):
+            memory.close()
+    finally:
+        if owner:
+            _unlink(memory)
+
+
+class SharedKripke:
+    """Read-only view of a Kripke structure stored in shared memory.
+
+    A structure is published once using :py:meth:`publish`, which copies the array representation
+    of the structure, the label table and the packed label bits of every state into a single shared
+    memory block. Other processes attach to the block by name using :py:meth:`attach`, and read the
+    arrays in place instead of holding a separate copy of the structure. Instances can be pickled,
+    which attaches the receiving process to the same block, so they can be passed directly to the
+    workers of a :py:class:`multiprocessing.pool.Pool`.
+
+    Only the publishing instance owns the block. Closing the owner, or leaving its context, destroys
+    the block after which no new process can attach to it. Processes that are already attached keep
+    their mapping until they close their own view. The owner also destroys the block when it is
+    garbage collected or the interpreter exits, but not if the process is killed.
+
+    The states of the view compare equal to the states of the published structure. Like
+    :py:class:`.KripkeArrays`, publishing requires all of the labels to be :py:class:`.Condition`
+    or :py:class:`.Interval` values.
+
+    Args:
+        memory: The shared memory block containing the structure
+        owner: Whether the block should be destroyed when the view is closed
+    """
+
+    def __init__(self, memory: SharedMemory, *, owner: bool = False):
+        # The views are created first so that they are released before the block is closed when the
+        # instance is garbage collected
+        try:
+            base, self._arrays, self._masks = _map(memory)
+        except BaseException:
+            _release(memory, owner, [])
+            raise
+
+        self._bases = [weakref.ref(base)]
+        self._memory = memory
+        self._owner = owner
+        self._finalizer = weakref.finalize(self, _release, memory, owner, self._bases)
+
+    @classmethod
+    def publish(cls, kripke: Kripke[_GuardT]) -> SharedKripke:
+        """Copy a Kripke structure into a new shared memory block.
+
+        Args:
+            kripke: The Kripke structure to publish
+
+        Returns:
+            The owning view of the published structure
+
+        Raises:
+            TypeError: If any label is not a Condition or Interval
+        """
+
+        arrays = KripkeArrays.from_kripke(kripke)
+        columns: dict[str, NDArray[Any]] = {
+            "state_ids": arrays.state_ids,
+            "initial": arrays.initial,
+            "edge_offsets": arrays.edge_offsets,
+            "edge_targets": arrays.edge_targets,
+            "label_offsets": arrays.label_offsets,
+            "label_indices": arrays.label_indices,
+            "masks": LabelMasks.from_arrays(arrays).masks,
+            **_encode_conditions(arrays.labels),
+        }
+
+        layout: dict[str, tuple[str, list[int], int]] = {}
+        size = 0
+
+        for name, column in columns.items():
+            layout[name] = (column.dtype.str, list(column.shape), size)
+            size += _align(column.nbytes)
+
+        header = json.dumps(layout).encode()
+        start = _align(_HEADER.size + len(header))
+        memory = _open(None, start + size)
+
+        try:
+            buffer = _buffer(memory)
+            _HEADER.pack_into(buffer, 0, len(header))
+            buffer[_HEADER.size : _HEADER.size + len(header)] = header
+
+            for name, column in columns.items():
+                offset = start + layout[name][2]
+                target = np.frombuffer(buffer, dtype=column.dtype, count=column.size, offset=offset)
+                target[...] = column.reshape(-1)
+                del target
+        except BaseException:
+            _release(memory, True, [])
+            raise
+
+        return cls(memory, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> SharedKripke:
+        """Attach to a structure published by another view.
+
+        Args:
+            name: The name of the shared memory block, available as :py:attr:`name`
+
+        Returns:
+            A read-only view of the structure that does not own the block
+
+        Raises:
+            FileNotFoundError: If no block with the given name exists
+        """
+
+        return cls(_open(name))
+
+    def __reduce__(self) -> tuple[Callable[[str], SharedKripke], tuple[str]]:
+        return SharedKripke.attach, (self.name,)
+
+    def __enter__(self) -> SharedKripke:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    @property
+    def name(self) -> str:
+        """The name of the shared memory block."""
+        return self._memory.name
+
+    @property
+    def owner(self) -> bool:
+        """Whether the view destroys the shared memory block when it is closed."""
+        return self._owner
+
+    @property
+    def closed(self) -> bool:
+        """Whether the view has been closed."""
+        return not self._finalizer.alive
+
+    def close(self) -> None:
+        """Release the view, and destroy the shared memory block if the view is the owner.
+
+        Any array returned by the view, including those of :py:attr:`arrays`, must no longer be
+        referenced when the view is closed.
+
+        Raises:
+            BufferError: If an array that refers to the shared memory is still referenced
+        """
+
+        if self.closed:
+            return
+
+        del self._arrays, self._masks
+
+        if any(base() is not None for base in self._bases):
+            base, self._arrays, self._masks = _map(self._memory)
+            self._bases.append(weakref.ref(base))
+            raise BufferError("An array that refers to the shared memory is still referenced")
+
+        self._finalizer()
+
+    def _check(self) -> None:
+        if self.closed:
+            raise ValueError("The shared Kripke structure has been closed")
+
+    @property
+    def arrays(self) -> KripkeArrays[Guard]:
+        """The array representation of the structure, as read-only views of the shared memory."""
+        self._check()
+        return self._arrays
+
+    @property
+    def n_states(self) -> int:
+        """The number of states."""
+        return self.arrays.n_states
+
+    @cached_property
+    def _states(self) -> list[State]:
+        ids = self.arrays.state_ids
+        return [State._with_id(uuid.UUID(bytes=row.tobytes())) for row in ids]
+
+    @cached_property
+    def _indices(self) -> dict[State, int]:
+        return {state: i for i, state in enumerate(self._states)}
+
+    @property
+    def states(self) -> list[State]:
+        """The set of states."""
+        self._check()
+        return self._states.copy()
+
+    @property
+    def initial_states(self) -> list[State]:
+        """The set of initial states."""
+        self._check()
+        return [self._states[i] for i in np.flatnonzero(self._arrays.initial).tolist()]
+
+    @property
+    def edges(self) -> list[Edge]:
+        """The set of edges, grouped by source state."""
+
+        arrays = self.arrays
+        sources = np.repeat(np.arange(arrays.n_states), np.diff(arrays.edge_offsets)).tolist()
+        targets = arrays.edge_targets.tolist()
+
+        return [Edge(self._states[s], self._states[targets[i]]) for i, s in enumerate(sources)]
+
+    def labels_for(self, state: State) -> list[Guard]:
+        """Return the set of labels of a state.
+
+        Args:
+            state: The state
+
+        Returns:
+            The labels of the state
+
+        Raises:
+            ValueError: If the state is not a member of the structure
+        """
+
+        self._check()
+
+        try:
+            index = self._indices[state]
+        except KeyError:
+            raise ValueError(f"State {state} is not a member of the Kripke structure") from None
+
+        labels = self._arrays.labels
+        return [labels[j] for j in self._arrays.label_indices_for(index).tolist()]
+
+    def active_mask(self, variables: Mapping[str, float]) -> NDArray[np.bool_]:
+        """Determine which states are active given a set of variables.
+
+        The labels are evaluated using the packed label bits stored in the shared memory, as
+        described in :py:class:`.LabelMasks`.
+
+        Args:
+            variables: The set of variable values the state labels depend on
+
+        Returns:
+            The active state mask in state order
+        """
+
+        self._check()
+        return self._masks.evaluate(variables)
+
+    def active_branches(self, variables: Mapping[str, float]) -> list[State]:
+        """Compute the states that are active given a set of variables.
+
+        This is equivalent to :py:func:`.active_branches` on the published structure.
+
+        Args:
+            variables: The set of variable values the state labels depend on
+
+        Returns:
+            The list of active states
+        """
+
+        mask = self.active_mask(variables)
+        return [self._states[i] for i in np.flatnonzero(mask).tolist()]
+
+    def to_kripke(self) -> Kripke[Guard]:
+        """Create a private copy of the structure.
+
+        Returns:
+            A new Kripke structure with the same states as the published structure
+        """
+
+        return self.arrays.to_kripke()
+
+
+def _buffer(memory: SharedMemory) -> memoryview:
+    if memory.buf is None:
+        raise ValueError("The shared memory block has been closed")
+
+    return memory.buf
+
+
+def _align(size: int) -> int:
+    return -(-size // _ALIGNMENT) * _ALIGNMENT
+
+
+def _map(
+    memory: SharedMemory,
+) -> tuple[memoryview, KripkeArrays[Guard], LabelMasks[Guard]]:
+    """Create read-only array views of a structure stored in a shared memory block.
+
+    The block starts with the length of a JSON header that contains the dtype, shape and offset of
+    every column. The columns follow the header, each aligned to a multiple of 64 bytes.
+
+    Every column is a view of a single array created using :py:func:`numpy.frombuffer`, whose base
+    is a memoryview that stays alive as long as any view of the block exists, including views
+    derived from the columns by the caller. The memoryview is returned so that its lifetime can be
+    observed using a weak reference.
+    """
+
+    buffer = _buffer(memory)
+    block = np.frombuffer(buffer, dtype=np.uint8)
+    block.flags.writeable = False
+
+    (length,) = _HEADER.unpack_from(buffer)
+    layout = json.loads(bytes(buffer[_HEADER.size : _HEADER.size + length]))
+    start = _align(_HEADER.size + length)
+    columns: dict[str, NDArray[Any]] = {}
+
+    for name, (dtype, shape, offset) in layout.items():
+        size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        columns[name] = block[start + offset : start + offset + size].view(dtype).reshape(shape)
+
+    arrays = KripkeArrays(
+        state_ids=columns["state_ids"],
+        initial=columns["initial"],
+        edge_offsets=columns["edge_offsets"],
+        edge_targets=columns["edge_targets"],
+        label_offsets=columns["label_offsets"],
+        label_indices=columns["label_indices"],
+        labels=_decode_conditions(columns),
+    )
+
+    return cast(memoryview, block.base), arrays, LabelMasks(columns["masks"], arrays.labels)
+
+
+__all__ = ["SharedKripke"]
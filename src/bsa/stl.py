@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Mapping, Optional, TypeVar
+
+import numpy as np
+
+from .arrays import KripkeArrays
+from .robustness import branch_distances, condition_distance
+
+if TYPE_CHECKING:
+    from numpy.typing import ArrayLike, NDArray
+
+    from .branches import Guard
+    from .kripke import Kripke, State
+
+_GuardT = TypeVar("_GuardT", bound="Guard")
+
+_Trace = Mapping[str, "ArrayLike"]
+
+
+class Formula(ABC):
+    """Signal temporal logic formula evaluated over discrete-time traces.
+
+    A trace is a mapping from variable names to one-dimensional arrays of values, where the ith
+    element of each array is the value of the variable at the ith time step. The robustness of a
+    formula is computed for every time step at once, where a positive robustness means that the
+    formula holds starting at that time step.
+    """
+
+    @abstractmethod
+    def robustness(self, trace: _Trace) -> NDArray[np.float64]:
+        """Compute the robustness of the formula at every time step of a trace.
+
+        Args:
+            trace: Mapping from variable names to arrays of values at each time step
+
+        Returns:
+            The array of robustness values for each time step
+        """
+
+    def always(self, start: int = 0, end: Optional[int] = None) -> Always:
+        """Create a formula that requires this formula to hold at every step of a time window."""
+        return Always(self, start, end)
+
+    def eventually(self, start: int = 0, end: Optional[int] = None) -> Eventually:
+        """Create a formula that requires this formula to hold at some step of a time window."""
+        return Eventually(self, start, end)
+
+
+@dataclass(frozen=True)
+class Predicate(Formula):
+    """Atomic STL predicate created from a single condition label.
+
+    The robustness of the predicate is the signed distance of the trace values from the boundary of
+    the condition.
+
+    Attributes:
+        condition: The condition represented by the predicate
+    """
+
+    condition: Guard
+
+    def robustness(self, trace: _Trace) -> NDArray[np.float64]:
+        return condition_distance(self.condition, trace)
+
+
+@dataclass(frozen=True)
+class Conjunction(Formula):
+    """Conjunction of STL formulas, whose robustness is the minimum robustness of its operands.
+
+    A conjunction without operands always holds and has a robustness of positive infinity.
+
+    Attributes:
+        operands: The formulas that must all hold
+    """
+
+    operands: tuple[Formula, ...]
+
+    def robustness(self, trace: _Trace) -> NDArray[np.float64]:
+        length = _trace_length(trace)
+        result = np.full(length, np.inf)
+
+        for operand in self.operands:
+            np.minimum(result, operand.robustness(trace), out=result)
+
+        return result
+
+
+@dataclass(frozen=True)
+class _Temporal(Formula):
+    """Base class for temporal operators over the window [t + start, t + end] of each step t.
+
+    An end of None extends the window to the end of the trace. The window of each step is truncated
+    to the steps available in the trace, so the window of a step close to the end of the trace may
+    be empty.
+    """
+
+    operand: Formula
+    start: int = 0
+    end: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        _check_window(self.start, self.end)
+
+
+class Always(_Temporal):
+    """Formula that holds if its operand holds at every step of a time window.
+
+    The robustness is the minimum robustness of the operand over the window, and positive infinity
+    for an empty window.
+    """
+
+    def robustness(self, trace: _Trace) -> NDArray[np.float64]:
+        return _window_reduce(self.operand.robustness(trace), np.minimum, self.start, self.end)
+
+
+class Eventually(_Temporal):
+    """Formula that holds if its operand holds at some step of a time window.
+
+    The robustness is the maximum robustness of the operand over the window, and negative infinity
+    for an empty window.
+    """
+
+    def robustness(self, trace: _Trace) -> NDArray[np.float64]:
+        return _window_reduce(self.operand.robustness(trace), np.maximum, self.start, self.end)
+
+
+def _window_reduce(
+    values: NDArray[np.float64], reduce: np.ufunc, start: int, end: Optional[int]
+) -> NDArray[np.float64]:
+    """Reduce the values in the window [t + start, t + end] of every step t along the last axis.
+
+    The windows are computed as strided views of the values, so no window is copied. Steps past the
+    end of the trace are filled with the identity of the reduction, which is positive infinity for
+    the minimum and negative infinity for the maximum.
+    """
+
+    empty = np.inf if reduce is np.minimum else -np.inf
+    result = np.full(values.shape, empty)
+    shifted = values[..., start:]
+
+    if shifted.shape[-1] == 0:
+        return result
+
+    if end is None:
+        suffix = np.flip(reduce.accumulate(np.flip(shifted, axis=-1), axis=-1), axis=-1)
+        result[..., : shifted.shape[-1]] = suffix
+        return result
+
+    width = end - start + 1
+    padding = np.full(values.shape[:-1] + (width - 1,), empty)
+    padded = np.concatenate([shifted, padding], axis=-1)
+    windows = np.lib.stride_tricks.sliding_window_view(padded, width, axis=-1)
+    result[..., : shifted.shape[-1]] = reduce.reduce(windows, axis=-1)
+    return result
+
+
+def _check_window(start: int, end: Optional[int]) -> None:
+    if start < 0 or (end is not None and end < start):
+        raise ValueError("Time window must satisfy 0 <= start <= end")
+
+
+def _trace_length(trace: _Trace) -> int:
+    lengths = {len(np.asarray(values)) for values in trace.values()}
+
+    if len(lengths) != 1:
+        raise ValueError("Trace arrays must be non-empty and have the same length")
+
+    return lengths.pop()
+
+
+class StateFormulas:
+    """Compiled STL formulas for the states of a Kripke structure.
+
+    Each state is compiled into the conjunction of the predicates of its condition labels the first
+    time it is requested, and the formula is cached for subsequent requests. Predicates are shared
+    between the states that have the same label. The robustness of every state is computed from the
+    array representation of the Kripke structure, so each unique label is only evaluated once per
+    trace and the temporal operators are applied to all states at once.
+
+    Args:
+        kripke: The Kripke structure containing states representing conditional branches
+    """
+
+    def __init__(self, kripke: Kripke[_GuardT]):
+        self._states = kripke.states
+        self._indices = {state: index for index, state in enumerate(self._states)}
+        self._arrays = KripkeArrays.from_kripke(kripke)
+        self._predicates = tuple(Predicate(label) for label in self._arrays.labels)
+        self._formulas: dict[int, Conjunction] = {}
+
+    def formula(self, state: State) -> Conjunction:
+        """Return the STL formula representing the labels of a state.
+
+        Args:
+            state: The state to get the formula of
+
+        Returns:
+            The conjunction of the predicates of the state labels
+
+        Raises:
+            ValueError: If the state is not a member of the Kripke structure
+        """
+
+        try:
+            index = self._indices[state]
+        except KeyError:
+            raise ValueError(f"State {state} is not a member of Kripke structure") from None
+
+        if index not in self._formulas:
+            labels = self._arrays.label_indices_for(index).tolist()
+            self._formulas[index] = Conjunction(tuple(self._predicates[j] for j in labels))
+
+        return self._formulas[index]
+
+    def robustness(self, trace: _Trace) -> NDArray[np.float64]:
+        """Compute the robustness of the formula of every state at every step of a trace.
+
+        Args:
+            trace: Mapping from variable names to arrays of values at each time step
+
+        Returns:
+            A (states, steps) array of robustness values in the same order as the states
+        """
+
+        return branch_distances(self._arrays, trace)
+
+    def always(
+        self, trace: _Trace, start: int = 0, end: Optional[int] = None
+    ) -> NDArray[np.float64]:
+        """Compute the robustness of every state formula under the always operator.
+
+        Args:
+            trace: Mapping from variable names to arrays of values at each time step
+            start: The first step of the time window relative to each step
+            end: The last step of the time window relative to each step, or None for the end of the
+                trace
+
+        Returns:
+            A (states, steps) array of robustness values in the same order as the states
+        """
+
+        _check_window(start, end)
+        return _window_reduce(self.robustness(trace), np.minimum, start, end)
+
+    def eventually(
+        self, trace: _Trace, start: int = 0, end: Optional[int] = None
+    ) -> NDArray[np.float64]:
+        """Compute the robustness of every state formula under the eventually operator.
+
+        Args:
+            trace: Mapping from variable names to arrays of values at each time step
+            start: The first step of the time window relative to each step
+            end: The last step of the time window relative to each step, or None for the end of the
+                trace
+
+        Returns:
+            A (states, steps) array of robustness values in the same order as the states
+        """
+
+        _check_window(start, end)
+        return _window_reduce(self.robustness(trace), np.maximum, start, end)
+
+
+__all__ = ["Always", "Conjunction", "Eventually", "Formula", "Predicate", "StateFormulas"]
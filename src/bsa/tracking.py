@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Mapping, TypeVar
+
+import numpy as np
+
+from .arrays import KripkeArrays
+
+if TYPE_CHECKING:
+    from .branches import Guard
+    from .kripke import Kripke, State
+
+
+_GuardT = TypeVar("_GuardT", bound="Guard")
+
+
+@dataclass(frozen=True)
+class TrackerStep:
+    """The result of updating an active state tracker.
+
+    Attributes:
+        active: The states that are active after the update
+        entered: The states that became active during the update
+        exited: The states that stopped being active during the update
+    """
+
+    active: list[State]
+    entered: list[State]
+    exited: list[State]
+
+
+class ActiveStateTracker:
+    """Track the active states of a Kripke structure as variable values change over time.
+
+    The tracker keeps the truth value of every condition label and a counter of the unsatisfied
+    labels of every state, so a state is active exactly when its counter is zero. The conditions are
+    indexed by the variables they depend on, so an update only re-evaluates the conditions that
+    depend on a variable whose value changed. The cost of an update is therefore proportional to the
+    number of affected conditions rather than the size of the Kripke structure.
+
+    Before the first update no variable values are known, so every condition is false and only the
+    states without labels are active.
+
+    Args:
+        kripke: The Kripke structure containing states representing conditional branches
+    """
+
+    def __init__(self, kripke: Kripke[_GuardT]):
+        arrays = KripkeArrays.from_kripke(kripke)
+
+        self._states = kripke.states
+        self._conditions = arrays.labels
+        self._condition_states: list[list[int]] = [[] for _ in self._conditions]
+        self._variable_conditions: dict[str, list[int]] = {}
+
+        for state in range(arrays.n_states):
+            for condition in arrays.label_indices_for(state).tolist():
+                self._condition_states[condition].append(state)
+
+        for index, condition in enumerate(self._conditions):
+            for variable in condition.variables:
+                self._variable_conditions.setdefault(variable, []).append(index)
+
+        self._label_counts: list[int] = np.diff(arrays.label_offsets).tolist()
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all variable values and return the tracker to its initial state."""
+
+        self._values: dict[str, float] = {}
+        self._truths = [False] * len(self._conditions)
+        self._unsatisfied = self._label_counts.copy()
+        self._active = {i for i, count in enumerate(self._unsatisfied) if count == 0}
+
+    @property
+    def active(self) -> list[State]:
+        """The set of currently active states."""
+        return [self._states[index] for index in sorted(self._active)]
+
+    def update(self, variables: Mapping[str, float]) -> TrackerStep:
+        """Update the values of a set of variables and compute the new set of active states.
+
+        Variables that are not present in the mapping keep their previous values, so only the
+        variables that changed since the last update need to be provided.
+
+        Args:
+            variables: Mapping from variable names to their new values
+
+        Returns:
+            The active states after the update, and the states that entered and exited the set of
+            active states during the update
+        """
+
+        touched: set[int] = set()
+
+        for name, value in variables.items():
+            if name in self._values and self._values[name] == value:
+                continue
+
+            self._values[name] = value
+            touched.update(self._variable_conditions.get(name, ()))
+
+        flipped: set[int] = set()
+
+        for condition in touched:
+            truth = self._conditions[condition].is_true(self._values)
+
+            if truth == self._truths[condition]:
+                continue
+
+            self._truths[condition] = truth
+            delta = -1 if truth else 1
+
+            for state in self._condition_states[condition]:
+                self._unsatisfied[state] += delta
+                flipped.add(state)
+
+        entered = []
+        exited = []
+
+        for state in sorted(flipped):
+            if self._unsatisfied[state] == 0 and state not in self._active:
+                self._active.add(state)
+                entered.append(self._states[state])
+            elif self._unsatisfied[state] != 0 and state in self._active:
+                self._active.remove(state)
+                exited.append(self._states[state])
+
+        return TrackerStep(self.active, entered, exited)
+
+
+__all__ = ["ActiveStateTracker", "TrackerStep"]
@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+from bsa import BranchTree, Guard, Kripke, PathClassifier, trace_statistics
+
+
+def func(x: float, y: float) -> float:
+    if x <= 10:
+        if y >= 5:
+            return x + y
+        else:
+            return y - x
+    else:
+        return x
+
+
+def _kripke() -> Kripke[Guard]:
+    return BranchTree.from_function(func)[0].as_kripke()[0]
+
+
+def test_runs():
+    kripke = _kripke()
+    stats = trace_statistics(kripke, [0, 0, 1, 1, 1, -1, 1, 2, 2, 0])
+
+    assert stats.n_states == 3
+    assert stats.n_steps == 10
+    assert stats.run_states.tolist() == [0, 1, -1, 1, 2, 0]
+    assert stats.run_lengths.tolist() == [2, 3, 1, 1, 2, 1]
+    assert stats.occupancy.tolist() == [3, 4, 2]
+    assert stats.visits.tolist() == [2, 2, 1]
+    assert stats.max_dwell.tolist() == [2, 3, 2]
+    assert stats.mean_dwell.tolist() == [1.5, 2.0, 2.0]
+    assert stats.dwell_times(1).tolist() == [3, 1]
+
+
+def test_transitions():
+    kripke = _kripke()
+    stats = trace_statistics(kripke, [0, 0, 1, 1, 1, -1, 1, 2, 2, 0, 1])
+
+    observed = [
+        (int(source), int(stats.transition_targets[i]), int(stats.transition_counts[i]))
+        for i, source in enumerate(stats.transition_sources)
+    ]
+
+    assert observed == [(0, 1, 2), (1, 2, 1), (2, 0, 1)]
+    assert stats.expected.all()
+
+    matrix = stats.transition_matrix()
+    assert matrix[0, 1] == 2
+    assert np.trace(matrix) == 0
+    assert stats.transition_matrix(dwell=True).sum() == 8
+
+    probabilities = stats.transition_probabilities()
+    assert np.allclose(probabilities.sum(axis=1), 1.0)
+
+
+def test_unexpected():
+    source, target = Kripke.singleton([]), Kripke.singleton([])
+    kripke = source.join(target)
+    chain = Kripke.join_all([kripke, Kripke.singleton([])])
+    index = chain.states.index
+
+    stats = trace_statistics(kripke, [0, 1, 0])
+    assert not stats.unexpected.any()
+
+    single = Kripke(
+        chain.states,
+        dict.fromkeys(chain.states, True),
+        {state: [] for state in chain.states},
+        [e for e in chain.edges if index(e.source) == 0],
+    )
+    stats = trace_statistics(single, [0, 1, 2, 0])
+
+    assert stats.transition_sources.tolist() == [0, 1, 2]
+    assert stats.unexpected.tolist() == [False, True, True]
+
+
+def test_classified():
+    kripke = _kripke()
+    classifier = PathClassifier([kripke])
+    x = np.linspace(0.0, 20.0, 1000)
+    indices = classifier.classify_batch({"x": x, "y": np.full_like(x, 1.0)})[0]
+    stats = trace_statistics(kripke, indices)
+
+    assert stats.visits.sum() == 2
+    assert stats.occupancy.sum() == len(x)
+    assert stats.expected.all()
+
+
+def test_invalid():
+    kripke = _kripke()
+    empty = trace_statistics(kripke, [])
+
+    assert empty.n_steps == 0
+    assert empty.visits.tolist() == [0, 0, 0]
+    assert np.isnan(empty.mean_dwell).all()
+
+    with pytest.raises(ValueError):
+        trace_statistics(kripke, [0, 3])
+
+    with pytest.raises(ValueError):
+        trace_statistics(kripke, [[0, 1]])
@@ -0,0 +1,138 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from bsa import BranchTree, Condition, Edge, Guard, Interval, Kripke, KripkeArrays, State
+
+
+def func(x: float, y: float) -> float:
+    if x <= 10:
+        if y >= 5:
+            return x + y
+        else:
+            return y - x
+    else:
+        if y <= x:
+            return x
+        else:
+            return y
+
+
+def _kripke() -> Kripke[Guard]:
+    trees = BranchTree.from_function(func)
+    return trees[0].as_kripke()[0]
+
+
+def _edge_set(kripke: Kripke[Guard]) -> set[tuple[State, State]]:
+    return {(edge.source, edge.target) for edge in kripke.edges}
+
+
+def test_from_kripke():
+    kripke = _kripke()
+    arrays = KripkeArrays.from_kripke(kripke)
+
+    assert arrays.n_states == len(kripke.states)
+    assert arrays.n_edges == len(kripke.edges)
+    assert arrays.initial.sum() == len(kripke.initial_states)
+    assert len(arrays.labels) == 6
+
+    for i, state in enumerate(kripke.states):
+        labels = [arrays.labels[j] for j in arrays.label_indices_for(i)]
+        assert labels == kripke.labels_for(state)
+
+
+def test_round_trip(tmp_path: Path):
+    kripke = _kripke()
+    path = tmp_path / "kripke.npz"
+    KripkeArrays.from_kripke(kripke).save(path)
+
+    for mmap in (True, False):
+        loaded = KripkeArrays.load(path, mmap=mmap).to_kripke()
+
+        assert loaded.states == kripke.states
+        assert loaded.initial_states == kripke.initial_states
+        assert _edge_set(loaded) == _edge_set(kripke)
+
+        for state in kripke.states:
+            assert loaded.labels_for(state) == kripke.labels_for(state)
+
+
+def test_round_trip_without_suffix(tmp_path: Path):
+    kripke = _kripke()
+    path = tmp_path / "kripke"
+    KripkeArrays.from_kripke(kripke).save(path)
+
+    assert not (tmp_path / "kripke.npz").exists()
+
+    for mmap in (True, False):
+        assert KripkeArrays.load(path, mmap=mmap).to_kripke().states == kripke.states
+
+
+def test_load_state_count(tmp_path: Path):
+    path = tmp_path / "kripke.npz"
+    KripkeArrays.from_kripke(_kripke()).save(path)
+
+    with np.load(path) as npz:
+        arrays = {name: npz[name] for name in npz.files}
+
+    with open(path, "wb") as handle:
+        np.savez(handle, **{**arrays, "n_states": arrays["n_states"] + 1})
+
+    for mmap in (True, False):
+        with pytest.raises(ValueError):
+            KripkeArrays.load(path, mmap=mmap)
+
+
+def test_interval_round_trip(tmp_path: Path):
+    states = [State(), State()]
+    labels = [Interval("x", 0, 10, upper_strict=True), Condition.lt("y", "x")]
+    kripke = Kripke(states, {}, {states[0]: labels, states[1]: [labels[0].inverse()]}, [])
+    path = tmp_path / "kripke.npz"
+    KripkeArrays.from_kripke(kripke).save(path)
+    loaded = KripkeArrays.load(path).to_kripke()
+
+    for state in kripke.states:
+        assert loaded.labels_for(state) == kripke.labels_for(state)
+
+
+def test_unlabeled_round_trip():
+    states = [State(), State()]
+    kripke = Kripke(states, {states[0]: True}, {}, [Edge(states[0], states[1])])
+    loaded = KripkeArrays.from_kripke(kripke).to_kripke()
+
+    assert loaded.states == states
+    assert loaded.initial_states == [states[0]]
+    assert _edge_set(loaded) == {(states[0], states[1])}
+
+
+def test_large_mmap_load(tmp_path: Path):
+    n_states = 500_000
+    indices = np.arange(n_states, dtype=np.int64)
+    arrays = KripkeArrays(
+        state_ids=np.zeros((n_states, 16), dtype=np.uint8),
+        initial=indices == 0,
+        edge_offsets=np.arange(n_states + 1, dtype=np.int64),
+        edge_targets=((indices + 1) % n_states).astype(np.int32),
+        label_offsets=np.arange(n_states + 1, dtype=np.int64),
+        label_indices=(indices % 2).astype(np.int32),
+        labels=(Condition.lt("x", 0.0), Condition.gt("x", 0.0, strict=True)),
+    )
+
+    path = tmp_path / "large.npz"
+    arrays.save(path)
+
+    loaded = KripkeArrays.load(path)
+    columns = [
+        loaded.state_ids,
+        loaded.initial,
+        loaded.edge_offsets,
+        loaded.edge_targets,
+        loaded.label_offsets,
+        loaded.label_indices,
+    ]
+
+    assert all(isinstance(column, np.memmap) for column in columns)
+    assert loaded.n_states == n_states
+    assert loaded.labels == arrays.labels
+    assert np.array_equal(loaded.successors(n_states - 1), [0])
@@ -0,0 +1,120 @@
+import random
+
+from bsa import BranchTree, Comparison, Condition, Edge, Kripke, State, minimize
+
+
+def func(x: float, y: float) -> float:
+    if x <= 10:
+        if y >= 5:
+            return x + y
+        else:
+            return y - x
+    else:
+        return y
+
+
+def _bisimilar_blocks(kripke: Kripke[str]) -> dict[State, int]:
+    """Compute bisimulation classes by refining label signatures until they are stable."""
+
+    states = kripke.states
+    successors = {
+        state: [edge.target for edge in kripke.edges if edge.source == state] for state in states
+    }
+    blocks = {state: hash(frozenset(kripke.labels_for(state))) for state in states}
+
+    while True:
+        signatures = {
+            state: (blocks[state], frozenset(blocks[target] for target in successors[state]))
+            for state in states
+        }
+        ids: dict[tuple[int, frozenset[int]], int] = {}
+        refined = {state: ids.setdefault(signatures[state], len(ids)) for state in states}
+
+        if len(set(refined.values())) == len(set(blocks.values())):
+            return refined
+
+        blocks = refined
+
+
+def test_minimize_chains():
+    states = [State() for _ in range(6)]
+    labels = {state: ["a"] for state in states[:3]}
+    labels.update({state: ["b"] for state in states[3:]})
+    edges = [
+        Edge(states[0], states[1]),
+        Edge(states[1], states[3]),
+        Edge(states[2], states[4]),
+        Edge(states[4], states[5]),
+        Edge(states[3], states[3]),
+        Edge(states[5], states[5]),
+    ]
+    kripke = Kripke(states, {states[0]: True}, labels, edges)
+    minimized, mapping = minimize(kripke)
+
+    assert len(minimized.states) == 3
+    assert mapping[states[3]] == mapping[states[4]] == mapping[states[5]]
+    assert mapping[states[1]] == mapping[states[2]]
+    assert mapping[states[0]] != mapping[states[1]]
+    assert minimized.initial_states == [states[0]]
+    assert minimized.labels_for(mapping[states[4]]) == ["b"]
+    assert len(minimized.edges) == 3
+
+
+def test_minimize_random():
+    rng = random.Random(0)
+
+    for _ in range(20):
+        states = [State() for _ in range(30)]
+        labels = {state: [rng.choice("ab")] for state in states}
+        edges = [Edge(rng.choice(states), rng.choice(states)) for _ in range(rng.randrange(20, 60))]
+        kripke = Kripke(states, {states[0]: True}, labels, edges)
+        expected = _bisimilar_blocks(kripke)
+        minimized, mapping = minimize(kripke)
+
+        assert len(minimized.states) == len(set(expected.values()))
+
+        for s1 in states:
+            for s2 in states:
+                assert (mapping[s1] == mapping[s2]) == (expected[s1] == expected[s2])
+
+
+def test_minimize_join():
+    tree = BranchTree.from_function(func)[0]
+    kripke = tree.as_kripke()[0]
+    joined = kripke.join(kripke)
+    minimized, mapping = minimize(joined)
+
+    assert len(minimized.states) <= len(kripke.states)
+    assert set(mapping) == set(joined.states)
+
+    for state in joined.states:
+        assert set(joined.labels_for(state)) == set(minimized.labels_for(mapping[state]))
+
+
+def test_minimize_large():
+    n_states = 50_000
+    states = [State() for _ in range(n_states)]
+    labels = {
+        state: [Condition("x", Comparison.GTE, float(i % 2))] for i, state in enumerate(states)
+    }
+    edges = [
+        Edge(states[i], states[(i + k) % n_states]) for i in range(n_states) for k in (1, 2, 4, 8)
+    ]
+    kripke = Kripke(states, {states[0]: True}, labels, edges)
+    minimized, _ = minimize(kripke)
+
+    assert len(minimized.states) == 2
+
+
+def test_minimize_long_chain():
+    n_states = 20_000
+    states = [State() for _ in range(n_states)]
+    labels = {state: ["a"] for state in states[:-1]}
+    labels[states[-1]] = ["b"]
+    edges = [Edge(states[i], states[i + 1]) for i in range(n_states - 1)]
+    edges.append(Edge(states[-1], states[-1]))
+    kripke = Kripke(states, {states[0]: True}, labels, edges)
+    minimized, mapping = minimize(kripke)
+
+    assert len(minimized.states) == n_states
+    assert len(set(mapping.values())) == n_states
@@ -1,4 +1,10 @@
-from bsa import BranchTree, Comparison, Condition
+import ast
+import pickle
+from dataclasses import FrozenInstanceError, replace
+
+import pytest
+
+from bsa import BranchTree, Comparison, Condition, Guard, Interval
 
 
 def func(x1: float, x2: float) -> float:
@@ -79,3 +85,109 @@ def test_kripke_conversion():
     kripkes = tree.as_kripke()
     assert len(kripkes) == 2
     assert all(len(k.states) == 4 for k in kripkes)
+
+
+def test_frozen_tree():
+    tree = BranchTree.from_function(func)[0]
+    frozen = tree.freeze()
+
+    assert frozen.condition == tree.condition
+    assert frozen.variables == frozenset(tree.variables) == frozenset({"x1", "x2"})
+    assert frozen.depth == 2
+    assert frozen.n_conditions == 3
+    assert frozen.n_leaves == 2
+    assert frozen.n_paths == 4
+    assert frozen.thaw() == tree
+    assert len(frozen.as_kripke()[0].states) == len(tree.as_kripke()[0].states)
+
+    with pytest.raises(FrozenInstanceError):
+        frozen.depth = 3  # type: ignore[misc]
+
+
+def test_frozen_tree_hash():
+    first = BranchTree.from_function(func)[0].freeze()
+    second = BranchTree.from_function(func)[0].freeze()
+    other = BranchTree.from_function(func2)[0].freeze()
+
+    assert first == second
+    assert hash(first) == hash(second)
+    assert first != other
+    assert {first: 1}[second] == 1
+    assert pickle.loads(pickle.dumps(first)) == first
+
+
+def test_deep_tree_variables():
+    tree = BranchTree(Condition(f"x{0}", Comparison.LTE, 0.0), [], [])
+    node = tree
+
+    for index in range(1, 2000):
+        child = BranchTree(Condition(f"x{index}", Comparison.LTE, 0.0), [], [])
+        node.true_children.append(child)
+        node = child
+
+    assert len(tree.variables) == 2000
+
+
+def func3(x: float, y: float) -> float:
+    if 0 <= x <= 10:
+        if y >= 1 and y <= 2:
+            return x
+        else:
+            return y
+    else:
+        if 1 <= x <= y:
+            return x + y
+        else:
+            return x - y
+
+
+def test_interval_trees():
+    (tree,) = BranchTree.from_function(func3)
+    assert tree.condition == Interval("x", 0, 10)
+    assert [child.condition for child in tree.true_children] == [Interval("y", 1, 2)]
+
+    (chained,) = tree.false_children
+    assert chained.condition == Condition.gt("x", 1)
+    assert [child.condition for child in chained.true_children] == [Condition.lt("x", "y")]
+    assert tree.freeze().depth == 3
+    assert len(tree.as_kripke()[0].states) == 5
+
+
+def test_interval_conditions():
+    interval = Interval("x", 0, 10, upper_strict=True)
+
+    assert interval.variables == {"x"}
+    assert interval.is_true({"x": 0})
+    assert not interval.is_true({"x": 10})
+    assert not interval.is_true({"y": 5})
+    assert interval.inverse().is_true({"x": 10})
+    assert not interval.inverse().is_true({"x": 5})
+    assert not interval.inverse().is_true({"y": 5})
+    assert interval.inverse().inverse() == interval
+    assert interval != interval.inverse()
+    assert pickle.loads(pickle.dumps(interval)) == interval
+
+    expr = ast.parse("0 <= x <= 10", mode="eval").body
+    assert Guard.from_expr(expr) == Interval.from_expr(expr) == Interval("x", 0, 10)
+
+    with pytest.raises(TypeError):
+        Guard.from_expr(ast.parse("0 <= x <= y", mode="eval").body)
+
+    with pytest.raises(TypeError):
+        Condition.from_expr(expr)
+
+    with pytest.raises(TypeError):
+        Interval.from_expr(ast.parse("x <= 10", mode="eval").body)
+
+
+def test_interval_is_not_condition():
+    interval = Interval("x", 0, 10)
+
+    assert isinstance(interval, Guard)
+    assert not isinstance(interval, Condition)
+    assert not hasattr(interval, "comparison")
+    assert not hasattr(interval, "bound")
+    assert replace(interval, upper=20) == Interval("x", 0, 20)
+    assert replace(interval, inside=False) == interval.inverse()
+    assert type(Condition.lt("x", 10)) is Condition
+    assert Guard.from_expr(ast.parse("x <= 10", mode="eval").body) == Condition.lt("x", 10)
@@ -0,0 +1,132 @@
+import sys
+
+import numpy as np
+import pytest
+
+import bsa
+from bsa import Comparison, Condition, GuardBuffer, capture_guards
+
+
+def controller(xs: list[float], limit: float) -> float:
+    total = 0.0
+
+    for x in xs:
+        if x <= limit:
+            total += x
+        else:
+            if total >= 10:
+                return total
+
+            total -= x
+
+    return total
+
+
+def test_capture_guards():
+    captured = capture_guards(controller, capacity=16)
+    buffer, result = captured([1.0, 6.0, 2.0], 5.0)
+
+    assert result == controller([1.0, 6.0, 2.0], 5.0)
+    assert captured.guards == ["x <= limit", "total >= 10"]
+    assert captured.conditions == [
+        Condition("x", Comparison.LTE, "limit"),
+        Condition("total", Comparison.GTE, 10.0),
+    ]
+    assert len(buffer) == buffer.n_recorded == 4
+    assert buffer.guards.tolist() == [0, 0, 1, 0]
+    assert buffer.outcomes.tolist() == [True, False, False, True]
+    assert buffer.variable("x")[[0, 1, 3]].tolist() == [1.0, 6.0, 2.0]
+    assert np.isnan(buffer.variable("x")[2])
+    assert buffer.variable("total")[2] == 1.0
+
+
+def test_capture_overwrite():
+    captured = capture_guards(controller, capacity=4)
+    xs = [float(x) for x in range(10)]
+    buffer, _ = captured(xs, 100.0)
+
+    assert buffer.n_recorded == 10
+    assert buffer.n_lost == 6
+    assert buffer.variable("x").tolist() == xs[-4:]
+    assert buffer.outcomes.all()
+
+
+def test_capture_drop():
+    captured = capture_guards(controller, capacity=4, policy="drop")
+    xs = [float(x) for x in range(10)]
+    buffer, _ = captured(xs, 100.0)
+
+    assert buffer.n_lost == 6
+    assert buffer.variable("x").tolist() == xs[:4]
+
+
+def test_capture_reuses_buffer():
+    captured = capture_guards(controller, capacity=4)
+    buffer, _ = captured([1.0, 2.0], 5.0)
+    kept = buffer.copy()
+    second, _ = captured([3.0], 5.0)
+
+    assert second is buffer
+    assert second.variable("x").tolist() == [3.0]
+    assert kept.variable("x").tolist() == [1.0, 2.0]
+
+
+def test_capture_namespace():
+    names = set(vars(sys.modules[__name__]))
+    capture_guards(controller)
+
+    assert set(vars(sys.modules[__name__])) == names
+    assert not hasattr(bsa, "controller_captured")
+
+
+def test_capture_closure():
+    limit = 5.0
+
+    def bounded(x: float) -> float:
+        if x <= limit:
+            return x
+
+        return limit
+
+    captured = capture_guards(bounded, capacity=4)
+    buffer, result = captured(7.0)
+
+    assert result == 5.0
+    assert captured.conditions == [Condition("x", Comparison.LTE, "limit")]
+    assert buffer.outcomes.tolist() == [False]
+    assert buffer.variable("limit").tolist() == [5.0]
+
+
+def test_buffer_invalid():
+    with pytest.raises(ValueError):
+        GuardBuffer(["x"], 0)
+
+    with pytest.raises(ValueError):
+        capture_guards(controller, policy="newest")  # type: ignore[arg-type]
+
+
+def step(state: dict[str, float], mode: str) -> None:
+    if mode == "a":
+        state["x"] += 1
+
+    if state["x"] >= 2:
+        state["x"] = 0
+
+
+def test_capture_without_return():
+    captured = capture_guards(step, capacity=4)
+    state = {"x": 1.0}
+    buffer, result = captured(state, "a")
+
+    assert result is None
+    assert state == {"x": 0}
+    assert buffer.outcomes.tolist() == [True, True]
+
+
+def test_capture_non_numeric():
+    captured = capture_guards(step, capacity=4)
+    buffer, _ = captured({"x": 0.0}, "b")
+
+    assert captured.variables == ["mode"]
+    assert buffer.outcomes.tolist() == [False, False]
+    assert np.isnan(buffer.variable("mode")).all()
@@ -0,0 +1,72 @@
+import itertools
+
+import numpy as np
+
+from bsa import BranchTree, CoverageAccumulator, PathClassifier, active_branches
+
+
+def func(x: float, y: float, z: float) -> float:
+    if x <= 10:
+        if y >= 5:
+            if z <= y:
+                return x + y
+        else:
+            return y - x
+    else:
+        if y <= x and z >= 0:
+            return x
+        else:
+            return y
+
+    if z >= 2:
+        return z
+
+    return 0.0
+
+
+def test_classify():
+    trees = BranchTree.from_function(func)
+    kripkes = [kripke for tree in trees for kripke in tree.as_kripke()]
+    classifier = PathClassifier(kripkes)
+
+    assert classifier.kripkes == kripkes
+
+    for x, y, z in itertools.product([0, 20], [0, 5, 10], [-1, 2, 7]):
+        variables = {"x": float(x), "y": float(y), "z": float(z)}
+        expected = [active_branches(kripke, variables) for kripke in kripkes]
+
+        assert [[state] for state in classifier.classify(variables)] == expected
+
+
+def test_classify_missing_variable():
+    classifier = PathClassifier.from_trees(BranchTree.from_function(func))
+
+    assert classifier.classify({"x": 1.0}) == [None, None]
+
+
+def test_classify_batch():
+    classifier = PathClassifier.from_trees(BranchTree.from_function(func))
+    rng = np.random.default_rng(0)
+    samples = {name: rng.uniform(-5, 25, size=200) for name in ("x", "y", "z")}
+    indices = classifier.classify_batch(samples)
+
+    assert indices.shape == (len(classifier.kripkes), 200)
+
+    for sample in range(200):
+        variables = {name: float(values[sample]) for name, values in samples.items()}
+        states = classifier.classify(variables)
+
+        for i, kripke in enumerate(classifier.kripkes):
+            assert kripke.states[indices[i, sample]] == states[i]
+
+    accumulator = CoverageAccumulator(classifier.kripkes[0])
+    accumulator.record_indices(indices[0])
+
+    assert accumulator.snapshot().hits.sum() == 200
+
+
+def test_classify_batch_missing_variable():
+    classifier = PathClassifier.from_trees(BranchTree.from_function(func))
+    indices = classifier.classify_batch({"x": np.array([1.0, 20.0])})
+
+    assert np.all(indices == -1)
@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+
+from bsa import (
+    BranchTree,
+    CoverageAccumulator,
+    Kripke,
+    LabelMasks,
+    State,
+    active_branches,
+    condition_mask,
+)
+
+
+def kripke() -> Kripke:
+    states = [State(), State(), State()]
+    return Kripke(states, {states[0]: True}, {}, [])
+
+
+def test_record():
+    k = kripke()
+    states = k.states
+    coverage = CoverageAccumulator(k)
+    coverage.record([states[1]])
+    coverage.record([])
+    coverage.record([states[1], states[2]])
+    snapshot = coverage.snapshot()
+
+    assert snapshot.n_samples == 3
+    assert list(snapshot.hits) == [0, 2, 1]
+    assert list(snapshot.first_hits) == [-1, 0, 2]
+    assert snapshot.ratio == pytest.approx(2 / 3)
+
+    with pytest.raises(ValueError):
+        coverage.record([State()])
+
+
+def test_record_duplicates():
+    k = kripke()
+    states = k.states
+    coverage = CoverageAccumulator(k)
+    coverage.record([states[1], states[1], states[2]])
+
+    with pytest.raises(ValueError):
+        coverage.record([states[0], State()])
+
+    snapshot = coverage.snapshot()
+
+    assert snapshot.n_samples == 1
+    assert list(snapshot.hits) == [0, 1, 1]
+    assert list(snapshot.first_hits) == [-1, 0, 0]
+
+
+def test_record_batches():
+    k = kripke()
+    by_mask = CoverageAccumulator(k)
+    by_index = CoverageAccumulator(k)
+    indices = np.array([2, -1, 2, 0, 2])
+    mask = np.arange(3)[:, None] == indices[None, :]
+
+    by_mask.record_indices([-1])
+    by_mask.record_mask(mask)
+    by_index.record_indices([-1])
+    by_index.record_indices(indices)
+
+    for coverage in (by_mask, by_index):
+        snapshot = coverage.snapshot()
+        assert snapshot.n_samples == 6
+        assert list(snapshot.hits) == [1, 0, 3]
+        assert list(snapshot.first_hits) == [4, -1, 1]
+
+
+def test_merge():
+    k = kripke()
+    states = k.states
+    first = CoverageAccumulator(k)
+    second = CoverageAccumulator(k)
+    first.record_indices([1, 1])
+    second.record_indices([0, 1, 2])
+    first.merge(second)
+    snapshot = first.snapshot()
+
+    assert snapshot.n_samples == 5
+    assert list(snapshot.hits) == [1, 3, 1]
+    assert list(snapshot.first_hits) == [2, 0, 4]
+
+    with pytest.raises(ValueError):
+        first.merge(CoverageAccumulator(kripke()))
+
+    snapshot.hits[0] = 100
+    assert first.snapshot().hits[0] == 1
+    assert first.states == states
+
+
+def func(x: float) -> float:
+    if x <= 5:
+        return x
+
+    return -x
+
+
+def test_record_label_masks():
+    k = BranchTree.from_function(func)[0].as_kripke()[0]
+    masks = LabelMasks.from_kripke(k)
+    samples = {"x": np.array([5.0, 7.0, 1.0, 5.0])}
+    coverage = CoverageAccumulator(k)
+    coverage.record_mask(masks.active([condition_mask(c, samples) for c in masks.labels]))
+    expected = CoverageAccumulator(k)
+
+    for x in samples["x"]:
+        expected.record(active_branches(k, {"x": x}))
+
+    assert coverage.snapshot().hits.tolist() == expected.snapshot().hits.tolist() == [1, 3]
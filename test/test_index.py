@@ -0,0 +1,98 @@
+import gc
+from typing import Callable
+
+import pytest
+
+from bsa import BranchTree, Comparison, Condition, Guard, Kripke, State, StateIndex
+
+
+def func(x: float, y: float, z: float) -> float:
+    if x <= 10:
+        if y >= z:
+            return x + y
+        else:
+            return y - x
+    else:
+        if y <= 5:
+            return x
+        else:
+            return y
+
+
+def _kripke() -> Kripke[Guard]:
+    return BranchTree.from_function(func)[0].as_kripke()[0]
+
+
+def _scan(kripke: Kripke[Guard], predicate: Callable[[Guard], bool]) -> list[State]:
+    return [s for s in kripke.states if any(predicate(label) for label in kripke.labels_for(s))]
+
+
+def test_variables():
+    kripke = _kripke()
+    index = StateIndex.of(kripke)
+
+    assert index.variables == {"x", "y", "z"}
+    assert len(index.all()) == len(kripke.states) == 4
+
+    for variable in index.variables:
+        expected = [
+            s for s in kripke.states if any(variable in c.variables for c in kripke.labels_for(s))
+        ]
+        assert index.depends_on(variable).states == expected
+
+    assert index.depends_on("z").states == _scan(
+        kripke, lambda label: isinstance(label, Condition) and label.bound == "z"
+    )
+    assert not index.depends_on("w")
+    assert index.depends_on("z", "w") == index.depends_on("z")
+
+
+def test_conditions():
+    kripke = _kripke()
+    index = StateIndex.of(kripke)
+    condition = Condition("y", Comparison.LTE, 5.0)
+
+    assert index.conditions == {label for s in kripke.states for label in kripke.labels_for(s)}
+    assert index.labeled(condition).states == _scan(kripke, lambda label: label == condition)
+    assert len(index.labeled(condition)) == 1
+    assert len(index.decided_by(condition)) == 2
+    assert index.decided_by(condition) == index.decided_by(condition.inverse())
+    assert not index.labeled(Condition("w", Comparison.GTE, 0.0))
+
+
+def test_algebra():
+    kripke = _kripke()
+    index = StateIndex.of(kripke)
+    x = Condition("x", Comparison.LTE, 10.0)
+    left, right = index.labeled(x), index.labeled(x.inverse())
+
+    assert (left | right) == index.all()
+    assert not (left & right)
+    assert ~left == right
+    assert (index.all() - left) == right
+    assert (left ^ index.all()) == right
+    assert (index.depends_on("z") & left) == index.depends_on("z")
+    assert (index.depends_on("z") - right).indices == index.depends_on("z").indices
+
+    for state in left:
+        assert state in left
+        assert state not in right
+
+    assert None not in left
+
+    with pytest.raises(ValueError):
+        _ = left & StateIndex.of(_kripke()).all()
+
+
+def test_cache():
+    kripke = _kripke()
+    index = StateIndex.of(kripke)
+
+    assert StateIndex.of(kripke) is index
+    assert StateIndex.of(kripke.add_labels([])) is not index
+
+    size = len(StateIndex._cache)
+    del kripke
+    gc.collect()
+
+    assert len(StateIndex._cache) == size - 1
@@ -0,0 +1,255 @@
+import asyncio
+import gc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+import pytest
+
+from bsa import (
+    InstrumentationRegistry,
+    LazyInstrumentedFunction,
+    gather_instrumented,
+    instrument_function,
+    warm_up,
+)
+
+
+def func(x: float, y: float) -> float:
+    if x <= 5:
+        if y >= 10:
+            return x + y
+
+        return x
+    else:
+        return y
+
+
+async def controller(x: float, y: float) -> float:
+    await asyncio.sleep(0)
+
+    if x <= 5:
+        if y >= 10:
+            return x + y
+
+        return x
+    else:
+        return y
+
+
+@instrument_function
+def decorated(x: float) -> float:
+    if x <= 5:
+        return x
+
+    return -x
+
+
+@instrument_function(lazy=True)
+def lazy_decorated(x: float) -> float:
+    if x >= 0:
+        return x
+
+    return -x
+
+
+def test_instrument_function():
+    instrumented = instrument_function(func)
+
+    assert instrumented(1, 20) == ({"x": 1, "y": 20}, 21)
+    assert instrumented(1, 5) == ({"x": 1, "y": 5}, 1)
+    assert instrumented(6, 5) == ({"x": 6}, 5)
+
+
+def test_instrument_coroutine():
+    instrumented = instrument_function(controller)
+
+    assert instrumented.src.startswith("async def controller_instrumented")
+    assert asyncio.run(instrumented(1, 20)) == ({"x": 1, "y": 20}, 21)
+    assert asyncio.run(instrumented(6, 5)) == ({"x": 6}, 5)
+
+
+def test_gather_instrumented():
+    instrumented = instrument_function(controller)
+    inputs = [(x, y) for x in range(10) for y in range(0, 20, 5)]
+    results = asyncio.run(gather_instrumented(instrumented, inputs, max_concurrency=7))
+
+    assert [result for _, result in results] == [func(x, y) for x, y in inputs]
+    assert [variables["x"] for variables, _ in results] == [x for x, _ in inputs]
+
+
+def test_gather_instrumented_invalid_concurrency():
+    instrumented = instrument_function(controller)
+
+    with pytest.raises(ValueError):
+        asyncio.run(gather_instrumented(instrumented, [], max_concurrency=0))
+
+
+def test_decorator():
+    assert decorated(1) == ({"x": 1}, 1)
+    assert decorated.src.startswith("def decorated_instrumented")
+
+
+def test_lazy_instrumentation():
+    assert isinstance(lazy_decorated, LazyInstrumentedFunction)
+    assert lazy_decorated(-2) == ({"x": -2}, 2)
+    assert lazy_decorated.is_instrumented
+
+    lazy = instrument_function(func, lazy=True)
+
+    assert not lazy.is_instrumented
+    assert lazy(1, 20) == ({"x": 1, "y": 20}, 21)
+    assert lazy.is_instrumented
+
+
+def test_lazy_instrumentation_threads():
+    lazy = instrument_function(func, lazy=True)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda x: lazy(x, 10), range(32)))
+
+    assert [result for _, result in results] == [func(x, 10) for x in range(32)]
+    assert lazy.instrument() is lazy.instrument()
+
+
+def test_lazy_coroutine():
+    lazy = instrument_function(controller, lazy=True)
+    results = asyncio.run(gather_instrumented(lazy, [(1, 20), (6, 5)]))
+
+    assert results == [({"x": 1, "y": 20}, 21), ({"x": 6}, 5)]
+
+
+def test_warm_up():
+    funcs = [instrument_function(func, lazy=True), instrument_function(controller, lazy=True)]
+    warm_up(funcs)
+
+    assert all(lazy.is_instrumented for lazy in funcs)
+    assert funcs[1].src.startswith("async def controller_instrumented")
+
+
+def test_instrument_function_without_function():
+    with pytest.raises(TypeError):
+        instrument_function()  # type: ignore[call-overload]
+
+
+def search(xs: list[float]) -> float:
+    for x in xs:
+        if x >= 5:
+            return x
+
+    return 0.0
+
+
+def test_instrument_loop():
+    instrumented = instrument_function(search)
+
+    assert instrumented([1.0, 7.0, 9.0]) == ({"x": 7.0}, 7.0)
+    assert instrumented([1.0]) == ({"x": 1.0}, 0.0)
+
+
+def test_registry_reuse():
+    first = instrument_function(func)
+    second = instrument_function(func)
+
+    assert first is second
+    assert "func_instrumented" not in globals()
+
+
+def test_registry_defaults():
+    def make(offset: float) -> Callable[..., float]:
+        def shifted(x: float, y: float = offset) -> float:
+            if x <= y:
+                return x
+
+            return y
+
+        return shifted
+
+    low = instrument_function(make(1.0))
+    high = instrument_function(make(10.0))
+
+    assert low is not high
+    assert low(5.0) == ({"x": 5.0, "y": 1.0}, 1.0)
+    assert high(5.0) == ({"x": 5.0, "y": 10.0}, 5.0)
+    assert instrument_function(make(1.0)) is low
+
+
+def test_registry_default_identity():
+    def make(default: object) -> Callable[..., float]:
+        def scaled(x: float, *, factor: object = default) -> float:
+            if x <= 5:
+                return x * 2
+
+            return x if factor is True else -x
+
+        return scaled
+
+    instrumented = [instrument_function(make(default)) for default in (True, 1, 1.0)]
+
+    assert len({id(func) for func in instrumented}) == 3
+    assert [func(10.0)[1] for func in instrumented] == [10.0, -10.0, -10.0]
+
+
+def test_registry_globals():
+    registry = InstrumentationRegistry()
+    source = "def scaled(x):\n    return x * factor\n"
+    namespaces: list[dict] = [{"factor": 1.0}, {"factor": 2.0}]
+
+    for namespace in namespaces:
+        exec(source, namespace)
+
+    first, second = (namespace["scaled"] for namespace in namespaces)
+    kept = registry.get_or_create(first, "instrument", lambda: first)
+
+    assert first.__code__ == second.__code__
+    assert registry.get_or_create(second, "instrument", lambda: second) is second
+    assert registry.get_or_create(first, "instrument", lambda: second) is kept
+
+
+k = 100.0
+
+
+def test_closures():
+    def make(k: float) -> Callable[[float], float]:
+        calls = 0
+
+        def bounded(x: float) -> float:
+            nonlocal calls
+            calls += 1
+
+            if x <= k:
+                return x + calls
+
+            return k
+
+        return bounded
+
+    low = instrument_function(make(5.0))
+    high = instrument_function(make(20.0))
+
+    assert low is not high
+    assert low(10.0) == ({"x": 10.0, "k": 5.0}, 5.0)
+    assert low(1.0) == ({"x": 1.0, "k": 5.0}, 3.0)
+    assert high(10.0) == ({"x": 10.0, "k": 20.0}, 11.0)
+
+    original = make(5.0)
+    instrumented = instrument_function(original)
+    instrumented(1.0)
+
+    assert original(1.0) == 3.0
+
+
+def test_registry_weak_references():
+    registry = InstrumentationRegistry()
+    registry.get_or_create(func, "instrument", lambda: instrument_function(search))
+    gc.collect()
+
+    assert len(registry) == 0
+
+    kept = registry.get_or_create(func, "instrument", lambda: instrument_function(search))
+
+    assert registry.get_or_create(func, "instrument", lambda: None) is kept
+    assert len(registry) == 1
+
+    registry.clear()
+
+    assert len(registry) == 0
@@ -36,3 +36,107 @@ def test_join(k1: Kripke, k2: Kripke):
     assert len(joined.states) == 4
     assert len(joined.initial_states) == 4
     assert len(joined.edges) == 12
+
+
+def chain() -> tuple[list[State], Kripke]:
+    states = [State() for _ in range(5)]
+    initial = {states[0]: True}
+    edges = [
+        Edge(states[0], states[1]),
+        Edge(states[1], states[2]),
+        Edge(states[2], states[1]),
+        Edge(states[2], states[3]),
+        Edge(states[4], states[3]),
+    ]
+
+    return states, Kripke(states, initial, {}, edges)
+
+
+def test_states_from():
+    states, kripke = chain()
+    assert kripke.states_from(states[2]) == [states[1], states[3], states[2]]
+
+
+def test_reachability():
+    states, kripke = chain()
+    assert kripke.reachable_from(states[1]) == states[1:4]
+    assert kripke.reachable_from(states[3]) == [states[3]]
+    assert kripke.reachable_states == states[:4]
+    assert kripke.is_reachable(states[0], states[3])
+    assert not kripke.is_reachable(states[3], states[0])
+
+
+def test_strongly_connected_components():
+    states, kripke = chain()
+    components = kripke.strongly_connected_components()
+
+    assert sorted(map(len, components)) == [1, 1, 1, 2]
+    assert {states[1], states[2]} in [set(component) for component in components]
+
+    position = {state: i for i, component in enumerate(components) for state in component}
+
+    for edge in kripke.edges:
+        assert position[edge.source] >= position[edge.target]
+
+
+def test_large_reachability():
+    states = [State() for _ in range(20_000)]
+    edges = [Edge(states[i], states[i + 1]) for i in range(len(states) - 1)]
+    kripke = Kripke(states, {states[0]: True}, {}, edges + [Edge(states[-1], states[0])])
+
+    assert len(kripke.reachable_states) == len(states)
+    assert len(kripke.strongly_connected_components()) == 1
+
+
+def test_join_duplicates(k1: Kripke):
+    joined = k1.join(k1)
+    assert len(set(joined.states)) == 4
+    assert len(joined.edges) == 12
+
+
+def test_join_all():
+    kripkes = [kripke(), kripke(), kripke()]
+    joined = Kripke.join_all(kripkes)
+    pairwise = kripkes[0].join(kripkes[1]).join(kripkes[2])
+
+    assert len(joined.states) == 6
+    assert len(joined.initial_states) == 6
+    assert len(joined.edges) == len(pairwise.edges) == 30
+    assert {(e.source, e.target) for e in joined.edges} == {
+        (e.source, e.target) for e in pairwise.edges
+    }
+
+
+def test_join_order():
+    first, second = Kripke.singleton(["a"]), Kripke.singleton(["b"])
+    joined = first.join(second)
+
+    assert [joined.labels_for(state) for state in joined.states] == [["b"], ["a"]]
+    assert joined.states == second.states + first.states
+    assert joined.edges == [
+        Edge(first.states[0], second.states[0]),
+        Edge(second.states[0], first.states[0]),
+    ]
+
+    third = Kripke.singleton(["c"])
+    folded = Kripke.join_all([second, first, third])
+    pairwise = third.join(first.join(second))
+
+    assert [folded.labels_for(state) for state in folded.states] == [["b"], ["a"], ["c"]]
+    assert folded.states == pairwise.states
+    assert set(folded.edges) == set(pairwise.edges)
+
+
+def test_join_overlapping_states():
+    shared, other = State(), State()
+    first = Kripke([shared], {shared: True}, {shared: ["a"]}, [])
+    second = Kripke([shared, other], {}, {shared: ["b"], other: ["c"]}, [Edge(shared, other)])
+    joined = first.join(second)
+    replaced = joined.states[0]
+
+    assert joined.states == [replaced, other, shared]
+    assert replaced not in (shared, other)
+    assert [joined.labels_for(state) for state in joined.states] == [["b"], ["c"], ["a"]]
+    assert joined.initial_states == [shared]
+    assert joined.edges[0] == Edge(replaced, other)
+    assert Kripke.join_all([second, first]).states[1:] == [other, shared]
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from bsa import (
+    BranchTree,
+    Comparison,
+    Condition,
+    Guard,
+    Kripke,
+    KripkeArrays,
+    LabelMasks,
+    State,
+    active_branches,
+)
+from bsa.robustness import condition_mask
+
+
+def func(x: float, y: float) -> float:
+    if x <= 10:
+        if y >= 5:
+            return x + y
+        else:
+            return y - x
+    else:
+        if y <= x:
+            return x
+        else:
+            return y
+
+
+def _kripke() -> Kripke[Guard]:
+    trees = BranchTree.from_function(func)
+    return trees[0].as_kripke()[0]
+
+
+def test_labels_for():
+    kripke = _kripke()
+    masks = LabelMasks.from_kripke(kripke)
+
+    assert masks.n_states == len(kripke.states)
+    assert masks.masks.dtype == np.uint8
+
+    for index, state in enumerate(kripke.states):
+        assert sorted(map(str, masks.labels_for(index))) == sorted(
+            map(str, kripke.labels_for(state))
+        )
+
+
+def test_evaluate():
+    kripke = _kripke()
+    masks = LabelMasks.from_kripke(kripke)
+
+    for x, y in [(1, 1), (1, 10), (20, 1), (20, 30), (10, 5)]:
+        variables = {"x": float(x), "y": float(y)}
+        active = np.flatnonzero(masks.evaluate(variables)).tolist()
+        expected = active_branches(kripke, variables)
+
+        assert [kripke.states[index] for index in active] == expected
+
+
+def test_active_batch():
+    kripke = _kripke()
+    masks = LabelMasks.from_kripke(kripke)
+    samples = {"x": np.array([1.0, 1.0, 20.0, 20.0]), "y": np.array([1.0, 10.0, 1.0, 30.0])}
+    truths = np.array([condition_mask(label, samples) for label in masks.labels])
+    active = masks.active(truths)
+
+    for sample in range(4):
+        assert np.array_equal(active[:, sample], masks.active(truths[:, sample]))
+
+
+def test_many_labels():
+    labels = [Condition("x", Comparison.GTE, float(bound)) for bound in range(20)]
+    states = [State() for _ in range(3)]
+    kripke = Kripke(
+        states,
+        {states[0]: True},
+        {states[0]: labels[:5], states[1]: labels[15:], states[2]: []},
+        [],
+    )
+    masks = LabelMasks.from_arrays(KripkeArrays.from_kripke(kripke))
+
+    assert masks.masks.shape == (3, 2)
+    assert masks.labels_for(1) == labels[15:]
+    assert masks.evaluate({"x": 10.0}).tolist() == [True, False, True]
+    assert masks.evaluate({"x": 19.0}).tolist() == [True, True, True]
+
+
+def test_active_invalid_truths():
+    masks = LabelMasks.from_kripke(_kripke())
+
+    with pytest.raises(ValueError):
+        masks.active(np.ones(len(masks.labels) + 1, dtype=np.bool_))
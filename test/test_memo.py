@@ -0,0 +1,110 @@
+import threading
+
+import numpy as np
+import pytest
+
+from bsa import ActiveBranchCache, BranchTree, Guard, Kripke, active_branches
+
+
+def func(x: float, y: float, z: float) -> float:
+    if x <= 10:
+        if y >= 5:
+            return x + y
+        else:
+            return y - x
+    else:
+        if y <= x:
+            return x
+        else:
+            return y
+
+
+def _kripke() -> Kripke[Guard]:
+    return BranchTree.from_function(func)[0].as_kripke()[0]
+
+
+def test_exact_results():
+    kripke = _kripke()
+    cache = ActiveBranchCache(kripke, maxsize=16)
+    rng = np.random.default_rng(0)
+
+    assert cache.variables == ["x", "y"]
+    assert not cache.quantized
+
+    for _ in range(200):
+        x, y = rng.integers(0, 20, size=2).tolist()
+        variables = {"x": float(x), "y": float(y), "z": rng.uniform()}
+
+        assert cache.active_branches(variables) == active_branches(kripke, variables)
+
+    assert cache.active_branches({"x": 1.0}) == active_branches(kripke, {"x": 1.0})
+    assert len(cache) == 16
+
+
+def test_stats():
+    cache = ActiveBranchCache(_kripke(), maxsize=2)
+
+    assert cache.stats.hit_rate == 0.0
+
+    cache.active_branches({"x": 1.0, "y": 1.0, "z": 1.0})
+    cache.active_branches({"x": 1.0, "y": 1.0, "z": 2.0})
+    cache.active_branches({"x": 2.0, "y": 1.0})
+    cache.active_branches({"x": 1.0, "y": 1.0})
+    cache.active_branches({"x": 3.0, "y": 1.0})
+    cache.active_branches({"x": 2.0, "y": 1.0})
+
+    stats = cache.stats
+    assert (stats.hits, stats.misses, stats.evictions, stats.size) == (2, 4, 2, 2)
+    assert stats.hit_rate == pytest.approx(1 / 3)
+
+    cache.clear()
+    assert cache.stats.lookups == 0
+    assert len(cache) == 0
+
+
+def test_quantization():
+    kripke = _kripke()
+    cache = ActiveBranchCache(kripke, quantization={"x": 0.5, "z": 1.0})
+
+    assert cache.quantized
+    assert cache.key({"x": 3.3, "y": 1.0}) == (3.5, 1.0)
+    assert cache.key({"x": float("inf")}) == (float("inf"), None)
+
+    for x in np.linspace(3.3, 3.7, 10).tolist():
+        assert cache.active_branches({"x": x, "y": 6.0}) == active_branches(
+            kripke, {"x": x, "y": 6.0}
+        )
+
+    assert cache.stats.misses == 1
+    assert cache.active_branches({"x": 10.2, "y": 6.0}) == active_branches(
+        kripke, {"x": 10.0, "y": 6.0}
+    )
+
+    for steps in ({"x": 0.0}, {"x": -1.0}, {"x": float("nan")}):
+        with pytest.raises(ValueError):
+            ActiveBranchCache(kripke, quantization=steps)
+
+    with pytest.raises(ValueError):
+        ActiveBranchCache(kripke, maxsize=0)
+
+
+def test_threads():
+    kripke = _kripke()
+    cache = ActiveBranchCache(kripke, maxsize=8)
+    queries = [{"x": float(i % 20), "y": float(i % 7)} for i in range(500)]
+    results: list[bool] = []
+
+    def query() -> None:
+        results.append(all(cache.active_branches(v) == active_branches(kripke, v) for v in queries))
+
+    threads = [threading.Thread(target=query) for _ in range(4)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert results == [True] * 4
+    assert cache.stats.lookups == 2000
+    assert len(cache) == 8
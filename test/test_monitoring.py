@@ -0,0 +1,184 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from bsa import BranchMonitor, BranchTree, Condition, Guard, Interval, active_branches, monitoring
+
+pytestmark = pytest.mark.skipif(sys.version_info < (3, 12), reason="requires sys.monitoring")
+
+
+def func(x: float, y: float, config: SimpleNamespace) -> float:
+    if x <= 10:
+        if y >= config.limit:
+            return x + y
+        else:
+            return y - x
+    else:
+        if 20 >= y:
+            return x
+        else:
+            return y
+
+
+def _conditions(trees: list[BranchTree]) -> list[Guard]:
+    return [
+        condition
+        for tree in trees
+        for condition in [tree.condition] + _conditions(tree.true_children + tree.false_children)
+    ]
+
+
+def test_conditions():
+    monitor = BranchMonitor(func)
+    assert set(monitor.conditions) == set(_conditions(BranchTree.from_function(func)))
+
+
+def test_captured_labels():
+    monitor = BranchMonitor(func)
+    config = SimpleNamespace(limit=5)
+
+    assert monitor(1, 6, config) == ([Condition.lt("x", 10), Condition.gt("y", "config.limit")], 7)
+    assert monitor(11, 30, config) == (
+        [Condition.gt("x", 10, strict=True), Condition.gt("y", 20, strict=True)],
+        30,
+    )
+
+
+def test_matches_kripke_states():
+    monitor = BranchMonitor(func)
+    kripke = BranchTree.from_function(func)[0].as_kripke()[0]
+    config = SimpleNamespace(limit=5)
+
+    for x, y in [(1, 1), (1, 6), (11, 15), (11, 25)]:
+        labels, _ = monitor(x, y, config)
+        variables = {"x": x, "y": y, "config.limit": config.limit}
+        states = [s for s in kripke.states if set(kripke.labels_for(s)) <= set(labels)]
+
+        assert states == active_branches(kripke, variables)
+
+
+def test_source_not_required():
+    namespace: dict = {}
+    exec("def generated(x):\n    if x <= 3:\n        return 1\n    return 2\n", namespace)
+    monitor = BranchMonitor(namespace["generated"])
+
+    assert monitor(5) == ([Condition.gt("x", 3, strict=True)], 2)
+    assert namespace["generated"](1) == 1
+
+
+def intervals(x: float, y: float) -> float:
+    if x >= 0 and x <= 10:
+        return x
+    if 1 <= y <= 2:
+        return y
+    return x + y
+
+
+def test_intervals():
+    monitor = BranchMonitor(intervals)
+    first, second = Interval("x", 0, 10), Interval("y", 1, 2)
+
+    assert monitor.conditions == [first, second]
+    assert set(monitor.conditions) == set(_conditions(BranchTree.from_function(intervals)))
+    assert monitor(5, 0) == ([first], 5)
+    assert monitor(-1, 1.5) == ([first.inverse(), second], 1.5)
+    assert monitor(20, 3) == ([first.inverse(), second.inverse()], 23)
+
+
+def disjunction(x: float, y: float) -> float:
+    if x >= 0 and x <= 10 or y <= 3:
+        return x
+    if x >= 0 and (x <= 10 or y <= 3):
+        return y
+    return x + y
+
+
+def test_interval_disjunction():
+    monitor = BranchMonitor(disjunction)
+    interval = Interval("x", 0, 10)
+
+    assert set(monitor.conditions) == set(_conditions(BranchTree.from_function(disjunction)))
+    assert monitor(5, 5) == ([interval], 5)
+    assert monitor(20, 1) == ([interval.inverse(), Condition.lt("y", 3)], 20)
+    assert monitor(20, 5) == (
+        [
+            interval.inverse(),
+            Condition.gt("y", 3, strict=True),
+            Condition.gt("x", 0),
+            Condition.gt("x", 10, strict=True),
+            Condition.gt("y", 3, strict=True),
+        ],
+        25,
+    )
+
+
+def negated(x: float) -> float:
+    if not x <= 3:
+        return 1
+    return 0
+
+
+def test_negated_comparison():
+    monitor = BranchMonitor(negated)
+
+    assert BranchTree.from_function(negated) == []
+    assert monitor.conditions == [Condition.lt("x", 3)]
+    assert monitor(5) == ([Condition.gt("x", 3, strict=True)], 1)
+    assert monitor(1) == ([Condition.lt("x", 3)], 0)
+
+
+def test_enable_failure_restores_labels(monkeypatch: pytest.MonkeyPatch):
+    monitor = BranchMonitor(negated)
+
+    def fail() -> int:
+        raise RuntimeError("No sys.monitoring tool identifier is available")
+
+    monkeypatch.setattr(monitoring, "_branch_events", fail)
+
+    with pytest.raises(RuntimeError):
+        monitor(5)
+
+    assert getattr(monitor._local, "labels", None) is None
+    assert negated.__code__ not in monitoring._monitors
+
+    monkeypatch.undo()
+
+    assert monitor(5) == ([Condition.gt("x", 3, strict=True)], 1)
+
+
+def test_nested_monitors():
+    first, second = BranchMonitor(func), BranchMonitor(func)
+    results = []
+
+    class Config(SimpleNamespace):
+        @property
+        def limit(self) -> float:
+            results.append(second(11, 30, SimpleNamespace(limit=0)))
+            return 5
+
+    labels, result = first(1, 6, Config())
+    inner = [Condition.gt("x", 10, strict=True), Condition.gt("y", 20, strict=True)]
+
+    assert result == 7
+    assert results == [(inner, 30)]
+    assert labels == [Condition.lt("x", 10), *inner, Condition.gt("y", "config.limit")]
+    assert func.__code__ not in monitoring._monitors
+
+
+def test_concurrent_monitors():
+    monitors = [BranchMonitor(func), BranchMonitor(func)]
+    config = SimpleNamespace(limit=5)
+    inputs = [(x, y) for x in range(0, 20, 3) for y in range(0, 30, 4)] * 4
+    expected = [monitors[0](x, y, config) for x, y in inputs]
+
+    def run(index: int) -> tuple[list[Guard], float]:
+        x, y = inputs[index]
+        return monitors[index % 2](x, y, config)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(run, range(len(inputs))))
+
+    assert results == expected
+    assert func.__code__ not in monitoring._monitors
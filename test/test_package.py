@@ -0,0 +1,38 @@
+import pkgutil
+import subprocess
+import sys
+from types import ModuleType
+
+import bsa
+
+_CHECK = """
+import sys
+
+import bsa
+
+print(sorted(m for m in ("asyncio", "multiprocessing", "numpy") if m in sys.modules))
+"""
+
+
+def test_lazy_imports():
+    output = subprocess.run(
+        [sys.executable, "-c", _CHECK], capture_output=True, check=True, text=True
+    ).stdout
+
+    assert output.strip() == "[]"
+
+
+def test_lazy_names():
+    import bsa.bisimulation as bisimulation
+    from bsa.bisimulation import minimize
+
+    assert set(bsa.__all__) <= set(dir(bsa))
+    assert all(getattr(bsa, name) is not None for name in bsa.__all__)
+    assert isinstance(bisimulation, ModuleType)
+    assert bsa.minimize is minimize
+
+
+def test_lazy_names_differ_from_modules():
+    modules = {info.name for info in pkgutil.iter_modules(bsa.__path__)}
+
+    assert modules.isdisjoint(bsa.__all__)
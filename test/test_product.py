@@ -0,0 +1,79 @@
+import itertools
+
+import pytest
+
+from bsa import BranchTree, ProductKripke, active_branches
+
+
+def func(x: float, y: float, z: float) -> float:
+    if x <= 10:
+        if y >= 5:
+            x = x + y
+    else:
+        x = y
+
+    if z >= 0:
+        z = 1.0
+
+    if y <= z:
+        return x
+
+    return z
+
+
+def _product() -> ProductKripke:
+    return ProductKripke.from_trees(BranchTree.from_function(func))
+
+
+def test_states():
+    product = _product()
+    components = product.components
+    states = list(product.states())
+
+    assert len(components) == 3
+    assert product.n_states == len(states) == 12
+    assert states == list(itertools.product(*(kripke.states for kripke in components)))
+
+    for index, state in enumerate(states):
+        assert state in product
+        assert product.state_at(index) == state
+        assert product.index_of(state) == index
+
+    with pytest.raises(IndexError):
+        product.state_at(product.n_states)
+
+
+def test_membership():
+    product = _product()
+    state = product.state_at(0)
+
+    assert (state[1], state[0], state[2]) not in product
+    assert state[:2] not in product
+
+    with pytest.raises(ValueError):
+        product.index_of((state[1], state[0], state[2]))
+
+
+def test_active_states():
+    product = _product()
+
+    for x, y, z in itertools.product([0, 20], [0, 10], [-5, 5]):
+        variables = {"x": float(x), "y": float(y), "z": float(z)}
+        active = list(product.active_states(variables))
+        expected = [state for state in product.states() if product.is_active(state, variables)]
+
+        assert active == expected
+        assert product.n_active(variables) == len(expected)
+        assert product.active_components(variables) == [
+            active_branches(kripke, variables) for kripke in product.components
+        ]
+
+
+def test_many_components():
+    trees = BranchTree.from_function(func)
+    product = ProductKripke([trees[1].as_kripke()[0]] * 20)
+
+    assert product.n_states == 2**20
+    assert product.n_active({"z": 1.0}) == 1
+    assert next(product.active_states({"z": 1.0})) == product.state_at(2**20 - 1)
+    assert product.index_of(product.state_at(12345)) == 12345
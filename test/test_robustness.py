@@ -0,0 +1,79 @@
+import numpy as np
+
+from bsa import (
+    BranchTree,
+    Condition,
+    Interval,
+    Kripke,
+    State,
+    active_branches,
+    branch_distances,
+    condition_distance,
+    condition_mask,
+)
+
+
+def func(x: float, y: float) -> float:
+    if x <= 10:
+        if y >= 5:
+            return x + y
+        else:
+            return y - x
+    else:
+        if y <= x:
+            return x
+        else:
+            return y
+
+
+def test_condition_distance():
+    samples = {"x": np.array([0.0, 10.0, 12.0]), "y": np.array([1.0, 11.0, 10.0])}
+
+    assert np.array_equal(condition_distance(Condition.lt("x", 10), samples), [10, 0, -2])
+    assert np.array_equal(condition_distance(Condition.gt("x", "y"), samples), [-1, -1, 2])
+    assert np.array_equal(condition_distance(Condition.lt("z", 1), samples), [-np.inf] * 3)
+
+
+def test_interval_distance():
+    samples = {"x": np.array([-2.0, 0.0, 4.0, 10.0])}
+    interval = Interval("x", 0, 10, upper_strict=True)
+
+    assert np.array_equal(condition_distance(interval, samples), [-2, 0, 4, 0])
+    assert np.array_equal(condition_distance(interval.inverse(), samples), [2, 0, -4, 0])
+    assert np.array_equal(condition_mask(interval, samples), [False, True, True, False])
+    assert np.array_equal(condition_mask(interval.inverse(), samples), [True, False, False, True])
+    assert not condition_mask(Interval("z", 0, 1, inside=False), samples).any()
+
+
+def test_branch_distances():
+    kripke = BranchTree.from_function(func)[0].as_kripke()[0]
+    rng = np.random.default_rng(0)
+    boundary = {"x": [10.0, 10.0, 12.0, 4.0], "y": [5.0, 3.0, 12.0, 5.0]}
+    samples = {name: np.append(rng.uniform(0, 20, 200), boundary[name]) for name in boundary}
+    distances = branch_distances(kripke, samples)
+    masks = np.array(
+        [
+            np.logical_and.reduce(
+                [condition_mask(label, samples) for label in kripke.labels_for(s)]
+            )
+            for s in kripke.states
+        ]
+    )
+
+    assert distances.shape == masks.shape == (len(kripke.states), 204)
+    assert np.all(distances[masks] >= 0)
+    assert np.all(masks[distances > 0])
+
+    for i in range(204):
+        variables = {name: float(values[i]) for name, values in samples.items()}
+        active = active_branches(kripke, variables)
+
+        assert list(masks[:, i]) == [state in active for state in kripke.states]
+
+
+def test_unlabeled_distances():
+    states = [State(), State()]
+    kripke = Kripke(states, {}, {states[1]: [Condition.lt("x", 1)]}, [])
+    distances = branch_distances(kripke, {"x": np.array([0.0, 3.0])})
+
+    assert np.array_equal(distances, [[np.inf, np.inf], [1, -2]])
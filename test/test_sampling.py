@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from bsa import BranchTree, CoverageAccumulator, CoverageSampler, Interval, active_branches
+
+
+def func(x: float, y: float) -> float:
+    if x <= 10:
+        if y >= 5:
+            return x + y
+        else:
+            return y - x
+    else:
+        if y <= x:
+            return x
+        else:
+            return y
+
+
+def test_sample_targets():
+    kripke = BranchTree.from_function(func)[0].as_kripke()[0]
+    sampler = CoverageSampler(kripke, {"x": (0, 20), "y": (0, 20)}, seed=0)
+    batch = sampler.sample(500)
+    states = kripke.states
+
+    assert sampler.unreachable == []
+    assert set(batch.targets.tolist()) == set(range(len(states)))
+
+    for i, target in enumerate(batch.targets.tolist()):
+        variables = {name: float(values[i]) for name, values in batch.samples.items()}
+        assert active_branches(kripke, variables) == [states[target]]
+
+
+def test_unreachable_states():
+    kripke = BranchTree.from_function(func)[0].as_kripke()[0]
+    sampler = CoverageSampler(kripke, {"x": (12, 20), "y": (30, 40)}, seed=0)
+    states = kripke.states
+
+    assert len(sampler.unreachable) == 3
+    assert sampler.region(states[-1])["x"] == (12.0, 10.0)
+
+    (reachable,) = [i for i, state in enumerate(states) if state not in sampler.unreachable]
+    batch = sampler.sample(50)
+
+    assert set(batch.targets.tolist()) == {reachable}
+
+
+def intervals(x: float) -> float:
+    if 2 <= x <= 4:
+        return x
+    else:
+        return -x
+
+
+def test_interval_regions():
+    kripke = BranchTree.from_function(intervals)[0].as_kripke()[0]
+    outside, inside = kripke.states
+    assert kripke.labels_for(outside) == [Interval("x", 2, 4, inside=False)]
+
+    sampler = CoverageSampler(kripke, {"x": (0, 10)}, seed=0)
+    assert sampler.region(inside) == {"x": (2.0, 4.0)}
+    assert sampler.region(outside) == {"x": (0.0, 10.0)}
+
+    batch = sampler.sample(200)
+    assert set(batch.targets.tolist()) == {0, 1}
+
+    for i, target in enumerate(batch.targets.tolist()):
+        assert active_branches(kripke, {"x": float(batch.samples["x"][i])}) == [
+            kripke.states[target]
+        ]
+
+    assert CoverageSampler(kripke, {"x": (2.5, 3)}).unreachable == [outside]
+
+
+def test_coverage_weighting():
+    kripke = BranchTree.from_function(func)[0].as_kripke()[0]
+    sampler = CoverageSampler(kripke, {"x": (0, 20), "y": (0, 20)}, seed=0)
+    coverage = CoverageAccumulator(kripke)
+    coverage.record_indices(np.zeros(10_000, dtype=np.int64))
+    batch = sampler.sample(1000, coverage)
+
+    assert np.count_nonzero(batch.targets == 0) < 10
+
+
+def test_missing_bounds():
+    kripke = BranchTree.from_function(func)[0].as_kripke()[0]
+
+    with pytest.raises(ValueError):
+        CoverageSampler(kripke, {"x": (0, 20)})
@@ -0,0 +1,112 @@
+import multiprocessing
+import pickle
+
+import numpy as np
+import pytest
+
+from bsa import BranchTree, Guard, Kripke, SharedKripke, active_branches
+
+
+def func(x: float, y: float) -> float:
+    if x <= 10:
+        if y >= 5:
+            return x + y
+        else:
+            return y - x
+    else:
+        if y <= x:
+            return x
+        else:
+            return y
+
+
+def _kripke() -> Kripke[Guard]:
+    return BranchTree.from_function(func)[0].as_kripke()[0]
+
+
+def _active(shared: SharedKripke, variables: dict[str, float]) -> list[int]:
+    return [shared.states.index(state) for state in shared.active_branches(variables)]
+
+
+def test_publish():
+    kripke = _kripke()
+
+    with SharedKripke.publish(kripke) as shared:
+        assert shared.owner
+        assert shared.n_states == len(kripke.states)
+        assert shared.states == kripke.states
+        assert shared.initial_states == kripke.initial_states
+        assert set(shared.edges) == set(kripke.edges)
+        assert not shared.arrays.edge_targets.flags.writeable
+
+        for state in kripke.states:
+            assert shared.labels_for(state) == kripke.labels_for(state)
+
+        for variables in ({"x": 1.0, "y": 10.0}, {"x": 20.0, "y": 1.0}, {"x": 1.0}):
+            assert shared.active_branches(variables) == active_branches(kripke, variables)
+
+        copy = shared.to_kripke()
+        assert copy.states == kripke.states
+
+        with pytest.raises(ValueError):
+            shared.labels_for(Kripke.singleton([]).states[0])
+
+    assert shared.closed
+
+
+def test_attach():
+    kripke = _kripke()
+
+    with SharedKripke.publish(kripke) as owner:
+        with SharedKripke.attach(owner.name) as shared:
+            assert not shared.owner
+            assert shared.states == kripke.states
+
+        assert shared.closed
+        assert owner.states == kripke.states
+
+        attached = pickle.loads(pickle.dumps(owner))
+        assert not attached.owner
+        assert attached.active_branches({"x": 1.0, "y": 1.0}) == owner.active_branches(
+            {"x": 1.0, "y": 1.0}
+        )
+        attached.close()
+
+    with pytest.raises(FileNotFoundError):
+        SharedKripke.attach(owner.name)
+
+
+def test_close():
+    shared = SharedKripke.publish(_kripke())
+    arrays = shared.arrays
+
+    with pytest.raises(BufferError):
+        shared.close()
+
+    assert not shared.closed
+    assert np.array_equal(shared.arrays.initial, arrays.initial)
+
+    targets = arrays.edge_targets[1:]
+    del arrays
+
+    with pytest.raises(BufferError):
+        shared.close()
+
+    del targets
+    shared.close()
+    shared.close()
+
+    with pytest.raises(ValueError):
+        _ = shared.states
+
+
+def test_processes():
+    variables = [{"x": 1.0, "y": 10.0}, {"x": 1.0, "y": 1.0}, {"x": 20.0, "y": 1.0}]
+
+    with SharedKripke.publish(_kripke()) as shared:
+        expected = [_active(shared, v) for v in variables]
+
+        with multiprocessing.get_context("spawn").Pool(2) as pool:
+            results = pool.starmap(_active, [(shared, v) for v in variables])
+
+        assert results == expected
@@ -0,0 +1,77 @@
+from typing import Callable, Optional
+
+import numpy as np
+import pytest
+
+from bsa import BranchTree, Condition, StateFormulas, branch_distances
+from bsa.stl import Always, Eventually, Predicate
+
+
+def func(x: float, y: float) -> float:
+    if x <= 10:
+        if y >= 5:
+            return x + y
+        else:
+            return y - x
+    else:
+        return y
+
+
+def _naive_window(
+    values: np.ndarray,
+    reduce: Callable[[np.ndarray], float],
+    empty: float,
+    start: int,
+    end: Optional[int],
+) -> np.ndarray:
+    result = []
+
+    for t in range(len(values)):
+        stop = len(values) if end is None else min(t + end + 1, len(values))
+        window = values[t + start : stop]
+        result.append(reduce(window) if len(window) > 0 else empty)
+
+    return np.array(result)
+
+
+@pytest.mark.parametrize("window", [(0, None), (2, None), (0, 0), (1, 3), (0, 50), (30, 40)])
+def test_temporal_operators(window: tuple[int, Optional[int]]):
+    rng = np.random.default_rng(0)
+    trace = {"x": rng.uniform(0, 20, 25)}
+    predicate = Predicate(Condition.lt("x", 10))
+    values = predicate.robustness(trace)
+    start, end = window
+
+    always = Always(predicate, start, end).robustness(trace)
+    eventually = predicate.eventually(start, end).robustness(trace)
+
+    assert np.array_equal(always, _naive_window(values, np.min, np.inf, start, end))
+    assert np.array_equal(eventually, _naive_window(values, np.max, -np.inf, start, end))
+
+
+def test_invalid_window():
+    with pytest.raises(ValueError):
+        Eventually(Predicate(Condition.lt("x", 10)), 3, 1)
+
+
+def test_state_formulas():
+    kripke = BranchTree.from_function(func)[0].as_kripke()[0]
+    formulas = StateFormulas(kripke)
+    rng = np.random.default_rng(0)
+    trace = {"x": rng.uniform(0, 20, 100), "y": rng.uniform(0, 20, 100)}
+    robustness = formulas.robustness(trace)
+
+    assert np.array_equal(robustness, branch_distances(kripke, trace))
+
+    for index, state in enumerate(kripke.states):
+        formula = formulas.formula(state)
+
+        assert formula is formulas.formula(state)
+        assert formula.operands == tuple(Predicate(label) for label in kripke.labels_for(state))
+        assert np.array_equal(formula.robustness(trace), robustness[index])
+        assert np.array_equal(
+            formula.always(0, 5).robustness(trace), formulas.always(trace, 0, 5)[index]
+        )
+        assert np.array_equal(
+            formula.eventually(2).robustness(trace), formulas.eventually(trace, 2)[index]
+        )
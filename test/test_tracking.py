@@ -0,0 +1,54 @@
+import random
+
+from bsa import ActiveStateTracker, BranchTree, active_branches
+
+
+def func(x: float, y: float, z: float) -> float:
+    if x <= 10:
+        if y >= 5:
+            return x + y
+        else:
+            return y - x
+    else:
+        if y <= z:
+            return x
+        else:
+            return y
+
+
+def test_tracker_updates():
+    kripke = BranchTree.from_function(func)[0].as_kripke()[0]
+    tracker = ActiveStateTracker(kripke)
+
+    assert tracker.active == []
+
+    step = tracker.update({"x": 1, "y": 6, "z": 0})
+    assert step.active == step.entered == active_branches(kripke, {"x": 1, "y": 6, "z": 0})
+    assert step.exited == []
+
+    step = tracker.update({"z": 3})
+    assert step.entered == step.exited == []
+
+    previous = step.active
+    step = tracker.update({"y": 4})
+    assert step.exited == previous
+    assert step.active == step.entered == active_branches(kripke, {"x": 1, "y": 4, "z": 3})
+
+
+def test_tracker_matches_active_branches():
+    kripke = BranchTree.from_function(func)[0].as_kripke()[0]
+    tracker = ActiveStateTracker(kripke)
+    rng = random.Random(0)
+    variables = {"x": 0.0, "y": 0.0, "z": 0.0}
+    tracker.update(variables)
+
+    for _ in range(500):
+        name = rng.choice(list(variables))
+        variables[name] = rng.uniform(0, 20)
+        previous = set(tracker.active)
+        step = tracker.update({name: variables[name]})
+        expected = active_branches(kripke, variables)
+
+        assert set(step.active) == set(expected)
+        assert set(step.entered) == set(expected) - previous
+        assert set(step.exited) == previous - set(expected)